@@ -0,0 +1,90 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+from benchmarks.run import DEFAULT_BASELINE, DEFAULT_RESULTS_DIR
+
+
+def load_results(path: Path) -> Dict[Tuple[str, str], dict]:
+    document = json.loads(path.read_text())
+    return {(result["scale"], result["case"]): result for result in document["results"]}
+
+
+def latest_results() -> Path:
+    candidates = sorted(DEFAULT_RESULTS_DIR.glob("*.json"))
+    if not candidates:
+        raise FileNotFoundError(f"No results in {DEFAULT_RESULTS_DIR}; run python -m benchmarks.run first")
+    return candidates[-1]
+
+
+def compare(
+    current: Dict[Tuple[str, str], dict],
+    baseline: Dict[Tuple[str, str], dict],
+    time_threshold: float,
+    memory_threshold: float,
+    min_delta_ms: float
+) -> Tuple[List[str], List[str]]:
+    # Report lines for every case present in both runs, and the subset that regressed. A time
+    # regression needs both the relative threshold and min_delta_ms, so sub-microsecond cases
+    # do not flap on timer noise.
+    lines = []
+    regressions = []
+    for key in sorted(current.keys() & baseline.keys()):
+        now, before = current[key], baseline[key]
+        time_ratio = now["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        memory_ratio = now["peak_kib"] / before["peak_kib"] if before["peak_kib"] else 1.0
+
+        flags = []
+        if time_ratio > 1 + time_threshold and now["median_ms"] - before["median_ms"] > min_delta_ms:
+            flags.append("SLOWER")
+        if memory_ratio > 1 + memory_threshold and now["peak_kib"] - before["peak_kib"] > 1:
+            flags.append("MORE MEMORY")
+
+        line = (
+            f"{key[0]:>5} {key[1]:<42} {before['median_ms']:>10.3f} -> {now['median_ms']:>10.3f} ms"
+            f" ({time_ratio - 1:+7.1%})  {before['peak_kib']:>10.1f} -> {now['peak_kib']:>10.1f} KiB"
+            f" ({memory_ratio - 1:+7.1%})  {' '.join(flags)}"
+        )
+        lines.append(line.rstrip())
+        if flags:
+            regressions.append(line.rstrip())
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a stored baseline")
+    parser.add_argument("results", nargs="?", help="Results file (defaults to the newest in benchmarks/results)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative increase of the median time")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed relative increase of peak memory")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore time increases smaller than this")
+    args = parser.parse_args()
+
+    try:
+        results_path = Path(args.results) if args.results else latest_results()
+        current = load_results(results_path)
+        baseline = load_results(Path(args.baseline))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error reading benchmark results: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    lines, regressions = compare(current, baseline, args.threshold, args.memory_threshold, args.min_delta_ms)
+    print(f"Comparing {results_path} against {args.baseline}")
+    for line in lines:
+        print(line)
+
+    missing = sorted(baseline.keys() - current.keys())
+    if missing:
+        print(f"Not run this time: {', '.join(f'{scale}/{case}' for scale, case in missing)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for line in regressions:
+            print(line)
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+import numpy as np
+
+try:
+    import httpx
+except ImportError:
+    # Only the load generator needs an HTTP client; the server does not
+    httpx = None
+
+# Request kinds and their default share of the traffic
+DEFAULT_MIX = {"backtest": 6, "validate": 3, "metadata": 1}
+# Interval of the event-loop lag probe
+LAG_PROBE_SECONDS = 0.01
+
+
+@dataclass
+class RequestSpec:
+    kind: str
+    method: str
+    path: str
+    body: Optional[dict] = None
+
+
+@dataclass
+class KindStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    # Requests that got no response at all (connection errors, client timeouts)
+    failures: Counter = field(default_factory=Counter)
+
+    def record(self, latency_ms: float, status: Optional[int], failure: Optional[str] = None) -> None:
+        self.latencies_ms.append(latency_ms)
+        if failure is not None:
+            self.failures[failure] += 1
+        else:
+            self.statuses[status] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def errors(self) -> int:
+        return sum(self.failures.values()) + sum(n for status, n in self.statuses.items() if status >= 400)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p90_ms": round(float(p90), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(max(values)), 3)
+    }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    # kind=weight pairs, e.g. backtest=6,validate=3,metadata=1
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown request kind '{kind}'; expected one of {', '.join(DEFAULT_MIX)}")
+        try:
+            mix[kind] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Expected kind=weight, got '{part}'")
+    return mix
+
+
+def build_request_pool(dataset_name: str, metadata: dict, distinct: int, seed: int) -> Dict[str, List[RequestSpec]]:
+    # `distinct` different strategies drawn from the dataset's contracts. Repeats of the same
+    # request hit the result cache, so this controls the cache hit rate of the run.
+    rng = random.Random(seed)
+    date_range = metadata["date_range"]
+    contracts = [
+        (expiry, strike)
+        for expiry, strikes in metadata["available_strikes"].items()
+        for strike in strikes
+    ]
+    strategies = []
+    for _ in range(distinct):
+        expiry, strike = rng.choice(contracts)
+        strategies.append({
+            "dataset_name": dataset_name,
+            "option_type": rng.choice(["call", "put"]),
+            "strike": strike,
+            "expiry": expiry,
+            "position_direction": rng.choice(["buy", "sell"]),
+            "quantity": rng.randint(1, 5)
+        })
+
+    return {
+        "backtest": [
+            RequestSpec("backtest", "POST", "/api/backtest/run", {
+                "strategy": strategy,
+                "date_range": {"start_date": date_range["start"], "end_date": date_range["end"]}
+            })
+            for strategy in strategies
+        ],
+        "validate": [RequestSpec("validate", "POST", "/api/strategy/validate", strategy) for strategy in strategies],
+        "metadata": [RequestSpec("metadata", "GET", f"/api/datasets/{dataset_name}/metadata")]
+    }
+
+
+class LoadRun:
+    # Replays a weighted request mix either open-loop (requests start on a fixed schedule at the
+    # target rate, however slowly earlier ones complete) or closed-loop (a fixed number of
+    # clients each sending their next request when the previous one returns). Open-loop latency
+    # is measured from the scheduled start, so a backed-up server shows up in the percentiles.
+
+    def __init__(
+        self,
+        client: "httpx.AsyncClient",
+        pool: Dict[str, List[RequestSpec]],
+        mix: Dict[str, float],
+        seed: int = 0
+    ):
+        self.client = client
+        self.pool = pool
+        self.kinds = [kind for kind, weight in mix.items() if weight > 0]
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, KindStats] = {kind: KindStats() for kind in self.kinds}
+        self.loop_lag_ms: List[float] = []
+        self.recording = False
+
+    def next_request(self) -> RequestSpec:
+        kind = self.rng.choices(self.kinds, weights=self.weights)[0]
+        return self.rng.choice(self.pool[kind])
+
+    async def send(self, spec: RequestSpec, started_at: float) -> None:
+        # Warm-up requests still in flight when measuring starts are not counted
+        recording = self.recording
+        status, failure = None, None
+        try:
+            response = await self.client.request(spec.method, spec.path, json=spec.body)
+            await response.aread()
+            status = response.status_code
+        except httpx.HTTPError as e:
+            failure = type(e).__name__
+        if recording:
+            self.stats[spec.kind].record((time.perf_counter() - started_at) * 1000, status, failure)
+
+    async def probe_loop_lag(self, stop: asyncio.Event) -> None:
+        # How late a short sleep wakes up: time the loop spends busy with other callbacks
+        while not stop.is_set():
+            started_at = time.perf_counter()
+            await asyncio.sleep(LAG_PROBE_SECONDS)
+            if self.recording:
+                self.loop_lag_ms.append(max(0.0, (time.perf_counter() - started_at - LAG_PROBE_SECONDS) * 1000))
+
+    async def run_rate(self, rps: float, duration: float, max_in_flight: int) -> int:
+        # Open loop; returns how many scheduled requests were skipped because max_in_flight were outstanding
+        in_flight = set()
+        skipped = 0
+        start = time.perf_counter()
+        for i in range(int(rps * duration)):
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                skipped += 1
+                continue
+            task = asyncio.create_task(self.send(self.next_request(), scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.wait(in_flight)
+        return skipped
+
+    async def run_concurrency(self, concurrency: int, duration: float) -> None:
+        deadline = time.perf_counter() + duration
+
+        async def client_loop() -> None:
+            while time.perf_counter() < deadline:
+                await self.send(self.next_request(), time.perf_counter())
+
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    async def run(
+        self,
+        duration: float,
+        warmup: float,
+        rps: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        max_in_flight: int = 1000
+    ) -> Dict[str, Any]:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(self.probe_loop_lag(stop))
+        skipped, elapsed = 0, 0.0
+        try:
+            for phase_duration, recording in ((warmup, False), (duration, True)):
+                if phase_duration <= 0:
+                    continue
+                self.recording = recording
+                started_at = time.perf_counter()
+                if rps:
+                    skipped = await self.run_rate(rps, phase_duration, max_in_flight)
+                else:
+                    await self.run_concurrency(concurrency, phase_duration)
+                elapsed = time.perf_counter() - started_at
+        finally:
+            self.recording = False
+            stop.set()
+            await probe
+        return self.report(elapsed, skipped, rps, concurrency)
+
+    def report(self, elapsed: float, skipped: int, rps: Optional[float], concurrency: Optional[int]) -> Dict[str, Any]:
+        all_latencies = [latency for stats in self.stats.values() for latency in stats.latencies_ms]
+        total = len(all_latencies)
+        errors = sum(stats.errors for stats in self.stats.values())
+        return {
+            "mode": {"rps": rps} if rps else {"concurrency": concurrency},
+            "elapsed_seconds": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "skipped": skipped,
+            "latency": percentiles(all_latencies),
+            "loop_lag": percentiles(self.loop_lag_ms),
+            "by_kind": {
+                kind: {
+                    "requests": stats.count,
+                    "errors": stats.errors,
+                    "statuses": {str(status): n for status, n in sorted(stats.statuses.items())},
+                    "failures": dict(stats.failures),
+                    **percentiles(stats.latencies_ms)
+                }
+                for kind, stats in self.stats.items()
+            }
+        }
+
+
+@asynccontextmanager
+async def open_client(url: Optional[str], timeout: float) -> AsyncIterator["httpx.AsyncClient"]:
+    # Against a running server when url is given; otherwise the app is served in this process
+    # (with its startup and shutdown hooks), sharing the load generator's event loop
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            yield client
+        return
+
+    from main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load", timeout=timeout, limits=limits
+        ) as client:
+            yield client
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    latency, lag = report["latency"], report["loop_lag"]
+    print(
+        f"{report['requests']} requests in {report['elapsed_seconds']} s: {report['throughput_rps']} req/s, "
+        f"error rate {report['error_rate']:.2%}" + (f", {report['skipped']} skipped" if report["skipped"] else "")
+    )
+    print(f"{'kind':<10} {'requests':>8} {'errors':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    rows = list(report["by_kind"].items()) + [("all", {**latency, "requests": report["requests"], "errors": None})]
+    for kind, stats in rows:
+        errors = "" if stats["errors"] is None else stats["errors"]
+        print(
+            f"{kind:<10} {stats['requests']:>8} {errors:>7} {stats['p50_ms']:>9.2f} {stats['p90_ms']:>9.2f}"
+            f" {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}"
+        )
+    print(f"event loop lag: p50 {lag['p50_ms']:.2f} ms, p99 {lag['p99_ms']:.2f} ms, max {lag['max_ms']:.2f} ms")
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    async with open_client(args.url, args.timeout) as client:
+        response = await client.get(f"/api/datasets/{args.dataset}/metadata")
+        if response.status_code != 200:
+            raise RuntimeError(f"Dataset '{args.dataset}' metadata returned {response.status_code}")
+        pool = build_request_pool(args.dataset, response.json(), args.distinct, args.seed)
+        load_run = LoadRun(client, pool, args.mix, args.seed)
+        return await load_run.run(args.duration, args.warmup, args.rps, args.concurrency, args.max_in_flight)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a mix of API requests and report throughput and latency")
+    parser.add_argument("--url", help="Base URL of a running server (default: serve the app in-process)")
+    parser.add_argument("--dataset", default="SPX_Sample", help="Dataset the requests use")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Request weights, e.g. backtest=6,validate=3,metadata=1")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rps", type=float, help="Open loop: start this many requests per second")
+    load.add_argument("--concurrency", type=int, default=8, help="Closed loop: clients sending back to back")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of unmeasured load first")
+    parser.add_argument("--distinct", type=int, default=50, help="Different strategies in the request pool")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="Open loop: skip requests beyond this many outstanding")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout per request in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request pool and mix")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    if httpx is None:
+        print("The load generator needs httpx: pip install httpx", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        report = asyncio.run(run_load_test(args))
+    except (RuntimeError, httpx.HTTPError) as e:
+        print(f"Error running load test: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
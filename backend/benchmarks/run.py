@@ -0,0 +1,232 @@
+import argparse
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from models.backtest import BacktestRequest
+from models.strategy import StrategyConfig
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from repositories.options_repository import OptionsRepository
+from repositories.shared_datasets import SharedDatasetRegistry
+from services.backtest_service import BacktestService
+from services.dataset_service import DatasetService
+from utils.generate_sample_data import OUTPUT_SUFFIXES, ChainConfig, generate_dataset
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_DATA_DIR = BENCHMARK_DIR / ".data"
+DEFAULT_RESULTS_DIR = BENCHMARK_DIR / "results"
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+
+# Generated dataset per scale. JSON datasets are parsed into Pydantic records when loaded, which
+# is not feasible at 10M rows, so the largest scale is generated straight to the binary format.
+SCALES = {
+    "1k": (ChainConfig(dataset_name="Bench_1k", days=20, strikes_per_side=12, listed_expiries=1), "json"),
+    "100k": (ChainConfig(dataset_name="Bench_100k", days=250, strikes_per_side=12, listed_expiries=8), "json"),
+    "10m": (
+        ChainConfig(dataset_name="Bench_10m", days=756, strike_step=25.0, strikes_per_side=127, listed_expiries=26),
+        "binary"
+    )
+}
+
+
+@dataclass
+class BenchmarkResult:
+    scale: str
+    case: str
+    rows: int
+    iterations: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    p95_ms: float
+    # Peak Python heap (including NumPy buffers) allocated by one call; memory maps are not counted
+    peak_kib: float
+
+
+def prepare_dataset(scale: str, data_dir: Path, output_format: Optional[str] = None) -> str:
+    # Generate the scale's dataset unless it is already in data_dir; returns its name
+    config, default_format = SCALES[scale]
+    output_format = output_format or default_format
+    output_path = data_dir / f"{config.dataset_name}{OUTPUT_SUFFIXES[output_format]}"
+    if not output_path.exists():
+        for stale in data_dir.glob(f"{config.dataset_name}.*"):
+            stale.unlink()
+        generate_dataset(config, output_path, output_format)
+    return config.dataset_name
+
+
+def measure(func: Callable[[], Any], min_time: float, max_iterations: int) -> List[float]:
+    # Call func until min_time has passed (at least three times), returning each duration in ms
+    durations = []
+    deadline = time.perf_counter() + min_time
+    while len(durations) < max_iterations and (len(durations) < 3 or time.perf_counter() < deadline):
+        started_at = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started_at) * 1000)
+    return durations
+
+
+def peak_memory_kib(func: Callable[[], Any]) -> float:
+    # Separate traced call, so tracing overhead does not distort the timings
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def build_cases(data_dir: Path, dataset_name: str) -> Dict[str, Callable[[], Any]]:
+    # One callable per benchmarked operation, all against the same contract and date range
+    def fresh_repository() -> DatasetRepository:
+        # Private cache and no shared exports: every call parses or maps the file again
+        return DatasetRepository(str(data_dir), cache=DatasetCache(), shared=SharedDatasetRegistry(enabled=False))
+
+    dataset_repo = fresh_repository()
+    dataset = dataset_repo.load_dataset(dataset_name)
+    if dataset is None:
+        raise ValueError(f"Benchmark dataset '{dataset_name}' could not be loaded")
+    options_repo = OptionsRepository(dataset)
+    store = options_repo.store
+
+    dates = options_repo.get_available_dates()
+    expiry = store.expiries[len(store.expiries) // 2]
+    strikes = options_repo.get_available_strikes_for_expiry(expiry, "call")
+    strike = strikes[len(strikes) // 2]
+    strategy = StrategyConfig(
+        dataset_name=dataset_name, option_type="call", strike=strike, expiry=expiry,
+        position_direction="buy", quantity=1
+    )
+    quote_date = next(date for date in dates if options_repo.get_option_price(date, strike, expiry, "call"))
+    request = BacktestRequest(strategy=strategy, date_range={"start_date": quote_date, "end_date": dates[-1]})
+    backtest_dates = [date for date in dates if quote_date <= date <= expiry]
+    entry_price = options_repo.get_option_price(quote_date, strike, expiry, "call")
+    # A week of rows: filter_by_date_range materialises a record per row
+    filter_end = dates[min(len(dates), dates.index(quote_date) + 5) - 1]
+
+    backtest_service = BacktestService(dataset_repo)
+    dataset_service = DatasetService(dataset_repo)
+
+    return {
+        "load_dataset_cold": lambda: fresh_repository().load_dataset(dataset_name),
+        "load_dataset_cached": lambda: dataset_repo.load_dataset(dataset_name),
+        "options.get_option_price": lambda: options_repo.get_option_price(quote_date, strike, expiry, "call"),
+        "options.get_underlying_price": lambda: options_repo.get_underlying_price(quote_date),
+        "options.get_available_dates": options_repo.get_available_dates,
+        "options.get_available_expiries": options_repo.get_available_expiries,
+        "options.get_available_strikes_for_expiry": lambda: options_repo.get_available_strikes_for_expiry(
+            expiry, "call"
+        ),
+        "options.get_all_strikes_by_expiry": options_repo.get_all_strikes_by_expiry,
+        "options.filter_by_date_range": lambda: options_repo.filter_by_date_range(quote_date, filter_end),
+        "options.validate_strategy_params": lambda: options_repo.validate_strategy_params(strike, expiry, "call"),
+        "backtest.validate_strategy": lambda: backtest_service.validate_strategy(strategy),
+        "backtest.execute_backtest": lambda: backtest_service.execute_backtest(request),
+        "backtest.calculate_pnl": lambda: backtest_service.calculate_pnl(
+            options_repo, strategy, backtest_dates, entry_price
+        ),
+        "dataset.get_dataset_metadata": lambda: dataset_service.get_dataset_metadata(dataset_name)
+    }
+
+
+def run_suite(
+    scales: List[str],
+    data_dir: Path,
+    min_time: float = 0.5,
+    max_iterations: int = 10_000,
+    case_filter: Optional[str] = None,
+    output_format: Optional[str] = None
+) -> List[BenchmarkResult]:
+    results = []
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for scale in scales:
+        dataset_name = prepare_dataset(scale, data_dir, output_format)
+        cases = build_cases(data_dir, dataset_name)
+        rows = len(cases["load_dataset_cached"]().data)
+        for case, func in cases.items():
+            if case_filter and case_filter not in case:
+                continue
+            durations = measure(func, min_time, max_iterations)
+            result = BenchmarkResult(
+                scale=scale,
+                case=case,
+                rows=rows,
+                iterations=len(durations),
+                min_ms=round(min(durations), 4),
+                median_ms=round(statistics.median(durations), 4),
+                mean_ms=round(statistics.fmean(durations), 4),
+                p95_ms=round(float(np.percentile(durations, 95)), 4),
+                peak_kib=peak_memory_kib(func)
+            )
+            results.append(result)
+            print(
+                f"{scale:>5} {case:<42} median {result.median_ms:>10.3f} ms  p95 {result.p95_ms:>10.3f} ms"
+                f"  peak {result.peak_kib:>10.1f} KiB  ({result.iterations} runs)",
+                file=sys.stderr
+            )
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine()
+    }
+
+
+def write_results(path: Path, results: List[BenchmarkResult]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        # ru_maxrss is in KiB on Linux
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "results": [asdict(result) for result in results]
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time repository, service and dataset operations at several scales")
+    parser.add_argument("--scales", default=",".join(SCALES), help=f"Comma-separated subset of {', '.join(SCALES)}")
+    parser.add_argument("--case", help="Only run cases whose name contains this text")
+    parser.add_argument("--format", choices=sorted(OUTPUT_SUFFIXES), help="Override every scale's dataset format")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR), help="Where generated datasets are kept")
+    parser.add_argument("--output", help="Results file (defaults to benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Also write the results to {DEFAULT_BASELINE.name}")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to spend timing each case")
+    parser.add_argument("--max-iterations", type=int, default=10_000, help="Upper bound on calls per case")
+    args = parser.parse_args()
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scales: {', '.join(unknown)}")
+
+    results = run_suite(scales, Path(args.data_dir), args.min_time, args.max_iterations, args.case, args.format)
+    output_path = Path(args.output) if args.output else (
+        DEFAULT_RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    write_results(output_path, results)
+    print(f"Wrote {len(results)} results to {output_path}")
+    if args.save_baseline:
+        write_results(DEFAULT_BASELINE, results)
+        print(f"Saved baseline to {DEFAULT_BASELINE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from typing import Dict
+import numpy as np
+from components.pricing import black_scholes_price, norm_cdf, norm_pdf
+
+# Time is measured in trading days, as in the sample data generator
+TRADING_DAYS_PER_YEAR = 252
+
+# Volatility bracket searched by the solver; prices outside it get no implied volatility
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 5.0
+# A quote whose bracket has narrowed this far is done even if its price error is above tolerance
+MIN_BRACKET_WIDTH = 1e-10
+
+
+def _d1(spot: np.ndarray, strike: np.ndarray, years: np.ndarray, volatility: np.ndarray, rate: float) -> np.ndarray:
+    return (np.log(spot / strike) + (rate + 0.5 * np.square(volatility)) * years) / (volatility * np.sqrt(years))
+
+
+def implied_volatility(
+    is_call: np.ndarray,
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years_to_expiry: np.ndarray,
+    price: np.ndarray,
+    rate: float = 0.0,
+    tolerance: float = 1e-6,
+    max_iterations: int = 100
+) -> np.ndarray:
+    # Black-Scholes implied volatility of whole arrays of quotes at once (inputs broadcast against
+    # each other). Every quote takes a Newton step per iteration while the step stays inside its
+    # [low, high] bracket and bisects otherwise, so flat-vega quotes (deep in or out of the money)
+    # still converge. A quote is done once its price error is below tolerance times min(vega, 1):
+    # an error of at most tolerance in volatility and in price, so quotes priced below tolerance
+    # are still solved. Only unconverged quotes are carried into the next iteration. NaN where there
+    # is no solution: expired contracts and prices outside the no-arbitrage bounds or the bracket.
+    arrays = np.broadcast_arrays(
+        np.asarray(is_call, dtype=bool),
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(years_to_expiry, dtype=np.float64),
+        np.asarray(price, dtype=np.float64)
+    )
+    shape = arrays[0].shape
+    is_call, spot, strike, years, price = (array.ravel() for array in arrays)
+    result = np.full(len(price), np.nan, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discounted_strike = strike * np.exp(-rate * years)
+        lower_bound = np.where(
+            is_call, np.maximum(spot - discounted_strike, 0.0), np.maximum(discounted_strike - spot, 0.0)
+        )
+        upper_bound = np.where(is_call, spot, discounted_strike)
+        solvable = (
+            (years > 0) & (spot > 0) & (strike > 0) & np.isfinite(price)
+            & (price > lower_bound) & (price < upper_bound)
+        )
+    active = np.flatnonzero(solvable)
+    is_call, spot, strike, years, price = (array[active] for array in (is_call, spot, strike, years, price))
+
+    low = np.full(len(active), MIN_VOLATILITY)
+    high = np.full(len(active), MAX_VOLATILITY)
+    # Prices beyond what the bracket can produce have no implied volatility within it
+    inside = (
+        (black_scholes_price(is_call, spot, strike, years, low, rate) <= price)
+        & (black_scholes_price(is_call, spot, strike, years, high, rate) >= price)
+    )
+    active, is_call, spot, strike, years, price, low, high = (
+        array[inside] for array in (active, is_call, spot, strike, years, price, low, high)
+    )
+    # Brenner-Subrahmanyam starting point, good near the money
+    volatility = np.clip(np.sqrt(2 * np.pi / years) * price / spot, 0.05, 2.0)
+
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+        difference = black_scholes_price(is_call, spot, strike, years, volatility, rate) - price
+        vega = spot * norm_pdf(_d1(spot, strike, years, volatility, rate)) * np.sqrt(years)
+        converged = (np.abs(difference) < tolerance * np.minimum(vega, 1.0)) | (high - low < MIN_BRACKET_WIDTH)
+        result[active[converged]] = volatility[converged]
+
+        keep = ~converged
+        active, is_call, spot, strike, years, price, low, high, volatility, difference, vega = (
+            array[keep] for array in (
+                active, is_call, spot, strike, years, price, low, high, volatility, difference, vega
+            )
+        )
+        # The model price rises with volatility, so the sign of the error says which side the root is on
+        high = np.where(difference > 0, volatility, high)
+        low = np.where(difference < 0, volatility, low)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = volatility - difference / vega
+        use_newton = (vega > 1e-12) & (newton > low) & (newton < high)
+        volatility = np.where(use_newton, newton, 0.5 * (low + high))
+
+    return result.reshape(shape)
+
+
+def black_scholes_greeks(
+    is_call: np.ndarray,
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years_to_expiry: np.ndarray,
+    volatility: np.ndarray,
+    rate: float = 0.0
+) -> Dict[str, np.ndarray]:
+    # Closed-form delta, gamma, theta (per trading day) and vega (per volatility point) for whole
+    # arrays of contracts. NaN wherever the volatility is NaN or the contract has expired.
+    is_call, spot, strike, years, volatility = np.broadcast_arrays(
+        np.asarray(is_call, dtype=bool),
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(years_to_expiry, dtype=np.float64),
+        np.asarray(volatility, dtype=np.float64)
+    )
+    live = (years > 0) & (volatility > 0)
+    t = np.where(live, years, 1.0)
+    vol = np.where(live, volatility, 1.0)
+    sqrt_t = np.sqrt(t)
+
+    d1 = _d1(spot, strike, t, vol, rate)
+    d2 = d1 - vol * sqrt_t
+    density = norm_pdf(d1)
+    discounted_strike = strike * np.exp(-rate * t)
+
+    delta = np.where(is_call, norm_cdf(d1), norm_cdf(d1) - 1.0)
+    gamma = density / (spot * vol * sqrt_t)
+    decay = -spot * density * vol / (2 * sqrt_t)
+    theta = np.where(
+        is_call,
+        decay - rate * discounted_strike * norm_cdf(d2),
+        decay + rate * discounted_strike * norm_cdf(-d2)
+    ) / TRADING_DAYS_PER_YEAR
+    vega = spot * density * sqrt_t / 100
+
+    return {
+        name: np.where(live, values, np.nan)
+        for name, values in (("delta", delta), ("gamma", gamma), ("theta", theta), ("vega", vega))
+    }
@@ -0,0 +1,54 @@
+import numpy as np
+
+# Coefficients of the Abramowitz & Stegun 26.2.17 approximation to the standard normal CDF
+# (absolute error below 7.5e-8), which keeps pricing in NumPy without a SciPy dependency
+_P = 0.2316419
+_B = (0.319381530, -0.356563782, 1.781477937, -1.821255978, 1.330274429)
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return _INV_SQRT_2PI * np.exp(-0.5 * np.square(x))
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    t = 1.0 / (1.0 + _P * np.abs(x))
+    polynomial = t * (_B[0] + t * (_B[1] + t * (_B[2] + t * (_B[3] + t * _B[4]))))
+    upper_tail = norm_pdf(x) * polynomial
+    return np.where(x >= 0, 1.0 - upper_tail, upper_tail)
+
+
+def black_scholes_price(
+    is_call: np.ndarray,
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years_to_expiry: np.ndarray,
+    volatility: np.ndarray,
+    rate: float = 0.0
+) -> np.ndarray:
+    # European option prices for whole arrays of contracts (inputs broadcast against each other).
+    # Contracts at or past expiry, or with no volatility, are worth their intrinsic value.
+    is_call, spot, strike, years_to_expiry, volatility = np.broadcast_arrays(
+        np.asarray(is_call, dtype=bool),
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(years_to_expiry, dtype=np.float64),
+        np.asarray(volatility, dtype=np.float64)
+    )
+    live = (years_to_expiry > 0) & (volatility > 0)
+    t = np.where(live, years_to_expiry, 1.0)
+    vol = np.where(live, volatility, 1.0)
+    vol_sqrt_t = vol * np.sqrt(t)
+    discount = np.exp(-rate * t)
+
+    d1 = (np.log(spot / strike) + (rate + 0.5 * np.square(vol)) * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    call = spot * norm_cdf(d1) - strike * discount * norm_cdf(d2)
+    # Put-call parity
+    put = call - spot + strike * discount
+    # The CDF approximation can leave far out-of-the-money prices a hair below zero
+    model = np.maximum(np.where(is_call, call, put), 0.0)
+
+    intrinsic = np.where(is_call, np.maximum(spot - strike, 0.0), np.maximum(strike - spot, 0.0))
+    return np.where(live, model, intrinsic)
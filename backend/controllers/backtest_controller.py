@@ -1,15 +1,146 @@
-from fastapi import APIRouter
-from models.backtest import BacktestRequest, BacktestResponse
-from services.backtest_service import BacktestService
-from repositories.dataset_repository import DatasetRepository
+from typing import AsyncIterator, Dict, Iterator
+from fastapi import APIRouter, Header, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from models.backtest import BacktestRequest, BacktestResponse, RollingBacktestResponse
+from models.multileg import MultiLegBacktestRequest, MultiLegBacktestResponse
+from models.sweep import SweepRequest, SweepResponse
+from services.container import container
+from services.json_encoding import encode_json, encode_ndjson
+from services.request_executor import ExecutorSaturatedError, ExecutorTimeoutError, request_executor
+from services.timing import current_timer, timed_stage
 
 router = APIRouter(prefix="/api/backtest", tags=["backtest"])
 
-dataset_repo = DatasetRepository()
-backtest_service = BacktestService(dataset_repo)
+COLUMNAR_MEDIA_TYPE = "application/vnd.backtester.columnar+json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+FORMAT_QUERY = Query(
+    None,
+    pattern="^(json|columnar|ndjson)$",
+    description="columnar returns the daily series as parallel arrays; ndjson streams one JSON line per row"
+)
+TIMINGS_QUERY = Query(False, description="Include milliseconds per handling stage in the response")
+GREEKS_QUERY = Query(
+    False,
+    description="Add the contract's implied volatility and Greeks to each day (json and columnar formats)"
+)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # Only concrete tags count. ETags are only sent with successful results, so "*" would also
+    # revalidate a request that fails; it is ignored and the request runs.
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def _response_format(format: str | None, accept: str | None) -> str:
+    # An explicit ?format= wins; otherwise the Accept header may ask for one of the compact formats
+    if format:
+        return format
+    media_types = [part.split(";")[0].strip().lower() for part in (accept or "").split(",")]
+    if NDJSON_MEDIA_TYPE in media_types:
+        return "ndjson"
+    if COLUMNAR_MEDIA_TYPE in media_types:
+        return "columnar"
+    return "json"
+
+
+def _render(result: BaseModel, columnar: bool, include_timings: bool, headers: Dict[str, str] | None = None) -> Response:
+    # Serialise a response model as its own timed stage. Results may come from the shared result
+    # cache, so timings are attached to a copy.
+    timer = current_timer()
+    if include_timings and timer is not None:
+        result = result.model_copy(update={"timings": timer.as_ms()})
+    with timed_stage("serialize"):
+        if columnar:
+            return Response(content=encode_json(result.model_dump()), media_type="application/json", headers=headers)
+        return JSONResponse(content=result.model_dump(mode="json"), headers=headers)
+
+
+async def _stream_chunks(first_chunk: bytes, chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    # Each chunk is produced on the request executor. The status line has already been sent, so
+    # executor errors past the first chunk end the stream with an error line instead.
+    yield first_chunk
+    while True:
+        try:
+            chunk = await request_executor.run(next, chunks, None)
+        except (ExecutorSaturatedError, ExecutorTimeoutError) as e:
+            error_code = "SERVER_BUSY" if isinstance(e, ExecutorSaturatedError) else "REQUEST_TIMEOUT"
+            yield encode_ndjson([{"type": "error", "status": "error", "message": str(e), "error_code": error_code}])
+            return
+        if chunk is None:
+            return
+        yield chunk
 
 
 @router.post("/run", response_model=BacktestResponse)
-async def run_backtest(request: BacktestRequest):
-    # Endpoint to execute a backtest with given strategy and date range
-    return backtest_service.execute_backtest(request)
+async def run_backtest(
+    request: BacktestRequest,
+    format: str | None = FORMAT_QUERY,
+    timings: bool = TIMINGS_QUERY,
+    greeks: bool = GREEKS_QUERY,
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None)
+):
+    # Endpoint to execute a backtest with given strategy and date range. Results are content-addressed
+    # by request + dataset version, which is also the ETag, so clients can revalidate with If-None-Match.
+    backtest_service = container.backtest_service()
+    response_format = _response_format(format, accept)
+
+    if response_format == "ndjson":
+        # Summary line once the entry is resolved, then the daily rows in chunks, then the statistics
+        chunks = backtest_service.iter_ndjson_events(request)
+        first_chunk = await request_executor.run(next, chunks)
+        return StreamingResponse(_stream_chunks(first_chunk, chunks), media_type=NDJSON_MEDIA_TYPE)
+
+    result_key = await request_executor.run(backtest_service.get_result_key, request)
+    etag = None
+    if result_key is not None:
+        # Columnar bodies and bodies with Greeks differ from the default one, so each gets its own entity tag
+        variant = (".columnar" if response_format == "columnar" else "") + (".greeks" if greeks else "")
+        etag = f'"{result_key}{variant}"'
+    if etag is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+    # The key computed for the ETag also addresses the result cache, so the request is hashed once
+    if response_format == "columnar":
+        result = await request_executor.run(backtest_service.execute_backtest_columnar_for_key, request, result_key)
+    else:
+        result = await request_executor.run(backtest_service.execute_backtest_for_key, request, result_key)
+    if greeks:
+        result = await request_executor.run(container.analytics_service().attach_greeks, result, request.strategy)
+    headers = {}
+    if result_key is not None and result.status == "success":
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    return _render(result, response_format == "columnar", timings, headers)
+
+
+@router.post("/rolling", response_model=RollingBacktestResponse)
+async def run_rolling_backtest(request: BacktestRequest, timings: bool = TIMINGS_QUERY):
+    # Endpoint to backtest the strategy entered on every trading day of the date range, reporting each
+    # entry date's statistics and their distribution
+    result = await request_executor.run(container.backtest_service().execute_rolling_backtest, request)
+    return _render(result, False, timings)
+
+
+@router.post("/multileg", response_model=MultiLegBacktestResponse)
+async def run_multileg_backtest(request: MultiLegBacktestRequest, timings: bool = TIMINGS_QUERY):
+    # Endpoint to backtest a strategy of several legs (spreads, straddles, condors) opened together
+    result = await request_executor.run(container.multileg_service().execute_backtest, request)
+    return _render(result, False, timings)
+
+
+@router.post("/sweep", response_model=SweepResponse)
+async def run_sweep(
+    request: SweepRequest,
+    format: str | None = Query(None, pattern="^(json|columnar)$"),
+    timings: bool = TIMINGS_QUERY,
+    accept: str | None = Header(None)
+):
+    # Endpoint to backtest every strike/expiry/type/direction/quantity combination in one pass
+    columnar = _response_format(format, accept) == "columnar"
+    result = await request_executor.run(container.sweep_service().run_sweep, request, columnar)
+    return _render(result, columnar, timings)
@@ -1,24 +1,30 @@
-from fastapi import APIRouter, HTTPException
-from models.options import DatasetListResponse, DatasetMetadataResponse
-from services.dataset_service import DatasetService
-from repositories.dataset_repository import DatasetRepository
+from fastapi import APIRouter, HTTPException, Query, Request
+from models.options import DatasetListResponse, DatasetMetadataResponse, DatasetCacheStats, OptionChainResponse
+from models.upload import DatasetUploadResponse, DatasetUploadStatus
+from services.analytics_service import ChainQueryError
+from services.container import container
+from services.request_executor import request_executor
+from services.upload_service import UploadRejectedError
 
 router = APIRouter(prefix="/api/datasets", tags=["datasets"])
 
-dataset_repo = DatasetRepository()
-dataset_service = DatasetService(dataset_repo)
-
 
 @router.get("/list", response_model=DatasetListResponse)
 async def list_datasets():
     # Endpoint to get list of all available datasets for dropdown
-    return dataset_service.list_all_datasets()
+    return await request_executor.run(container.dataset_service().list_all_datasets)
+
+
+@router.get("/cache/stats", response_model=DatasetCacheStats)
+async def get_cache_stats():
+    # Endpoint to inspect the shared dataset cache counters
+    return container.dataset_service().get_cache_stats()
 
 
 @router.get("/{dataset_name}/metadata", response_model=DatasetMetadataResponse)
 async def get_dataset_metadata(dataset_name: str):
     # Endpoint to get detailed metadata including available strikes and expiries
-    response = dataset_service.get_dataset_metadata(dataset_name)
+    response = await request_executor.run(container.dataset_service().get_dataset_metadata, dataset_name)
 
     if response is None:
         raise HTTPException(
@@ -31,3 +37,120 @@ async def get_dataset_metadata(dataset_name: str):
         )
 
     return response
+
+
+@router.get("/{dataset_name}/chain", response_model=OptionChainResponse)
+async def get_option_chain(
+    dataset_name: str,
+    date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$", description="Trading date (YYYY-MM-DD)"),
+    expiry: str | None = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="Only this expiry"),
+    option_type: str | None = Query(None, pattern="^(call|put)$", description="Only calls or only puts")
+):
+    # Endpoint to get every contract quoted on a date with its implied volatility and Greeks. The first
+    # query of a dataset version solves the whole dataset; later ones read the cached results.
+    try:
+        response = await request_executor.run(
+            container.analytics_service().get_option_chain, dataset_name, date, expiry, option_type
+        )
+    except ChainQueryError as e:
+        raise HTTPException(
+            status_code=404,
+            detail={"status": "error", "message": str(e), "error_code": e.error_code}
+        )
+
+    if response is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "error",
+                "message": f"Dataset '{dataset_name}' not found",
+                "error_code": "DATASET_NOT_FOUND"
+            }
+        )
+
+    return response
+
+
+@router.post("/upload", response_model=DatasetUploadResponse, status_code=202)
+async def upload_dataset(
+    request: Request,
+    name: str = Query(..., description="Name the dataset will be listed under"),
+    format: str | None = Query(None, pattern="^(json|csv)$", description="Defaults to the file name or content type"),
+    overwrite: bool = Query(False, description="Replace an existing dataset of the same name")
+):
+    # Endpoint to upload a JSON or CSV dataset as a multipart file part or a raw request body.
+    # The body is streamed to disk; ingestion runs in the background and is tracked via the status URL.
+    upload_service = container.upload_service()
+    content_length = request.headers.get("content-length")
+    try:
+        upload = upload_service.begin(
+            name,
+            content_length=int(content_length) if content_length and content_length.isdigit() else None,
+            overwrite=overwrite
+        )
+        await upload_service.receive(upload, request.stream(), request.headers.get("content-type", ""), format)
+    except UploadRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail={"status": "error", "message": str(e), "error_code": e.error_code}
+        )
+
+    upload_service.start_ingestion(upload)
+    return DatasetUploadResponse(
+        dataset_name=upload.dataset_name,
+        upload_id=upload.upload_id,
+        status=upload.status,
+        bytes_received=upload.bytes_received,
+        status_url=f"{router.prefix}/{upload.dataset_name}/status"
+    )
+
+
+@router.post("/{dataset_name}/append", response_model=DatasetUploadResponse, status_code=202)
+async def append_to_dataset(
+    dataset_name: str,
+    request: Request,
+    format: str | None = Query(None, pattern="^(json|csv)$", description="Defaults to the file name or content type")
+):
+    # Endpoint to append new trading dates (JSON or CSV, same body forms as /upload) to an existing
+    # dataset. Only the new rows are ingested; progress is reported on the status URL.
+    upload_service = container.upload_service()
+    content_length = request.headers.get("content-length")
+    try:
+        upload = upload_service.begin(
+            dataset_name,
+            content_length=int(content_length) if content_length and content_length.isdigit() else None,
+            append=True
+        )
+        await upload_service.receive(upload, request.stream(), request.headers.get("content-type", ""), format)
+    except UploadRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail={"status": "error", "message": str(e), "error_code": e.error_code}
+        )
+
+    upload_service.start_ingestion(upload)
+    return DatasetUploadResponse(
+        dataset_name=upload.dataset_name,
+        upload_id=upload.upload_id,
+        status=upload.status,
+        bytes_received=upload.bytes_received,
+        status_url=f"{router.prefix}/{upload.dataset_name}/status"
+    )
+
+
+@router.get("/{dataset_name}/status", response_model=DatasetUploadStatus)
+async def get_dataset_status(dataset_name: str):
+    # Endpoint to poll an upload's progress; datasets that are already available report "ready"
+    status = await request_executor.run(container.upload_service().get_status, dataset_name)
+
+    if status is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "error",
+                "message": f"Dataset '{dataset_name}' not found",
+                "error_code": "DATASET_NOT_FOUND"
+            }
+        )
+
+    return status
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from models.backtest import BacktestRequest, BacktestResponse
+from models.job import JobSubmitResponse, JobStatusResponse
+from services.container import container
+from services.job_service import Job, JobQueueFullError
+
+router = APIRouter(prefix="/api/backtest/jobs", tags=["jobs"])
+
+EVENT_POLL_INTERVAL_SECONDS = 0.2
+
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = container.job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status": "error",
+                "message": f"Job '{job_id}' not found or expired",
+                "error_code": "JOB_NOT_FOUND"
+            }
+        )
+    return job
+
+
+@router.post("", response_model=JobSubmitResponse, status_code=202)
+async def submit_backtest_job(request: BacktestRequest):
+    # Endpoint to queue a backtest and return immediately with a job id
+    backtest_service = container.backtest_service()
+    try:
+        job = container.job_manager().submit(
+            lambda progress_callback: backtest_service.execute_backtest_cached(request, progress_callback)[0]
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail={"status": "error", "message": str(e), "error_code": "JOB_QUEUE_FULL"},
+            headers={"Retry-After": "1"}
+        )
+
+    base_url = f"{router.prefix}/{job.job_id}"
+    return JobSubmitResponse(
+        job_id=job.job_id,
+        status=job.status,
+        status_url=base_url,
+        result_url=f"{base_url}/result",
+        events_url=f"{base_url}/events",
+        cancel_url=f"{base_url}/cancel"
+    )
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    # Endpoint to poll job status and progress
+    return _get_job_or_404(job_id).to_status()
+
+
+@router.get("/{job_id}/result", response_model=BacktestResponse)
+async def get_job_result(job_id: str):
+    # Endpoint to fetch the backtest response once the job has succeeded
+    job = _get_job_or_404(job_id)
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "status": "error",
+                "message": f"Job '{job_id}' is {job.status}; no result available",
+                "error_code": "JOB_NOT_COMPLETE" if not job.is_finished else "JOB_HAS_NO_RESULT"
+            }
+        )
+    return job.result
+
+
+@router.post("/{job_id}/cancel", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    # Endpoint to cancel a queued or running job (finished jobs are returned unchanged)
+    _get_job_or_404(job_id)
+    return container.job_manager().cancel(job_id).to_status()
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str):
+    # Endpoint streaming job progress as server-sent events until the job finishes
+    job = _get_job_or_404(job_id)
+
+    async def event_stream():
+        sent_version = -1
+        while True:
+            if job.version != sent_version:
+                sent_version = job.version
+                status = job.to_status()
+                event = "done" if job.is_finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(status.model_dump())}\n\n"
+                if job.is_finished:
+                    return
+            await asyncio.sleep(EVENT_POLL_INTERVAL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
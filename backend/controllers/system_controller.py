@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from models.system import ExecutorStats, ResultCacheStats
+from services.request_executor import request_executor
+from services.result_cache import backtest_result_cache
+
+router = APIRouter(prefix="/api/system", tags=["system"])
+
+
+@router.get("/executor", response_model=ExecutorStats)
+async def get_executor_stats():
+    # Endpoint exposing request executor load, queue wait and execution times for worker sizing
+    return ExecutorStats(**request_executor.stats())
+
+
+@router.get("/result-cache", response_model=ResultCacheStats)
+async def get_result_cache_stats():
+    # Endpoint exposing hit/miss counters of the backtest result cache
+    return ResultCacheStats(**backtest_result_cache.stats())
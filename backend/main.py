@@ -1,12 +1,34 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from controllers import strategy_controller, backtest_controller, dataset_controller
+from fastapi.responses import JSONResponse, PlainTextResponse
+from controllers import strategy_controller, backtest_controller, dataset_controller, job_controller, system_controller
+from models.system import ReadinessResponse
+from repositories.shared_datasets import shared_datasets
+from services.container import container
+from services.metrics import http_request_duration_seconds, http_requests_total, metrics
+from services.request_executor import ExecutorSaturatedError, ExecutorTimeoutError, request_executor
+from services.timing import start_request_timer
 import os
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Preload the datasets named by WARMUP_DATASETS in the background; /ready reports progress
+    if container.warmup_datasets.strip():
+        container.warmup_service().start()
+    yield
+    container.shutdown()
+    request_executor.shutdown()
+    # Worker processes exit without running atexit hooks, so shared dataset references are dropped here
+    shared_datasets.release_all()
+
+
 app = FastAPI(
     title="Options Strategy Backtester API",
     description="API for backtesting single-leg options strategies",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS origins - allow localhost for development and production frontend
@@ -26,11 +48,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    # Stage timers for this request, reported in a Server-Timing header and aggregated per route
+    # for /metrics. Streamed responses report the stages completed before their first chunk.
+    timer = start_request_timer()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", "unmatched")
+    http_requests_total.inc(request.method, route_path, str(response.status_code))
+    http_request_duration_seconds.observe(timer.elapsed(), request.method, route_path)
+    response.headers["Server-Timing"] = timer.server_timing()
+    return response
+
+
 app.include_router(strategy_controller.router)
 app.include_router(backtest_controller.router)
 app.include_router(dataset_controller.router)
+app.include_router(job_controller.router)
+app.include_router(system_controller.router)
+
+
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    # Fast rejection when every worker is busy and the wait queue is full
+    return JSONResponse(
+        status_code=503,
+        content={"detail": {"status": "error", "message": str(exc), "error_code": "SERVER_BUSY"}},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(ExecutorTimeoutError)
+async def executor_timeout_handler(request: Request, exc: ExecutorTimeoutError):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": {"status": "error", "message": str(exc), "error_code": "REQUEST_TIMEOUT"}}
+    )
 
 
 @app.get("/")
@@ -41,8 +99,21 @@ async def root():
         "endpoints": {
             "strategy_validation": "/api/strategy/validate",
             "backtest_execution": "/api/backtest/run",
+            "backtest_multileg": "/api/backtest/multileg",
+            "backtest_rolling": "/api/backtest/rolling",
+            "backtest_sweep": "/api/backtest/sweep",
+            "backtest_jobs": "/api/backtest/jobs",
             "list_datasets": "/api/datasets/list",
-            "dataset_metadata": "/api/datasets/{dataset_name}/metadata"
+            "dataset_metadata": "/api/datasets/{dataset_name}/metadata",
+            "option_chain": "/api/datasets/{dataset_name}/chain",
+            "dataset_upload": "/api/datasets/upload",
+            "dataset_append": "/api/datasets/{dataset_name}/append",
+            "dataset_status": "/api/datasets/{dataset_name}/status",
+            "dataset_cache_stats": "/api/datasets/cache/stats",
+            "readiness": "/ready",
+            "metrics": "/metrics",
+            "executor_stats": "/api/system/executor",
+            "result_cache_stats": "/api/system/result-cache"
         }
     }
 
@@ -52,6 +123,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response):
+    # 200 once every warm-up dataset has been loaded (or has failed to); 503 with progress until then
+    readiness = container.warmup_service().readiness()
+    if readiness.status != "ready":
+        response.status_code = 503
+    return readiness
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    # Request and stage latency histograms in the Prometheus text format
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Several workers need the app as an import string; run them with SHARED_DATASETS=1 so they
+    # map one copy of each dataset instead of parsing their own
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run("main:app" if workers > 1 else app, host="0.0.0.0", port=8000, workers=workers)
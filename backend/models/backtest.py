@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import List
+from typing import Dict, List
 from datetime import datetime
 from .strategy import StrategyConfig
 
@@ -53,6 +53,17 @@ class BacktestResults(BaseModel):
     exit_reason: str = Field(pattern="^(expiry|backtest_end)$")
 
 
+class DailyPnLColumns(BaseModel):
+    # The daily series as parallel arrays, one entry per trading day
+    dates: List[str]
+    cumulative_pnl: List[float]
+    underlying_price: List[float]
+
+
+class ColumnarBacktestResults(BacktestResults):
+    daily_pnl: DailyPnLColumns
+
+
 class BacktestResponse(BaseModel):
     status: str = Field(pattern="^(success|error)$")
     strategy_summary: StrategySummary | None = None
@@ -61,3 +72,97 @@ class BacktestResponse(BaseModel):
     execution_time_ms: int | None = None
     message: str | None = None
     error_code: str | None = None
+    # Milliseconds per handling stage, only filled in when the request asks for ?timings=true
+    timings: Dict[str, float] | None = None
+
+
+class ColumnarBacktestResponse(BacktestResponse):
+    results: ColumnarBacktestResults | None = None
+
+
+class DailyPnLWithGreeks(DailyPnL):
+    # Analytics of the backtested contract's quote that day; None when it was not quoted or its
+    # price has no implied volatility (e.g. on expiry)
+    implied_volatility: float | None = None
+    delta: float | None = None
+    gamma: float | None = None
+    theta: float | None = None
+    vega: float | None = None
+
+
+class GreeksBacktestResults(BacktestResults):
+    daily_pnl: List[DailyPnLWithGreeks]
+
+
+class GreeksBacktestResponse(BacktestResponse):
+    results: GreeksBacktestResults | None = None
+
+
+class DailyPnLColumnsWithGreeks(DailyPnLColumns):
+    implied_volatility: List[float | None]
+    delta: List[float | None]
+    gamma: List[float | None]
+    theta: List[float | None]
+    vega: List[float | None]
+
+
+class ColumnarGreeksBacktestResults(ColumnarBacktestResults):
+    daily_pnl: DailyPnLColumnsWithGreeks
+
+
+class ColumnarGreeksBacktestResponse(ColumnarBacktestResponse):
+    results: ColumnarGreeksBacktestResults | None = None
+
+
+class DistributionSummary(BaseModel):
+    count: int
+    mean: float
+    std: float
+    min: float
+    p5: float
+    p25: float
+    median: float
+    p75: float
+    p95: float
+    max: float
+
+
+class RollingEntryResult(BaseModel):
+    # The backtest as if the position had been opened on entry_date and held to the end of the window
+    entry_date: str
+    entry_price: float
+    total_days: int
+    final_pnl: float
+    win_rate: float = Field(ge=0, le=100)
+    max_drawdown: float
+
+
+class RollingBacktestSummary(BaseModel):
+    entries_tested: int
+    # Trading days in the window without a quote for the contract, so no position could be opened
+    entries_skipped: int
+    profitable_entries: int
+    profitable_pct: float = Field(ge=0, le=100)
+    best_entry_date: str
+    worst_entry_date: str
+    final_pnl: DistributionSummary
+    win_rate: DistributionSummary
+    max_drawdown: DistributionSummary
+
+
+class RollingBacktestResults(BaseModel):
+    entries: List[RollingEntryResult]
+    summary: RollingBacktestSummary
+    position_closed: bool
+    exit_reason: str = Field(pattern="^(expiry|backtest_end)$")
+
+
+class RollingBacktestResponse(BaseModel):
+    status: str = Field(pattern="^(success|error)$")
+    backtest_period: BacktestPeriod | None = None
+    results: RollingBacktestResults | None = None
+    execution_time_ms: int | None = None
+    message: str | None = None
+    error_code: str | None = None
+    # Milliseconds per handling stage, only filled in when the request asks for ?timings=true
+    timings: Dict[str, float] | None = None
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    result_url: str
+    events_url: str
+    cancel_url: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str = Field(pattern="^(queued|running|succeeded|failed|cancelled)$")
+    stage: str | None = None
+    progress: float = Field(ge=0, le=1)
+    created_at: str
+    started_at: str | None = None
+    finished_at: str | None = None
+    message: str | None = None
+    error_code: str | None = None
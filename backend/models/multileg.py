@@ -0,0 +1,61 @@
+from pydantic import BaseModel, Field, validator
+from typing import Dict, List
+from datetime import datetime
+from .backtest import DateRange, BacktestPeriod, BacktestResults
+
+# Upper bound on legs per strategy (a condor has four)
+MAX_STRATEGY_LEGS = 8
+
+
+class StrategyLeg(BaseModel):
+    option_type: str = Field(pattern="^(call|put)$")
+    strike: float = Field(gt=0)
+    expiry: str
+    position_direction: str = Field(pattern="^(buy|sell)$")
+    quantity: int = Field(gt=0)
+
+    @validator('expiry')
+    def validate_date_format(cls, v):
+        try:
+            datetime.strptime(v, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError('Expiry must be in YYYY-MM-DD format')
+        return v
+
+
+class MultiLegStrategyConfig(BaseModel):
+    # All legs are opened together on the first trading day of the range
+    dataset_name: str
+    legs: List[StrategyLeg] = Field(min_length=1, max_length=MAX_STRATEGY_LEGS)
+
+
+class MultiLegBacktestRequest(BaseModel):
+    strategy: MultiLegStrategyConfig
+    date_range: DateRange
+
+
+class LegSummary(StrategyLeg):
+    entry_price: float
+    # The leg's P/L at the end of the window (settled at intrinsic value if its expiry was reached)
+    final_pnl: float
+    position_closed: bool
+
+
+class MultiLegStrategySummary(BaseModel):
+    entry_date: str
+    # Premium paid to open every leg (negative for a net credit)
+    entry_cost: float
+    legs: List[LegSummary]
+
+
+class MultiLegBacktestResponse(BaseModel):
+    status: str = Field(pattern="^(success|error)$")
+    strategy_summary: MultiLegStrategySummary | None = None
+    backtest_period: BacktestPeriod | None = None
+    # Combined P/L of all legs; position_closed once every leg has expired
+    results: BacktestResults | None = None
+    execution_time_ms: int | None = None
+    message: str | None = None
+    error_code: str | None = None
+    # Milliseconds per handling stage, only filled in when the request asks for ?timings=true
+    timings: Dict[str, float] | None = None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, List, Dict
 
 
 class OptionRecord(BaseModel):
@@ -21,6 +21,9 @@ class OptionsDataset(BaseModel):
     metadata: DatasetMetadata
     data: List[OptionRecord]
 
+    # Columnar index built once per dataset by repositories.columnar_store
+    _columnar_store: Any = PrivateAttr(default=None)
+
 
 class DatasetInfo(BaseModel):
     name: str
@@ -39,3 +42,49 @@ class DatasetMetadataResponse(BaseModel):
     available_expiries: List[str]
     available_strikes: Dict[str, List[float]]
     record_count: int
+
+
+class DatasetCatalogEntry(BaseModel):
+    # Sidecar summary of a dataset, enough to answer list/metadata calls without loading it
+    source_file: str
+    source_mtime_ns: int
+    source_size: int
+    metadata: DatasetMetadata
+    record_count: int
+    dates: List[str]
+    expiries: List[str]
+    strikes_by_expiry: Dict[str, List[float]]
+    strikes_by_expiry_type: Dict[str, Dict[str, List[float]]]
+
+
+class DatasetCacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+    shared_mode: bool = False
+    shared_attached: int = 0
+
+
+class OptionChainRow(BaseModel):
+    expiry: str
+    strike: float
+    option_type: str
+    mid_price: float
+    # None when the price has no implied volatility (e.g. on expiry or below intrinsic value)
+    implied_volatility: float | None = None
+    delta: float | None = None
+    gamma: float | None = None
+    theta: float | None = None
+    vega: float | None = None
+
+
+class OptionChainResponse(BaseModel):
+    dataset_name: str
+    date: str
+    underlying_price: float
+    risk_free_rate: float
+    rows: List[OptionChainRow]
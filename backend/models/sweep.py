@@ -0,0 +1,92 @@
+from pydantic import BaseModel, Field, validator
+from typing import Dict, List
+from datetime import datetime
+from .strategy import StrategyConfig
+from .backtest import DateRange, DailyPnL, DailyPnLColumns
+
+
+class SweepRequest(BaseModel):
+    # The template supplies the dataset and any dimension whose list is left empty
+    strategy: StrategyConfig
+    date_range: DateRange
+    strikes: List[float] = Field(default_factory=list)
+    expiries: List[str] = Field(default_factory=list)
+    option_types: List[str] = Field(default_factory=list)
+    position_directions: List[str] = Field(default_factory=list)
+    quantities: List[int] = Field(default_factory=list)
+    rank_by: str = Field(default="final_pnl", pattern="^(final_pnl|win_rate|max_drawdown)$")
+    include_daily_pnl: bool = False
+
+    @validator('strikes', each_item=True)
+    def validate_strike(cls, v):
+        if v <= 0:
+            raise ValueError('Strike must be greater than 0')
+        return v
+
+    @validator('expiries', each_item=True)
+    def validate_expiry_format(cls, v):
+        try:
+            datetime.strptime(v, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError('Expiry must be in YYYY-MM-DD format')
+        return v
+
+    @validator('option_types', each_item=True)
+    def validate_option_type(cls, v):
+        if v not in ("call", "put"):
+            raise ValueError('Option type must be call or put')
+        return v
+
+    @validator('position_directions', each_item=True)
+    def validate_position_direction(cls, v):
+        if v not in ("buy", "sell"):
+            raise ValueError('Position direction must be buy or sell')
+        return v
+
+    @validator('quantities', each_item=True)
+    def validate_quantity(cls, v):
+        if v <= 0:
+            raise ValueError('Quantity must be greater than 0')
+        return v
+
+
+class SweepResult(BaseModel):
+    rank: int | None = None
+    status: str = Field(pattern="^(success|error)$")
+    option_type: str
+    strike: float
+    expiry: str
+    position_direction: str
+    quantity: int
+    entry_date: str | None = None
+    entry_price: float | None = None
+    final_pnl: float | None = None
+    win_rate: float | None = None
+    max_drawdown: float | None = None
+    position_closed: bool | None = None
+    exit_reason: str | None = None
+    total_days: int | None = None
+    daily_pnl: List[DailyPnL] | None = None
+    message: str | None = None
+    error_code: str | None = None
+
+
+class ColumnarSweepResult(SweepResult):
+    daily_pnl: DailyPnLColumns | None = None
+
+
+class SweepResponse(BaseModel):
+    status: str = Field(pattern="^(success|error)$")
+    dataset_name: str | None = None
+    total_combinations: int = 0
+    successful_combinations: int = 0
+    results: List[SweepResult] = Field(default_factory=list)
+    execution_time_ms: int | None = None
+    message: str | None = None
+    error_code: str | None = None
+    # Milliseconds per handling stage, only filled in when the request asks for ?timings=true
+    timings: Dict[str, float] | None = None
+
+
+class ColumnarSweepResponse(SweepResponse):
+    results: List[ColumnarSweepResult] = Field(default_factory=list)
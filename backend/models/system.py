@@ -0,0 +1,47 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class DurationSummary(BaseModel):
+    count: int
+    avg_ms: float
+    max_ms: float
+
+
+class ExecutorStats(BaseModel):
+    max_workers: int
+    max_queue: int
+    timeout_seconds: float
+    running: int
+    waiting: int
+    completed: int
+    rejected: int
+    timed_out: int
+    queue_wait: DurationSummary
+    execution: DurationSummary
+
+
+class ResultCacheStats(BaseModel):
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    memory_entries: int
+    max_entries: int
+    disk_enabled: bool
+
+
+class DatasetWarmupStatus(BaseModel):
+    dataset_name: str
+    # not_cached: loaded, but evicted from the dataset cache since (it does not fit DATASET_CACHE_MAX_BYTES
+    # next to the other datasets), so the next request loads it again
+    status: str = Field(pattern="^(pending|loading|ready|not_cached|failed)$")
+    duration_ms: Optional[int] = None
+    record_count: Optional[int] = None
+    message: Optional[str] = None
+
+
+class ReadinessResponse(BaseModel):
+    status: str = Field(pattern="^(ready|warming)$")
+    datasets_total: int
+    datasets_finished: int
+    datasets: List[DatasetWarmupStatus]
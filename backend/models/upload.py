@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+
+
+class DatasetUploadResponse(BaseModel):
+    dataset_name: str
+    upload_id: str
+    status: str
+    bytes_received: int
+    status_url: str
+
+
+class DatasetUploadStatus(BaseModel):
+    dataset_name: str
+    upload_id: str | None = None
+    mode: str = Field("create", pattern="^(create|append)$")
+    status: str = Field(pattern="^(receiving|queued|ingesting|ready|failed)$")
+    progress: float = Field(ge=0, le=1)
+    bytes_received: int = 0
+    rows_read: int = 0
+    rows_rejected: int = 0
+    record_count: int | None = None
+    created_at: str | None = None
+    finished_at: str | None = None
+    message: str | None = None
+    error_code: str | None = None
@@ -0,0 +1,116 @@
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, Tuple
+import numpy as np
+from models.options import DatasetMetadata, OptionsDataset
+from repositories.columnar_store import (
+    COLUMN_ARRAYS, INDEX_ARRAYS, ColumnarOptionsStore, dataset_from_store
+)
+
+# File layout:
+#   magic (8 bytes) | header length (uint64) | data offset (uint64) | JSON header | padding | arrays
+# The JSON header holds the DatasetMetadata, the date/expiry dictionaries and, per array, its dtype,
+# length and offset relative to the data section. Every array starts on an ALIGNMENT boundary so it
+# can be viewed in place from a read-only memory map.
+BINARY_SUFFIX = ".optbin"
+MAGIC = b"OPTBIN01"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+# Arrays are written in slices of this many elements so memory-mapped inputs are never copied whole
+WRITE_SLICE_ELEMENTS = 1 << 20
+_PREFIX = struct.Struct("<8sQQ")
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _write_padding(f: BinaryIO, position: int) -> int:
+    aligned = _align(position)
+    f.write(b"\0" * (aligned - position))
+    return aligned
+
+
+def write_binary_dataset(path: Path, metadata: DatasetMetadata, store: ColumnarOptionsStore) -> None:
+    # Serialise a store (columns and index) to the binary format, replacing the target atomically
+    arrays: Dict[str, np.ndarray] = {
+        name: np.ascontiguousarray(getattr(store, name)) for name in COLUMN_ARRAYS + INDEX_ARRAYS
+    }
+
+    columns = {}
+    offset = 0
+    for name, array in arrays.items():
+        columns[name] = {"dtype": array.dtype.str, "length": int(array.shape[0]), "offset": offset}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "metadata": metadata.model_dump(),
+        "dates": store.dates,
+        "expiries": store.expiries,
+        "columns": columns
+    }).encode("utf-8")
+    data_offset = _align(_PREFIX.size + len(header))
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header), data_offset))
+        f.write(header)
+        position = _write_padding(f, _PREFIX.size + len(header))
+
+        for array in arrays.values():
+            position = _write_padding(f, position)
+            for start in range(0, len(array), WRITE_SLICE_ELEMENTS):
+                f.write(array[start:start + WRITE_SLICE_ELEMENTS].tobytes())
+            position += array.nbytes
+
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def read_binary_header(path: Path) -> Tuple[dict, int]:
+    # Read only the JSON header (no column data), returning it with the data section offset
+    with open(path, "rb") as f:
+        magic, header_length, data_offset = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary options dataset")
+        header = json.loads(f.read(header_length))
+
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary dataset version {header.get('version')}")
+    return header, data_offset
+
+
+def store_from_buffer(buffer, header: dict, data_offset: int) -> ColumnarOptionsStore:
+    # View every array directly inside a buffer (mmap or shared memory) without copying
+    arrays = {
+        name: np.frombuffer(
+            buffer,
+            dtype=np.dtype(spec["dtype"]),
+            count=spec["length"],
+            offset=data_offset + spec["offset"]
+        )
+        for name, spec in header["columns"].items()
+    }
+    return ColumnarOptionsStore(
+        dates=header["dates"],
+        expiries=header["expiries"],
+        index={name: arrays[name] for name in INDEX_ARRAYS},
+        **{name: arrays[name] for name in COLUMN_ARRAYS}
+    )
+
+
+def open_binary_dataset(path: Path) -> OptionsDataset:
+    # Memory-map a binary dataset; pages are loaded on demand and shared between processes
+    header, data_offset = read_binary_header(path)
+
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    store = store_from_buffer(buffer, header, data_offset)
+    return dataset_from_store(DatasetMetadata(**header["metadata"]), store)
@@ -0,0 +1,320 @@
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from models.options import DatasetMetadata, OptionsDataset, OptionRecord
+
+OPTION_TYPES = ("call", "put")
+TYPE_CODES = {name: code for code, name in enumerate(OPTION_TYPES)}
+
+# Per-row data columns and the derived index arrays, in storage order
+COLUMN_ARRAYS = ("date_codes", "expiry_codes", "strikes", "type_codes", "mid_prices", "underlyings")
+INDEX_ARRAYS = (
+    "order", "sorted_date_codes", "contract_offsets", "contract_expiry_codes",
+    "contract_type_codes", "contract_strikes", "underlying_by_date"
+)
+
+_build_lock = threading.Lock()
+
+
+class OptionsStoreBase(ABC):
+    # Lookups shared by every store layout. Subclasses set dates, expiries and the contract table
+    # (contract_expiry_codes / contract_type_codes / contract_strikes, ordered by expiry, type,
+    # strike), then call _build_lookups.
+
+    dates: List[str]
+    expiries: List[str]
+    contract_expiry_codes: np.ndarray
+    contract_type_codes: np.ndarray
+    contract_strikes: np.ndarray
+
+    def _build_lookups(self) -> None:
+        self.date_lookup = {date: code for code, date in enumerate(self.dates)}
+        self.expiry_lookup = {expiry: code for code, expiry in enumerate(self.expiries)}
+
+        # Hash index from (strike, expiry code, type code) to contract id
+        self.contract_lookup = {
+            (strike, expiry_code, type_code): contract_id
+            for contract_id, (strike, expiry_code, type_code) in enumerate(zip(
+                self.contract_strikes.tolist(),
+                self.contract_expiry_codes.tolist(),
+                self.contract_type_codes.tolist()
+            ))
+        }
+
+    def find_contract(self, strike: float, expiry: str, option_type: str) -> Optional[int]:
+        # Resolve a contract id from its attributes, or None if it is not in the dataset
+        expiry_code = self.expiry_lookup.get(expiry)
+        type_code = TYPE_CODES.get(option_type)
+        if expiry_code is None or type_code is None:
+            return None
+        return self.contract_lookup.get((strike, expiry_code, type_code))
+
+    def gather_prices(self, contract_id: int, date_codes: np.ndarray) -> np.ndarray:
+        # Mid prices for one contract on each requested date (NaN where there is no quote)
+        return self.gather_matrix(np.array([contract_id]), date_codes)[0]
+
+    @property
+    @abstractmethod
+    def record_count(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        ...
+
+    @abstractmethod
+    def record(self, row: int) -> OptionRecord:
+        # The row-th record in storage order
+        ...
+
+    @abstractmethod
+    def gather_matrix(self, contract_ids: np.ndarray, date_codes: np.ndarray) -> np.ndarray:
+        # (contract x date) mid prices, NaN where a contract has no quote on a date
+        ...
+
+    def date_code_range(self, start_date: str, end_date: str) -> Tuple[int, int]:
+        # Half-open range of date codes whose dates fall within [start_date, end_date]
+        return bisect_left(self.dates, start_date), bisect_right(self.dates, end_date)
+
+    def strikes_for_expiry(self, expiry: str, option_type: str) -> List[float]:
+        expiry_code = self.expiry_lookup.get(expiry)
+        type_code = TYPE_CODES.get(option_type)
+        if expiry_code is None or type_code is None:
+            return []
+        mask = (self.contract_expiry_codes == expiry_code) & (self.contract_type_codes == type_code)
+        return sorted(self.contract_strikes[mask].tolist())
+
+    def strikes_by_expiry_type(self) -> Dict[str, Dict[str, List[float]]]:
+        # expiry -> option type -> sorted strikes, straight from the contract table
+        strikes_by_expiry_type: Dict[str, Dict[str, List[float]]] = {}
+        for expiry_code, type_code, strike in zip(
+            self.contract_expiry_codes.tolist(),
+            self.contract_type_codes.tolist(),
+            self.contract_strikes.tolist()
+        ):
+            by_type = strikes_by_expiry_type.setdefault(self.expiries[expiry_code], {})
+            by_type.setdefault(OPTION_TYPES[type_code], []).append(strike)
+        return strikes_by_expiry_type
+
+    def strikes_by_expiry(self) -> Dict[str, List[float]]:
+        strikes_by_expiry = {}
+        for expiry_code, expiry in enumerate(self.expiries):
+            strikes = np.unique(self.contract_strikes[self.contract_expiry_codes == expiry_code])
+            if len(strikes):
+                strikes_by_expiry[expiry] = strikes.tolist()
+        return strikes_by_expiry
+
+
+class ColumnarOptionsStore(OptionsStoreBase):
+    # Options chain held as parallel NumPy columns with dictionary-encoded dates/expiries.
+    # Rows keep their original order; the index below is a stable sort of row ids by
+    # (contract, date) so every lookup resolves to the same record the old linear scans found.
+
+    def __init__(
+        self,
+        dates: Sequence[str],
+        expiries: Sequence[str],
+        date_codes: np.ndarray,
+        expiry_codes: np.ndarray,
+        strikes: np.ndarray,
+        type_codes: np.ndarray,
+        mid_prices: np.ndarray,
+        underlyings: np.ndarray,
+        index: Optional[Dict[str, np.ndarray]] = None
+    ):
+        self.dates = list(dates)
+        self.expiries = list(expiries)
+        self.date_codes = date_codes
+        self.expiry_codes = expiry_codes
+        self.strikes = strikes
+        self.type_codes = type_codes
+        self.mid_prices = mid_prices
+        self.underlyings = underlyings
+
+        if index is None:
+            index = self._build_index()
+        for name in INDEX_ARRAYS:
+            setattr(self, name, index[name])
+
+        self._build_lookups()
+
+    @classmethod
+    def from_records(cls, records: Sequence[OptionRecord]) -> "ColumnarOptionsStore":
+        # Encode a list of validated records into columns and build the index
+        row_count = len(records)
+        raw_dates = np.array([record.date for record in records], dtype=object)
+        raw_expiries = np.array([record.expiry for record in records], dtype=object)
+
+        if row_count:
+            dates, date_codes = np.unique(raw_dates, return_inverse=True)
+            expiries, expiry_codes = np.unique(raw_expiries, return_inverse=True)
+        else:
+            dates, date_codes = np.array([], dtype=object), np.array([], dtype=np.int32)
+            expiries, expiry_codes = np.array([], dtype=object), np.array([], dtype=np.int32)
+
+        return cls(
+            dates=dates.tolist(),
+            expiries=expiries.tolist(),
+            date_codes=date_codes.astype(np.int32),
+            expiry_codes=expiry_codes.astype(np.int32),
+            strikes=np.fromiter((record.strike for record in records), dtype=np.float64, count=row_count),
+            type_codes=np.fromiter((TYPE_CODES[record.type] for record in records), dtype=np.int8, count=row_count),
+            mid_prices=np.fromiter((record.mid_price for record in records), dtype=np.float64, count=row_count),
+            underlyings=np.fromiter((record.underlying for record in records), dtype=np.float64, count=row_count)
+        )
+
+    def _build_index(self) -> Dict[str, np.ndarray]:
+        # Group rows by contract (expiry, type, strike) and sort each group by date
+        n_dates = len(self.dates)
+        if len(self.strikes) == 0:
+            empty_int = np.array([], dtype=np.int64)
+            return {
+                "order": empty_int,
+                "sorted_date_codes": np.array([], dtype=np.int32),
+                "contract_offsets": np.zeros(1, dtype=np.int64),
+                "contract_expiry_codes": np.array([], dtype=np.int32),
+                "contract_type_codes": np.array([], dtype=np.int8),
+                "contract_strikes": np.array([], dtype=np.float64),
+                "underlying_by_date": np.zeros(n_dates, dtype=np.float64)
+            }
+
+        unique_strikes, strike_codes = np.unique(self.strikes, return_inverse=True)
+        composite = (
+            (self.expiry_codes.astype(np.int64) * len(OPTION_TYPES) + self.type_codes)
+            * len(unique_strikes) + strike_codes
+        )
+        contract_keys, contract_ids = np.unique(composite, return_inverse=True)
+        contract_ids = contract_ids.astype(np.int64)
+
+        order = np.argsort(contract_ids * max(n_dates, 1) + self.date_codes, kind="stable")
+        counts = np.bincount(contract_ids, minlength=len(contract_keys))
+        contract_offsets = np.zeros(len(contract_keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=contract_offsets[1:])
+
+        # Decode the contract attributes back out of the composite key
+        strike_part = contract_keys % len(unique_strikes)
+        type_expiry_part = contract_keys // len(unique_strikes)
+
+        # The first record seen for each date defines that date's underlying price
+        _, first_rows = np.unique(self.date_codes, return_index=True)
+
+        return {
+            "order": order,
+            "sorted_date_codes": self.date_codes[order],
+            "contract_offsets": contract_offsets,
+            "contract_expiry_codes": (type_expiry_part // len(OPTION_TYPES)).astype(np.int32),
+            "contract_type_codes": (type_expiry_part % len(OPTION_TYPES)).astype(np.int8),
+            "contract_strikes": unique_strikes[strike_part],
+            "underlying_by_date": self.underlyings[first_rows]
+        }
+
+    @property
+    def record_count(self) -> int:
+        return len(self.strikes)
+
+    @property
+    def nbytes(self) -> int:
+        # Approximate memory held by the columns and index arrays
+        return int(sum(getattr(self, name).nbytes for name in COLUMN_ARRAYS + INDEX_ARRAYS))
+
+    def record(self, row: int) -> OptionRecord:
+        # Materialise a single row back into an OptionRecord (values were validated when the store was built)
+        return OptionRecord.model_construct(
+            date=self.dates[self.date_codes[row]],
+            underlying=float(self.underlyings[row]),
+            expiry=self.expiries[self.expiry_codes[row]],
+            strike=float(self.strikes[row]),
+            type=OPTION_TYPES[self.type_codes[row]],
+            mid_price=float(self.mid_prices[row])
+        )
+
+    def find_row(self, contract_id: int, date_code: int) -> Optional[int]:
+        # Binary search the contract's date-sorted slice for a single trading date
+        lo = self.contract_offsets[contract_id]
+        hi = self.contract_offsets[contract_id + 1]
+        pos = lo + int(np.searchsorted(self.sorted_date_codes[lo:hi], date_code))
+        if pos < hi and self.sorted_date_codes[pos] == date_code:
+            return int(self.order[pos])
+        return None
+
+    def price_on(self, contract_id: int, date_code: int) -> Optional[float]:
+        # Mid price of one contract on one date, or None if it was not quoted
+        row = self.find_row(contract_id, date_code)
+        return None if row is None else float(self.mid_prices[row])
+
+    def rows_in_date_code_range(self, lo: int, hi: int) -> np.ndarray:
+        # Row ids (in storage order) whose date code falls in [lo, hi)
+        return np.flatnonzero((self.date_codes >= lo) & (self.date_codes < hi))
+
+    def gather_matrix(self, contract_ids: np.ndarray, date_codes: np.ndarray) -> np.ndarray:
+        # Mid prices for several contracts over the same dates as one (contracts x dates) array.
+        # The contracts' date-sorted slices are concatenated under a (contract slot, date) key so
+        # the whole gather is a single searchsorted; rows touched are only those of these contracts.
+        contract_ids = np.asarray(contract_ids, dtype=np.int64)
+        date_codes = np.asarray(date_codes, dtype=np.int64)
+        key_stride = max(len(self.dates), 1)
+
+        starts = self.contract_offsets[contract_ids]
+        lengths = self.contract_offsets[contract_ids + 1] - starts
+        slots = np.arange(len(contract_ids), dtype=np.int64)
+
+        slice_starts = np.cumsum(lengths) - lengths
+        positions = np.arange(int(lengths.sum()), dtype=np.int64) + np.repeat(starts - slice_starts, lengths)
+        keys = np.repeat(slots, lengths) * key_stride + self.sorted_date_codes[positions]
+
+        queries = (slots[:, None] * key_stride + date_codes[None, :]).ravel()
+        hits = np.searchsorted(keys, queries)
+        in_bounds = hits < len(keys)
+        found = np.zeros(len(queries), dtype=bool)
+        found[in_bounds] = keys[hits[in_bounds]] == queries[in_bounds]
+        # Codes outside the date dictionary would alias into a neighbouring contract's key range
+        found &= np.tile((date_codes >= 0) & (date_codes < len(self.dates)), len(contract_ids))
+
+        prices = np.full(len(queries), np.nan, dtype=np.float64)
+        prices[found] = self.mid_prices[self.order[positions[hits[found]]]]
+        return prices.reshape(len(contract_ids), len(date_codes))
+
+
+class LazyRecords(Sequence[OptionRecord]):
+    # Read-only list view over a store that builds OptionRecord objects only when rows are accessed
+
+    def __init__(self, store: OptionsStoreBase):
+        self.store = store
+
+    def __len__(self) -> int:
+        return self.store.record_count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[OptionRecord, List[OptionRecord]]:
+        if isinstance(index, slice):
+            return [self.store.record(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        return self.store.record(index)
+
+    def __iter__(self) -> Iterator[OptionRecord]:
+        for row in range(len(self)):
+            yield self.store.record(row)
+
+
+def dataset_from_store(metadata: DatasetMetadata, store: OptionsStoreBase) -> OptionsDataset:
+    # Wrap an already-built store in an OptionsDataset without materialising per-row models
+    dataset = OptionsDataset.model_construct(metadata=metadata, data=LazyRecords(store))
+    dataset._columnar_store = store
+    return dataset
+
+
+def get_columnar_store(dataset: OptionsDataset) -> OptionsStoreBase:
+    # Build the columnar store for a dataset the first time it is needed and keep it on the dataset
+    store = dataset._columnar_store
+    if store is None:
+        with _build_lock:
+            store = dataset._columnar_store
+            if store is None:
+                store = ColumnarOptionsStore.from_records(dataset.data)
+                dataset._columnar_store = store
+    return store
@@ -0,0 +1,227 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from models.options import OptionsDataset
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Rough per-row footprint of a parsed OptionRecord (model instance, field dict, str/float objects)
+RECORD_OVERHEAD_BYTES = 600
+
+
+@dataclass
+class CacheEntry:
+    mtime_ns: int
+    size: int
+    dataset: OptionsDataset
+    # Dataset plus attachment bytes
+    nbytes: int
+    # Data derived from this dataset version (e.g. Greeks), by name, with its size in bytes
+    attachments: Dict[str, Tuple[Any, int]] = field(default_factory=dict)
+
+
+def estimate_dataset_bytes(dataset: OptionsDataset) -> int:
+    # Approximate resident size of a parsed dataset plus its columnar index
+    store = dataset._columnar_store
+    store_bytes = store.nbytes if store is not None else 0
+    if not isinstance(dataset.data, list):
+        # Lazily materialised records (binary datasets) hold no per-row objects
+        return store_bytes
+    return len(dataset.data) * RECORD_OVERHEAD_BYTES + store_bytes
+
+
+class KeyedLocks:
+    # One lock per key, kept only while a thread holds or waits for it, so keys that are used once
+    # (paths of replaced dataset versions, say) do not accumulate for the life of the process
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        # Lock and number of threads holding or waiting for it, per key
+        self._locks: Dict[str, Tuple[threading.Lock, int]] = {}
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        with self._guard:
+            lock, users = self._locks.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                users = self._locks[key][1] - 1
+                if users:
+                    self._locks[key] = (lock, users)
+                else:
+                    del self._locks[key]
+
+    def __len__(self) -> int:
+        with self._guard:
+            return len(self._locks)
+
+
+class DatasetCache:
+    # Process-wide LRU of parsed datasets, invalidated when the source file's mtime or size changes
+    # and bounded by an approximate byte budget. Data derived from a dataset can be attached to its
+    # entry: it counts against the same budget and is dropped whenever the dataset is.
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks = KeyedLocks()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, path: Path, loader: Callable[[Path], Optional[OptionsDataset]]) -> Optional[OptionsDataset]:
+        # Return the cached dataset for a file, loading it with `loader` on a miss or stale entry
+        key = str(path.resolve())
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        dataset = self._lookup(key, stat.st_mtime_ns, stat.st_size)
+        if dataset is not None:
+            return dataset
+
+        # Only one thread parses a given file; the others wait and then hit the cache
+        with self._load_locks.hold(key):
+            dataset = self._lookup(key, stat.st_mtime_ns, stat.st_size)
+            if dataset is not None:
+                return dataset
+
+            with self._lock:
+                self.misses += 1
+
+            dataset = loader(path)
+            if dataset is not None:
+                self._store(key, CacheEntry(
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    dataset=dataset,
+                    nbytes=estimate_dataset_bytes(dataset)
+                ))
+            return dataset
+
+    def get_attachment(self, path: Path, dataset: OptionsDataset, name: str) -> Optional[Any]:
+        # The value attached under name to the cached entry holding exactly this dataset, if any
+        key = str(path.resolve())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.dataset is not dataset or name not in entry.attachments:
+                return None
+            self._entries.move_to_end(key)
+            return entry.attachments[name][0]
+
+    def attach(self, path: Path, dataset: OptionsDataset, name: str, value: Any, nbytes: int) -> bool:
+        # Keep value with the cached entry of this dataset, evicting other datasets to make room.
+        # Returns False (nothing retained) if the dataset is not cached, e.g. because it was
+        # reloaded or evicted, or if the entry would no longer fit the budget.
+        key = str(path.resolve())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.dataset is not dataset:
+                return False
+            previous = entry.attachments.pop(name, None)
+            if previous is not None:
+                entry.nbytes -= previous[1]
+                self._current_bytes -= previous[1]
+            if entry.nbytes + nbytes > self.max_bytes:
+                return False
+
+            entry.attachments[name] = (value, nbytes)
+            entry.nbytes += nbytes
+            self._current_bytes += nbytes
+            self._entries.move_to_end(key)
+            self._evict_over_budget()
+            return True
+
+    def contains(self, path: Path) -> bool:
+        # Whether a dataset loaded from this file is held, without counting a hit or refreshing its LRU position
+        key = str(path.resolve())
+        with self._lock:
+            return key in self._entries
+
+    def invalidate(self, path: Path) -> None:
+        key = str(path.resolve())
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._current_bytes -= entry.nbytes
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        # Drop every entry and start the counters over
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "current_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def _lookup(self, key: str, mtime_ns: int, size: int) -> Optional[OptionsDataset]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry.mtime_ns != mtime_ns or entry.size != size:
+                # Source file changed on disk since it was cached
+                del self._entries[key]
+                self._current_bytes -= entry.nbytes
+                self.invalidations += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.dataset
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous.nbytes
+
+            # Datasets larger than the whole budget are served but never retained
+            if entry.nbytes > self.max_bytes:
+                return
+
+            self._entries[key] = entry
+            self._current_bytes += entry.nbytes
+            self._evict_over_budget()
+
+    def _evict_over_budget(self) -> None:
+        # Drop least recently used entries (never the newest) until the budget holds; caller holds the lock
+        while self._current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._current_bytes -= evicted.nbytes
+            self.evictions += 1
+
+
+dataset_cache = DatasetCache(
+    max_bytes=int(os.getenv("DATASET_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+)
@@ -0,0 +1,99 @@
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from models.options import DatasetCatalogEntry, DatasetMetadata
+from repositories.columnar_store import OptionsStoreBase
+
+CATALOG_DIR_NAME = ".catalog"
+CATALOG_SUFFIX = ".catalog.json"
+
+
+def build_catalog_entry(source_path: Path, metadata: DatasetMetadata, store: OptionsStoreBase) -> DatasetCatalogEntry:
+    # Summarise a dataset from its columnar store; cost is proportional to dates and contracts, not rows
+    stat = source_path.stat()
+    return DatasetCatalogEntry(
+        source_file=source_path.name,
+        source_mtime_ns=stat.st_mtime_ns,
+        source_size=stat.st_size,
+        metadata=metadata,
+        record_count=metadata.record_count,
+        dates=store.dates,
+        expiries=store.expiries,
+        strikes_by_expiry=store.strikes_by_expiry(),
+        strikes_by_expiry_type=store.strikes_by_expiry_type()
+    )
+
+
+class DatasetCatalog:
+    # One small sidecar file per dataset under <data_dir>/.catalog, plus an in-memory copy.
+    # An entry is valid only while the source file's name, mtime and size match what it recorded.
+
+    def __init__(self, data_dir: Path):
+        self.catalog_dir = data_dir / CATALOG_DIR_NAME
+        self._entries: Dict[str, DatasetCatalogEntry] = {}
+        self._lock = threading.Lock()
+
+    def sidecar_path(self, dataset_name: str) -> Path:
+        return self.catalog_dir / f"{dataset_name}{CATALOG_SUFFIX}"
+
+    def get(
+        self,
+        dataset_name: str,
+        source_path: Path,
+        build: Callable[[], Optional[DatasetCatalogEntry]]
+    ) -> Optional[DatasetCatalogEntry]:
+        # Return a fresh entry for the dataset, building (and persisting) it via `build` when stale or missing
+        fingerprint = self._fingerprint(source_path)
+
+        with self._lock:
+            entry = self._entries.get(dataset_name)
+        if entry is not None and self._matches(entry, fingerprint):
+            return entry
+
+        entry = self._read_sidecar(dataset_name)
+        if entry is None or not self._matches(entry, fingerprint):
+            entry = build()
+            if entry is None:
+                return None
+            self.write(dataset_name, entry)
+
+        with self._lock:
+            self._entries[dataset_name] = entry
+        return entry
+
+    def write(self, dataset_name: str, entry: DatasetCatalogEntry) -> None:
+        # Persist atomically; a read-only data directory just means the catalog lives in memory
+        try:
+            self.catalog_dir.mkdir(parents=True, exist_ok=True)
+            path = self.sidecar_path(dataset_name)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_text(entry.model_dump_json())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing catalog for dataset {dataset_name}: {e}")
+
+        with self._lock:
+            self._entries[dataset_name] = entry
+
+    def remove(self, dataset_name: str) -> None:
+        with self._lock:
+            self._entries.pop(dataset_name, None)
+        self.sidecar_path(dataset_name).unlink(missing_ok=True)
+
+    def _read_sidecar(self, dataset_name: str) -> Optional[DatasetCatalogEntry]:
+        path = self.sidecar_path(dataset_name)
+        if not path.exists():
+            return None
+        try:
+            return DatasetCatalogEntry.model_validate_json(path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"Error reading catalog for dataset {dataset_name}: {e}")
+            return None
+
+    def _fingerprint(self, source_path: Path) -> Tuple[str, int, int]:
+        stat = source_path.stat()
+        return source_path.name, stat.st_mtime_ns, stat.st_size
+
+    def _matches(self, entry: DatasetCatalogEntry, fingerprint: Tuple[str, int, int]) -> bool:
+        return (entry.source_file, entry.source_mtime_ns, entry.source_size) == fingerprint
@@ -1,51 +1,355 @@
 import json
+import os
+import shutil
+import threading
+import uuid
 from pathlib import Path
-from typing import List, Optional
-from models.options import OptionsDataset, DatasetInfo
+from typing import Dict, List, Optional, Tuple
+from models.options import OptionsDataset, DatasetInfo, DatasetCatalogEntry, DatasetMetadata
+from repositories.binary_format import (
+    BINARY_SUFFIX, open_binary_dataset, write_binary_dataset
+)
+from repositories.columnar_store import get_columnar_store
+from repositories.dataset_cache import DatasetCache, dataset_cache
+from repositories.dataset_catalog import DatasetCatalog, build_catalog_entry
+from repositories.ingestion import ProgressCallback, ingest_file
+from repositories.partitioned_store import (
+    PARTITIONED_SUFFIX, DatasetAppendError, Manifest, add_parts, check_new_dates, empty_manifest,
+    open_partitioned_dataset, part_info_from_store, parts_dir_for, read_manifest, write_manifest,
+    write_partitioned_dataset, write_parts
+)
+from repositories.shared_datasets import SharedDatasetRegistry, shared_datasets
+from repositories.sqlite_store import SQLITE_SUFFIX, open_sqlite_dataset, write_sqlite_dataset
+from services.timing import timed_stage
+
+# Dataset representations in order of preference when two files have the same mtime
+DATASET_SUFFIXES = (".json", BINARY_SUFFIX, SQLITE_SUFFIX, PARTITIONED_SUFFIX)
+# Representations that are opened in place rather than parsed into memory
+MAPPED_SUFFIXES = (BINARY_SUFFIX, SQLITE_SUFFIX, PARTITIONED_SUFFIX)
+
+# Appends to (and repartitioning of) one dataset are serialised within the process
+_append_locks: Dict[str, threading.Lock] = {}
+_append_locks_guard = threading.Lock()
+
+
+def open_mapped_dataset(path: Path) -> OptionsDataset:
+    # Open a binary, SQLite or partitioned dataset file without reading its rows into memory
+    if path.suffix == PARTITIONED_SUFFIX:
+        return open_partitioned_dataset(path)
+    if path.suffix == SQLITE_SUFFIX:
+        return open_sqlite_dataset(path)
+    return open_binary_dataset(path)
 
 
 class DatasetRepository:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        cache: Optional[DatasetCache] = None,
+        shared: Optional[SharedDatasetRegistry] = None
+    ):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # All repository instances share the process-wide cache and shared-export registry unless injected
+        self.cache = cache if cache is not None else dataset_cache
+        self.shared = shared if shared is not None else shared_datasets
+        self.catalog = DatasetCatalog(self.data_dir)
+
+    def list_dataset_names(self) -> List[str]:
+        # Names of every dataset in the data directory, whatever representation it is stored in
+        return sorted({
+            path.stem for suffix in DATASET_SUFFIXES for path in self.data_dir.glob(f"*{suffix}")
+        })
 
     def list_datasets(self) -> List[DatasetInfo]:
-        # Scan the data directory and return summary info for all available datasets
+        # Summary info for all available datasets, answered from the metadata catalog
         datasets = []
 
-        for json_file in self.data_dir.glob("*.json"):
-            try:
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-
-                metadata = data.get('metadata', {})
-                datasets.append(DatasetInfo(
-                    name=metadata.get('dataset_name', json_file.stem),
-                    date_range=metadata.get('date_range', {}),
-                    record_count=metadata.get('record_count', len(data.get('data', [])))
-                ))
-            except Exception as e:
+        for dataset_name in self.list_dataset_names():
+            entry = self.get_catalog_entry(dataset_name)
+            if entry is None:
                 # Skip corrupted files and continue processing others
-                print(f"Error loading dataset {json_file}: {e}")
                 continue
 
+            datasets.append(DatasetInfo(
+                name=entry.metadata.dataset_name,
+                date_range=entry.metadata.date_range,
+                record_count=entry.record_count
+            ))
+
         return datasets
 
+    def get_catalog_entry(self, dataset_name: str) -> Optional[DatasetCatalogEntry]:
+        # Metadata, expiries, strikes and dates of a dataset without loading it, once its sidecar exists
+        file_path = self.resolve_dataset_path(dataset_name)
+        if file_path is None:
+            return None
+
+        def build() -> Optional[DatasetCatalogEntry]:
+            dataset = self.load_dataset(dataset_name)
+            if dataset is None:
+                return None
+            return build_catalog_entry(file_path, dataset.metadata, get_columnar_store(dataset))
+
+        try:
+            return self.catalog.get(dataset_name, file_path, build)
+        except Exception as e:
+            print(f"Error loading dataset {file_path}: {e}")
+            return None
+
+    def resolve_dataset_path(self, dataset_name: str) -> Optional[Path]:
+        # A partitioned manifest always wins: appended days exist only in its parts, so the files it
+        # was built from are stale from then on. Otherwise the most recently written representation
+        # wins, so a JSON source edited after it was converted is used again; on equal mtimes SQLite
+        # beats binary beats JSON.
+        manifest_path = self.data_dir / f"{dataset_name}{PARTITIONED_SUFFIX}"
+        if manifest_path.exists():
+            return manifest_path
+        best = None
+        for priority, suffix in enumerate(DATASET_SUFFIXES):
+            path = self.data_dir / f"{dataset_name}{suffix}"
+            try:
+                key = (path.stat().st_mtime_ns, priority)
+            except OSError:
+                continue
+            if best is None or key > best[0]:
+                best = (key, path)
+        return best[1] if best else None
+
     def load_dataset(self, dataset_name: str) -> Optional[OptionsDataset]:
-        # Load the full dataset with all historical options data
-        file_path = self.data_dir / f"{dataset_name}.json"
+        # Load the full dataset with all historical options data, reusing the cached copy if the file is unchanged
+        with timed_stage("dataset_resolve"):
+            file_path = self.resolve_dataset_path(dataset_name)
 
-        if not file_path.exists():
+        if file_path is None:
+            for suffix in DATASET_SUFFIXES:
+                self.cache.invalidate(self.data_dir / f"{dataset_name}{suffix}")
             return None
 
+        with timed_stage("dataset_load"):
+            return self.cache.get_or_load(file_path, self._parse_dataset)
+
+    def _parse_dataset(self, file_path: Path) -> Optional[OptionsDataset]:
+        # Parse and validate a dataset file and build its columnar index up front so it is cached with it
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                return OptionsDataset(**data)
+            if file_path.suffix in MAPPED_SUFFIXES:
+                with timed_stage("dataset_open"):
+                    return open_mapped_dataset(file_path)
+
+            if self.shared.enabled:
+                with timed_stage("dataset_open"):
+                    return self._attach_shared(file_path)
+
+            with timed_stage("dataset_read"):
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+            with timed_stage("dataset_validate"):
+                dataset = OptionsDataset(**data)
+            with timed_stage("dataset_index"):
+                get_columnar_store(dataset)
+            return dataset
         except Exception as e:
-            print(f"Error loading dataset {dataset_name}: {e}")
+            print(f"Error loading dataset {file_path.stem}: {e}")
             return None
 
+    def _attach_shared(self, file_path: Path) -> OptionsDataset:
+        # Map the shared export of a JSON dataset, streaming the JSON into it first if no other
+        # process has published this version yet. The export keeps the file's own metadata, so the
+        # dataset reports the same metadata whether or not it is shared.
+        def build(export_path: Path) -> None:
+            ingest_file(file_path, output_path=export_path, write_catalog=False, keep_source_metadata=True)
+
+        return open_binary_dataset(self.shared.attach(file_path.stem, file_path, build))
+
+    def get_dataset_version(self, dataset_name: str) -> Optional[str]:
+        # Cheap fingerprint of the file a dataset is served from; changes whenever the file is rewritten
+        file_path = self.resolve_dataset_path(dataset_name)
+        if file_path is None:
+            return None
+        stat = file_path.stat()
+        return f"{file_path.name}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def get_shared_binary_path(self, dataset_name: str) -> Optional[Path]:
+        # Path of a memory-mappable copy of the dataset that other processes can attach to with
+        # open_mapped_dataset. Binary, SQLite and partitioned datasets are used in place; JSON ones
+        # are exported once per file version into the shared dataset directory.
+        file_path = self.resolve_dataset_path(dataset_name)
+        if file_path is None:
+            return None
+        if file_path.suffix in MAPPED_SUFFIXES:
+            return file_path
+
+        dataset = self.load_dataset(dataset_name)
+        if dataset is None:
+            return None
+        if self.shared.enabled:
+            # Already served from the shared export
+            return self.shared.export_path(dataset_name, file_path)
+
+        def build(export_path: Path) -> None:
+            write_binary_dataset(export_path, dataset.metadata, get_columnar_store(dataset))
+
+        return self.shared.attach(dataset_name, file_path, build)
+
     def dataset_exists(self, dataset_name: str) -> bool:
         # Quick check if a dataset file exists without loading it
-        return (self.data_dir / f"{dataset_name}.json").exists()
+        return self.resolve_dataset_path(dataset_name) is not None
+
+    def is_dataset_cached(self, dataset_name: str) -> bool:
+        # Whether the file the dataset is served from is currently held by the dataset cache
+        file_path = self.resolve_dataset_path(dataset_name)
+        return file_path is not None and self.cache.contains(file_path)
+
+    def append_dataset(
+        self,
+        dataset_name: str,
+        source_path: Path,
+        source_format: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> DatasetMetadata:
+        # Add the trading dates in a JSON/CSV file to an existing dataset. The rows become new
+        # immutable parts (split like the rest of the dataset) and a new manifest is swapped in, so
+        # the work is proportional to the new rows. A plain dataset is first turned into a one-part
+        # partitioned dataset (binary files are hard-linked; JSON sources are ingested once).
+        with self._append_lock(dataset_name):
+            current_path = self.resolve_dataset_path(dataset_name)
+            if current_path is None:
+                raise DatasetAppendError(f"Dataset '{dataset_name}' not found")
+            if current_path.suffix == SQLITE_SUFFIX:
+                raise DatasetAppendError(f"Dataset '{dataset_name}' is served from SQLite and cannot be appended to")
+
+            manifest_path = self.data_dir / f"{dataset_name}{PARTITIONED_SUFFIX}"
+            parts_dir = parts_dir_for(manifest_path)
+            parts_dir.mkdir(exist_ok=True)
+            if current_path == manifest_path:
+                manifest = read_manifest(manifest_path)
+            else:
+                manifest = self._start_manifest(dataset_name, current_path, parts_dir)
+
+            generation = manifest.generation + 1
+            batch_file = f"{generation:06d}-{uuid.uuid4().hex[:8]}{BINARY_SUFFIX}"
+            ingest_file(
+                Path(source_path),
+                output_path=parts_dir / batch_file,
+                dataset_name=manifest.metadata.dataset_name,
+                source_format=source_format,
+                progress_callback=progress_callback,
+                write_catalog=False
+            )
+            batch_store = get_columnar_store(open_binary_dataset(parts_dir / batch_file))
+            try:
+                check_new_dates(manifest, batch_store.dates)
+            except DatasetAppendError:
+                (parts_dir / batch_file).unlink(missing_ok=True)
+                raise
+
+            if manifest.partitioning:
+                # Split the batch the same way as the rest of the dataset; the ingested file was scratch
+                parts = write_parts(
+                    parts_dir, generation, manifest.metadata.dataset_name, batch_store, manifest.partitioning
+                )
+                (parts_dir / batch_file).unlink(missing_ok=True)
+            else:
+                parts = [(part_info_from_store(batch_file, batch_store), batch_store)]
+            manifest = add_parts(manifest, parts, dict(zip(batch_store.dates, batch_store.underlying_by_date.tolist())))
+
+            write_manifest(manifest_path, manifest)
+            # Catalog entry comes from the manifest alone; no part is opened
+            dataset = open_partitioned_dataset(manifest_path)
+            self.catalog.write(
+                dataset_name, build_catalog_entry(manifest_path, dataset.metadata, get_columnar_store(dataset))
+            )
+            return manifest.metadata
+
+    def remove_partitioned(self, dataset_name: str) -> None:
+        # Delete a dataset's manifest and parts so its other files are served again; used when an
+        # upload replaces the dataset
+        with self._append_lock(dataset_name):
+            manifest_path = self.data_dir / f"{dataset_name}{PARTITIONED_SUFFIX}"
+            if not manifest_path.exists():
+                return
+            manifest_path.unlink(missing_ok=True)
+            shutil.rmtree(parts_dir_for(manifest_path), ignore_errors=True)
+            self.cache.invalidate(manifest_path)
+
+    def _start_manifest(self, dataset_name: str, source_path: Path, parts_dir: Path) -> Manifest:
+        # First part of a new partitioned dataset: the existing binary file, or the ingested JSON
+        part_file = f"{0:06d}-{uuid.uuid4().hex[:8]}{BINARY_SUFFIX}"
+        part_path = parts_dir / part_file
+        if source_path.suffix == BINARY_SUFFIX:
+            try:
+                os.link(source_path, part_path)
+            except OSError:
+                shutil.copy2(source_path, part_path)
+        else:
+            ingest_file(source_path, output_path=part_path, write_catalog=False)
+
+        dataset = open_binary_dataset(part_path)
+        store = get_columnar_store(dataset)
+        return add_parts(empty_manifest(dataset.metadata.dataset_name), [(part_info_from_store(part_file, store), store)])
+
+    def partition_dataset(self, dataset_name: str, partitioning: List[str]) -> Optional[DatasetMetadata]:
+        # Rewrite a plain dataset as parts split by expiry (and optionally trade month)
+        with self._append_lock(dataset_name):
+            current_path = self.resolve_dataset_path(dataset_name)
+            if current_path is None:
+                return None
+            if current_path.suffix == PARTITIONED_SUFFIX:
+                raise DatasetAppendError(f"Dataset '{dataset_name}' is already partitioned")
+
+            if current_path.suffix == SQLITE_SUFFIX:
+                raise DatasetAppendError(f"Dataset '{dataset_name}' is served from SQLite and cannot be partitioned")
+
+            manifest_path = self.data_dir / f"{dataset_name}{PARTITIONED_SUFFIX}"
+            source, scratch_path = self._open_binary_source(current_path, parts_dir_for(manifest_path))
+            try:
+                manifest = write_partitioned_dataset(
+                    manifest_path, source.metadata.dataset_name, get_columnar_store(source), partitioning
+                )
+            finally:
+                if scratch_path is not None:
+                    scratch_path.unlink(missing_ok=True)
+
+            dataset = open_partitioned_dataset(manifest_path)
+            self.catalog.write(
+                dataset_name, build_catalog_entry(manifest_path, dataset.metadata, get_columnar_store(dataset))
+            )
+            return manifest.metadata
+
+    def export_sqlite(self, dataset_name: str) -> Optional[DatasetMetadata]:
+        # Write a plain dataset to <name>.sqlite. Being the newest file, it is the one served from
+        # then on, without the rows ever being held in memory.
+        with self._append_lock(dataset_name):
+            current_path = self.resolve_dataset_path(dataset_name)
+            if current_path is None:
+                return None
+            if current_path.suffix in (SQLITE_SUFFIX, PARTITIONED_SUFFIX):
+                raise ValueError(f"Dataset '{dataset_name}' is already served from {current_path.name}")
+
+            sqlite_path = self.data_dir / f"{dataset_name}{SQLITE_SUFFIX}"
+            source, scratch_path = self._open_binary_source(current_path, self.data_dir)
+            try:
+                write_sqlite_dataset(sqlite_path, source.metadata, get_columnar_store(source))
+            finally:
+                if scratch_path is not None:
+                    scratch_path.unlink(missing_ok=True)
+
+            dataset = open_sqlite_dataset(sqlite_path)
+            self.catalog.write(
+                dataset_name, build_catalog_entry(sqlite_path, dataset.metadata, get_columnar_store(dataset))
+            )
+            return dataset.metadata
+
+    def _open_binary_source(self, source_path: Path, scratch_dir: Path) -> Tuple[OptionsDataset, Optional[Path]]:
+        # Memory-mapped view of a binary or JSON dataset. JSON sources are streamed into a scratch
+        # binary file first (returned so the caller can delete it), so they are never loaded whole.
+        if source_path.suffix == BINARY_SUFFIX:
+            return open_binary_dataset(source_path), None
+        scratch_path = scratch_dir / f".{uuid.uuid4().hex}{BINARY_SUFFIX}"
+        scratch_path.parent.mkdir(parents=True, exist_ok=True)
+        ingest_file(source_path, output_path=scratch_path, write_catalog=False)
+        return open_binary_dataset(scratch_path), scratch_path
+
+    def _append_lock(self, dataset_name: str) -> threading.Lock:
+        with _append_locks_guard:
+            return _append_locks.setdefault(dataset_name, threading.Lock())
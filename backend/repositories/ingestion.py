@@ -0,0 +1,397 @@
+import codecs
+import csv
+import io
+import json
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from models.options import DatasetMetadata
+from repositories.binary_format import BINARY_SUFFIX, write_binary_dataset
+from repositories.columnar_store import OPTION_TYPES, ColumnarOptionsStore
+from repositories.dataset_catalog import DatasetCatalog, build_catalog_entry
+
+DEFAULT_CHUNK_SIZE = 50_000
+READ_BLOCK_SIZE = 1 << 20
+
+RECORD_FIELDS = ("date", "underlying", "expiry", "strike", "type", "mid_price")
+POSITIVE_FIELDS = ("underlying", "strike", "mid_price")
+DATE_FIELDS = ("date", "expiry")
+
+# Spilled per-row columns and their on-disk dtypes
+_SPILL_COLUMNS = {
+    "date_codes": np.int32,
+    "expiry_codes": np.int32,
+    "strikes": np.float64,
+    "type_codes": np.int8,
+    "mid_prices": np.float64,
+    "underlyings": np.float64
+}
+
+
+class IngestionError(ValueError):
+    pass
+
+
+@dataclass
+class IngestionProgress:
+    stage: str
+    rows_read: int
+    rows_rejected: int
+    bytes_read: int
+    total_bytes: int
+
+
+@dataclass
+class IngestionResult:
+    dataset_name: str
+    output_path: Path
+    record_count: int
+    rows_rejected: int
+    date_range: Dict[str, str]
+
+
+ProgressCallback = Callable[[IngestionProgress], None]
+
+
+class _JsonStream:
+    # Incremental reader over a JSON document that decodes one value at a time, so only the
+    # current read block plus the value being decoded are ever held in memory
+
+    def __init__(self, f: io.BufferedReader):
+        self.f = f
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> None:
+        block = self.f.read(READ_BLOCK_SIZE)
+        self.bytes_read += len(block)
+        if not block:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(block, final=not block)
+        self.pos = 0
+
+    def peek(self) -> str:
+        # Next non-whitespace character, or "" at end of input
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos] if self.pos < len(self.buffer) else ""
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise IngestionError(f"Malformed JSON: expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number that ends exactly at the block boundary may continue in the next block
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise IngestionError(f"Malformed JSON: {e.msg}")
+            self._fill()
+
+    def array_items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def iter_json_chunks(
+    f: io.BufferedReader,
+    chunk_size: int,
+    metadata_out: Dict[str, Any]
+) -> Iterator[Tuple[List[dict], int]]:
+    # Yield (records, bytes read so far) from either a {"metadata": ..., "data": [...]} document
+    # or a bare array of records. Any metadata object found is stored in metadata_out.
+    stream = _JsonStream(f)
+
+    def chunked(items: Iterator[Any]) -> Iterator[Tuple[List[dict], int]]:
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield chunk, stream.bytes_read
+                chunk = []
+        if chunk:
+            yield chunk, stream.bytes_read
+
+    if stream.peek() == "[":
+        yield from chunked(stream.array_items())
+    else:
+        stream.expect("{")
+        while stream.peek() != "}":
+            key = stream.value()
+            stream.expect(":")
+            if key == "data":
+                yield from chunked(stream.array_items())
+            elif key == "metadata":
+                metadata_out.update(stream.value())
+            else:
+                stream.value()
+            if stream.peek() != ",":
+                break
+            stream.pos += 1
+            if stream.peek() == "}":
+                raise IngestionError("Malformed JSON: trailing comma")
+        stream.expect("}")
+
+    if stream.peek():
+        raise IngestionError("Malformed JSON: unexpected data after the end of the document")
+
+
+def iter_csv_chunks(f: io.BufferedReader, chunk_size: int) -> Iterator[Tuple[List[dict], int]]:
+    # Yield (records, bytes read so far) from a CSV file whose header names the record fields
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    reader = csv.reader(text)
+    header = [name.strip() for name in next(reader, [])]
+    missing = [name for name in RECORD_FIELDS if name not in header]
+    if missing:
+        raise IngestionError(f"CSV header is missing columns: {', '.join(missing)}")
+    positions = {name: header.index(name) for name in RECORD_FIELDS}
+
+    chunk = []
+    for row in reader:
+        if not row:
+            continue
+        chunk.append({name: row[index] if index < len(row) else None for name, index in positions.items()})
+        if len(chunk) >= chunk_size:
+            yield chunk, f.tell()
+            chunk = []
+    if chunk:
+        yield chunk, f.tell()
+
+
+def _float_column(values: List[Any]) -> np.ndarray:
+    # Coerce to float64 the way pydantic's lax float does; anything unparseable becomes NaN
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        column = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                column[i] = float(value)
+            except (TypeError, ValueError):
+                column[i] = np.nan
+        return column
+
+
+def _valid_date(value: Any) -> bool:
+    if not isinstance(value, str) or len(value) != 10:
+        return False
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _date_mask(column: np.ndarray) -> np.ndarray:
+    # True where the value is a YYYY-MM-DD calendar date
+    if column.dtype.kind == "U":
+        try:
+            parsed = column.astype("datetime64[D]")
+            return (np.char.str_len(column) == 10) & (parsed.astype(column.dtype) == column)
+        except ValueError:
+            pass
+    return np.fromiter((_valid_date(value) for value in column.tolist()), dtype=bool, count=len(column))
+
+
+def validate_chunk(
+    records: List[dict],
+    first_row: int,
+    skip_invalid: bool
+) -> Tuple[Dict[str, np.ndarray], int]:
+    # Convert a chunk of raw records to columns and apply the OptionRecord constraints to
+    # whole columns at once. Returns the surviving columns and how many rows were dropped.
+    records = [record if isinstance(record, dict) else {} for record in records]
+    raw = {name: [record.get(name) for record in records] for name in RECORD_FIELDS}
+
+    columns: Dict[str, np.ndarray] = {}
+    checks: List[Tuple[str, np.ndarray]] = []
+    for name in DATE_FIELDS:
+        columns[name] = np.array([value if isinstance(value, str) else "" for value in raw[name]])
+        checks.append((f"{name} must be a YYYY-MM-DD date", _date_mask(columns[name])))
+    for name in POSITIVE_FIELDS:
+        columns[name] = _float_column(raw[name])
+        checks.append((f"{name} must be a number greater than 0", columns[name] > 0))
+    type_column = np.array([value if isinstance(value, str) else "" for value in raw["type"]])
+    columns["type_codes"] = (type_column == OPTION_TYPES[1]).astype(np.int8)
+    checks.append(("type must be 'call' or 'put'", np.isin(type_column, OPTION_TYPES)))
+
+    valid = np.logical_and.reduce([mask for _, mask in checks])
+    if valid.all():
+        return columns, 0
+    if not skip_invalid:
+        bad_row = int(np.argmin(valid))
+        reason = next(message for message, mask in checks if not mask[bad_row])
+        raise IngestionError(f"Row {first_row + bad_row}: {reason}")
+    return {name: column[valid] for name, column in columns.items()}, int((~valid).sum())
+
+
+class _ColumnSpill:
+    # Appends validated chunks to one raw file per column. Dates and expiries are dictionary
+    # encoded in order of first appearance and remapped to sorted codes once the input ends.
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.files = {name: open(directory / f"{name}.bin", "wb") for name in _SPILL_COLUMNS}
+        self.dictionaries: Dict[str, Dict[str, int]] = {"date_codes": {}, "expiry_codes": {}}
+        self.row_count = 0
+
+    def _encode(self, name: str, values: np.ndarray) -> np.ndarray:
+        uniques, inverse = np.unique(values, return_inverse=True)
+        dictionary = self.dictionaries[name]
+        codes = np.array([dictionary.setdefault(value, len(dictionary)) for value in uniques.tolist()], dtype=np.int32)
+        return codes[inverse]
+
+    def append(self, columns: Dict[str, np.ndarray]) -> None:
+        encoded = {
+            "date_codes": self._encode("date_codes", columns["date"]),
+            "expiry_codes": self._encode("expiry_codes", columns["expiry"]),
+            "strikes": columns["strike"],
+            "type_codes": columns["type_codes"],
+            "mid_prices": columns["mid_price"],
+            "underlyings": columns["underlying"]
+        }
+        for name, dtype in _SPILL_COLUMNS.items():
+            self.files[name].write(encoded[name].astype(dtype, copy=False).tobytes())
+        self.row_count += len(columns["strike"])
+
+    def close(self) -> None:
+        for f in self.files.values():
+            f.close()
+
+    def finish(self, chunk_size: int) -> ColumnarOptionsStore:
+        # Rewrite the provisional codes as sorted codes in place, chunk by chunk, and open the
+        # columns as memory maps for the index build
+        self.close()
+        sorted_values = {}
+        for name, dictionary in self.dictionaries.items():
+            values = sorted(dictionary)
+            remap = np.empty(len(values), dtype=np.int32)
+            for code, value in enumerate(values):
+                remap[dictionary[value]] = code
+            column = np.memmap(self.directory / f"{name}.bin", dtype=np.int32, mode="r+")
+            for start in range(0, len(column), chunk_size):
+                column[start:start + chunk_size] = remap[column[start:start + chunk_size]]
+            column.flush()
+            del column
+            sorted_values[name] = values
+
+        arrays = {
+            name: np.memmap(self.directory / f"{name}.bin", dtype=dtype, mode="r")
+            for name, dtype in _SPILL_COLUMNS.items()
+        }
+        return ColumnarOptionsStore(
+            dates=sorted_values["date_codes"],
+            expiries=sorted_values["expiry_codes"],
+            **arrays
+        )
+
+
+def detect_format(path: Path) -> str:
+    return "csv" if path.suffix.lower() == ".csv" else "json"
+
+
+def ingest_file(
+    source_path: Path,
+    output_path: Optional[Path] = None,
+    dataset_name: Optional[str] = None,
+    source_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_invalid: bool = False,
+    progress_callback: Optional[ProgressCallback] = None,
+    write_catalog: bool = True,
+    keep_source_metadata: bool = False
+) -> IngestionResult:
+    # Stream a JSON or CSV options chain into the binary format (plus catalog sidecar) without
+    # materialising it: rows are parsed and validated chunk_size at a time and spilled to disk
+    # as columns. Only the final index build touches whole columns, as compact NumPy arrays.
+    # The metadata is derived from the rows unless keep_source_metadata is set, in which case a JSON
+    # document's own metadata object is kept as is (and required), as the JSON loader serves it.
+    source_path = Path(source_path)
+    output_path = Path(output_path) if output_path else source_path.with_suffix(BINARY_SUFFIX)
+    source_format = source_format or detect_format(source_path)
+    total_bytes = source_path.stat().st_size
+    metadata_in: Dict[str, Any] = {}
+    rows_read = 0
+    rows_rejected = 0
+
+    def report(stage: str, bytes_read: int) -> None:
+        if progress_callback is not None:
+            progress_callback(IngestionProgress(stage, rows_read, rows_rejected, bytes_read, total_bytes))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    spill_dir = Path(tempfile.mkdtemp(prefix=".ingest-", dir=output_path.parent))
+    spill = _ColumnSpill(spill_dir)
+    try:
+        with open(source_path, "rb") as f:
+            chunks = (
+                iter_csv_chunks(f, chunk_size) if source_format == "csv"
+                else iter_json_chunks(f, chunk_size, metadata_in)
+            )
+            report("reading", 0)
+            for records, bytes_read in chunks:
+                columns, rejected = validate_chunk(records, rows_read, skip_invalid)
+                spill.append(columns)
+                rows_read += len(records)
+                rows_rejected += rejected
+                report("reading", bytes_read)
+
+        if spill.row_count == 0:
+            raise IngestionError("No valid records found")
+
+        report("indexing", total_bytes)
+        store = spill.finish(chunk_size)
+        if keep_source_metadata:
+            metadata = DatasetMetadata(**metadata_in)
+        else:
+            metadata = DatasetMetadata(
+                dataset_name=dataset_name or metadata_in.get("dataset_name") or source_path.stem,
+                date_range={"start": store.dates[0], "end": store.dates[-1]},
+                record_count=store.record_count
+            )
+
+        report("writing", total_bytes)
+        write_binary_dataset(output_path, metadata, store)
+        if write_catalog:
+            DatasetCatalog(output_path.parent).write(
+                output_path.stem, build_catalog_entry(output_path, metadata, store)
+            )
+        report("done", total_bytes)
+    finally:
+        spill.close()
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    return IngestionResult(
+        dataset_name=metadata.dataset_name,
+        output_path=output_path,
+        record_count=metadata.record_count,
+        rows_rejected=rows_rejected,
+        date_range=metadata.date_range
+    )
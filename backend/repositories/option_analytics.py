@@ -0,0 +1,142 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import numpy as np
+from models.options import OptionsDataset
+from repositories.dataset_cache import DatasetCache, KeyedLocks
+
+ANALYTICS_DIR_NAME = ".analytics"
+ANALYTICS_SUFFIX = ".greeks.npz"
+# Name the analytics are attached under in the dataset cache
+ANALYTICS_ATTACHMENT = "greeks"
+GREEK_COLUMNS = ("implied_volatility", "delta", "gamma", "theta", "vega")
+# Bumped when the solver's results change, so sidecars written by an older one are rebuilt
+ANALYTICS_FORMAT = 2
+
+
+@dataclass
+class OptionAnalytics:
+    # Implied volatility and Greeks of every quote of one dataset version. Quotes are identified by
+    # contract id * date_count + date code (ids and codes of that version's store), kept sorted so
+    # any set of (contract, date) pairs resolves with one searchsorted.
+    version: str
+    rate: float
+    date_count: int
+    contract_count: int
+    keys: np.ndarray
+    # One float32 array per GREEK_COLUMNS entry, aligned with keys; NaN where there is no solution
+    columns: Dict[str, np.ndarray]
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.keys.nbytes + sum(values.nbytes for values in self.columns.values()))
+
+    def lookup(self, contract_ids: np.ndarray, date_codes: np.ndarray) -> Dict[str, np.ndarray]:
+        # Values for each (contract, date) pair of the two equal-length arrays; NaN where not quoted
+        queries = np.asarray(contract_ids, dtype=np.int64) * self.date_count + np.asarray(date_codes, dtype=np.int64)
+        hits = np.searchsorted(self.keys, queries)
+        found = np.zeros(len(queries), dtype=bool)
+        in_bounds = hits < len(self.keys)
+        found[in_bounds] = self.keys[hits[in_bounds]] == queries[in_bounds]
+
+        values = {}
+        for name, column in self.columns.items():
+            values[name] = np.full(len(queries), np.nan, dtype=np.float64)
+            values[name][found] = column[hits[found]]
+        return values
+
+
+class AnalyticsCache:
+    # One sidecar file per dataset under <data_dir>/.analytics. Like the catalog, a sidecar is only
+    # used while it was computed for the current dataset version (file name, mtime and size) and the
+    # configured rate; otherwise it is rebuilt and overwritten. The in-memory copy is attached to the
+    # dataset's entry in the dataset cache, so it counts against DATASET_CACHE_MAX_BYTES and is
+    # dropped when that dataset is evicted or reloaded.
+
+    def __init__(self, data_dir: Path, dataset_cache: DatasetCache):
+        self.analytics_dir = data_dir / ANALYTICS_DIR_NAME
+        self.dataset_cache = dataset_cache
+        self._build_locks = KeyedLocks()
+
+    def sidecar_path(self, dataset_name: str) -> Path:
+        return self.analytics_dir / f"{dataset_name}{ANALYTICS_SUFFIX}"
+
+    def get(
+        self,
+        dataset_name: str,
+        source_path: Path,
+        dataset: OptionsDataset,
+        version: str,
+        rate: float,
+        build: Callable[[], OptionAnalytics]
+    ) -> OptionAnalytics:
+        # Analytics of the dataset loaded from source_path: the cached copy, else the sidecar, else built
+        entry = self._memory_entry(source_path, dataset, version, rate)
+        if entry is not None:
+            return entry
+
+        # Concurrent requests for the same dataset wait for one build instead of each solving it
+        with self._build_locks.hold(dataset_name):
+            entry = self._memory_entry(source_path, dataset, version, rate)
+            if entry is not None:
+                return entry
+            entry = self._read_sidecar(dataset_name)
+            if entry is None or (entry.version, entry.rate) != (version, rate):
+                entry = build()
+                self.write(dataset_name, entry)
+            self.dataset_cache.attach(source_path, dataset, ANALYTICS_ATTACHMENT, entry, entry.nbytes)
+        return entry
+
+    def write(self, dataset_name: str, entry: OptionAnalytics) -> None:
+        # Persist atomically; a read-only data directory just means the analytics live in memory
+        try:
+            self.analytics_dir.mkdir(parents=True, exist_ok=True)
+            path = self.sidecar_path(dataset_name)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    format=np.array(ANALYTICS_FORMAT),
+                    version=np.array(entry.version),
+                    rate=np.array(entry.rate),
+                    date_count=np.array(entry.date_count),
+                    contract_count=np.array(entry.contract_count),
+                    keys=entry.keys,
+                    **entry.columns
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing analytics for dataset {dataset_name}: {e}")
+
+    def _memory_entry(
+        self,
+        source_path: Path,
+        dataset: OptionsDataset,
+        version: str,
+        rate: float
+    ) -> Optional[OptionAnalytics]:
+        entry = self.dataset_cache.get_attachment(source_path, dataset, ANALYTICS_ATTACHMENT)
+        if entry is not None and (entry.version, entry.rate) == (version, rate):
+            return entry
+        return None
+
+    def _read_sidecar(self, dataset_name: str) -> Optional[OptionAnalytics]:
+        path = self.sidecar_path(dataset_name)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                if "format" not in archive.files or int(archive["format"]) != ANALYTICS_FORMAT:
+                    return None
+                return OptionAnalytics(
+                    version=str(archive["version"]),
+                    rate=float(archive["rate"]),
+                    date_count=int(archive["date_count"]),
+                    contract_count=int(archive["contract_count"]),
+                    keys=archive["keys"],
+                    columns={name: archive[name] for name in GREEK_COLUMNS}
+                )
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading analytics for dataset {dataset_name}: {e}")
+            return None
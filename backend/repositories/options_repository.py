@@ -1,70 +1,54 @@
 from typing import List, Optional, Dict
 from models.options import OptionsDataset, OptionRecord
+from repositories.columnar_store import OptionsStoreBase, get_columnar_store
+from services.timing import timed_stage
 
 
 class OptionsRepository:
     def __init__(self, dataset: OptionsDataset):
         self.dataset = dataset
         self.data = dataset.data
+        with timed_stage("options_index"):
+            self.store: OptionsStoreBase = get_columnar_store(dataset)
 
     def get_option_price(self, date: str, strike: float, expiry: str, option_type: str) -> Optional[float]:
-        # Find the mid price for a specific option on a given date
-        for record in self.data:
-            if (record.date == date and record.strike == strike and
-                record.expiry == expiry and record.type == option_type):
-                return record.mid_price
-        return None
+        # Find the mid price for a specific option on a given date. Not timed here: callers time
+        # their whole lookup loop as one "price_lookup" stage.
+        contract_id = self.store.find_contract(strike, expiry, option_type)
+        date_code = self.store.date_lookup.get(date)
+        if contract_id is None or date_code is None:
+            return None
+
+        return self.store.price_on(contract_id, date_code)
 
     def get_underlying_price(self, date: str) -> Optional[float]:
         # Get the SPX underlying price for a specific date
-        for record in self.data:
-            if record.date == date:
-                return record.underlying
-        return None
+        date_code = self.store.date_lookup.get(date)
+        if date_code is None:
+            return None
+        return float(self.store.underlying_by_date[date_code])
 
     def get_available_dates(self) -> List[str]:
         # Return all unique trading dates in the dataset
-        dates = set(record.date for record in self.data)
-        return sorted(list(dates))
+        return list(self.store.dates)
 
     def get_available_expiries(self) -> List[str]:
         # Return all unique expiration dates available in the dataset
-        expiries = set(record.expiry for record in self.data)
-        return sorted(list(expiries))
+        return list(self.store.expiries)
 
     def get_available_strikes_for_expiry(self, expiry: str, option_type: str) -> List[float]:
         # Get all strikes available for a specific expiry and option type
-        strikes = set(
-            record.strike
-            for record in self.data
-            if record.expiry == expiry and record.type == option_type
-        )
-        return sorted(list(strikes))
+        return self.store.strikes_for_expiry(expiry, option_type)
 
     def get_all_strikes_by_expiry(self) -> Dict[str, List[float]]:
         # Build a map of expiry dates to available strikes (used for frontend dropdowns)
-        strikes_by_expiry = {}
-
-        for record in self.data:
-            if record.expiry not in strikes_by_expiry:
-                strikes_by_expiry[record.expiry] = set()
-            strikes_by_expiry[record.expiry].add(record.strike)
-
-        return {
-            expiry: sorted(list(strikes))
-            for expiry, strikes in strikes_by_expiry.items()
-        }
+        return self.store.strikes_by_expiry()
 
     def filter_by_date_range(self, start_date: str, end_date: str) -> List[OptionRecord]:
         # Filter dataset to only include records within a date range
-        return [
-            record for record in self.data
-            if start_date <= record.date <= end_date
-        ]
+        lo, hi = self.store.date_code_range(start_date, end_date)
+        return [self.data[row] for row in self.store.rows_in_date_code_range(lo, hi).tolist()]
 
     def validate_strategy_params(self, strike: float, expiry: str, option_type: str) -> bool:
         # Check if the given strike/expiry/type combination exists in the dataset
-        for record in self.data:
-            if (record.strike == strike and record.expiry == expiry and record.type == option_type):
-                return True
-        return False
+        return self.store.find_contract(strike, expiry, option_type) is not None
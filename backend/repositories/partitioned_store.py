@@ -0,0 +1,442 @@
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from models.options import DatasetMetadata, OptionRecord, OptionsDataset
+from repositories.binary_format import BINARY_SUFFIX, open_binary_dataset, write_binary_dataset
+from repositories.columnar_store import (
+    OPTION_TYPES, TYPE_CODES, ColumnarOptionsStore, OptionsStoreBase, dataset_from_store, get_columnar_store
+)
+
+# A partitioned dataset is a small JSON manifest, <name>.optset, next to a <name>.parts directory
+# of immutable binary part files. Writers add parts and then swap the manifest in with one atomic
+# rename, so readers always see a complete version. The manifest carries the global date and
+# expiry dictionaries, per-date underlying prices and each part's contracts and date span, so a
+# reader can answer catalog and contract lookups without opening any part. Parts may be split by
+# expiry (and trade month) so a single-contract backtest only ever maps the few parts it reads.
+PARTITIONED_SUFFIX = ".optset"
+PARTS_SUFFIX = ".parts"
+MANIFEST_VERSION = 1
+
+
+class DatasetAppendError(ValueError):
+    pass
+
+
+@dataclass
+class PartInfo:
+    file: str
+    record_count: int
+    start_date: str
+    end_date: str
+    # expiry -> option type -> sorted strikes quoted in this part
+    contracts: Dict[str, Dict[str, List[float]]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file,
+            "record_count": self.record_count,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "contracts": self.contracts
+        }
+
+
+@dataclass
+class Manifest:
+    metadata: DatasetMetadata
+    dates: List[str]
+    underlyings: List[float]
+    expiries: List[str]
+    parts: List[PartInfo]
+    generation: int = 0
+    # Keys new rows are split by when parts are written, e.g. ["expiry", "trade_month"]; empty
+    # means each write becomes a single part
+    partitioning: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "generation": self.generation,
+            "partitioning": self.partitioning,
+            "metadata": self.metadata.model_dump(),
+            "dates": self.dates,
+            "underlyings": self.underlyings,
+            "expiries": self.expiries,
+            "parts": [part.to_dict() for part in self.parts]
+        }
+
+
+def parts_dir_for(manifest_path: Path) -> Path:
+    return manifest_path.with_suffix(PARTS_SUFFIX)
+
+
+def read_manifest(path: Path) -> Manifest:
+    with open(path, "r") as f:
+        raw = json.load(f)
+    if raw.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported dataset manifest version {raw.get('version')}")
+
+    return Manifest(
+        metadata=DatasetMetadata(**raw["metadata"]),
+        dates=raw["dates"],
+        underlyings=raw["underlyings"],
+        expiries=raw["expiries"],
+        parts=[PartInfo(**part) for part in raw["parts"]],
+        generation=raw.get("generation", 0),
+        partitioning=raw.get("partitioning", [])
+    )
+
+
+def write_manifest(path: Path, manifest: Manifest) -> None:
+    # Replace the manifest atomically; part files it names must already be on disk
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest.to_dict(), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def part_info_from_store(file_name: str, store: ColumnarOptionsStore) -> PartInfo:
+    return PartInfo(
+        file=file_name,
+        record_count=store.record_count,
+        start_date=store.dates[0],
+        end_date=store.dates[-1],
+        contracts=store.strikes_by_expiry_type()
+    )
+
+
+def check_new_dates(manifest: Manifest, dates: List[str]) -> None:
+    existing = set(manifest.dates)
+    overlap = [date for date in dates if date in existing]
+    if overlap:
+        raise DatasetAppendError(
+            f"Dataset already contains {len(overlap)} of the appended dates (first: {overlap[0]})"
+        )
+
+
+def add_parts(
+    manifest: Manifest,
+    parts: List[Tuple[PartInfo, ColumnarOptionsStore]],
+    underlying_by_date: Optional[Dict[str, float]] = None
+) -> Manifest:
+    # New manifest with one batch of parts added. The batch must not contain dates the dataset
+    # already has; parts within a batch may share dates (e.g. one part per expiry). Work is
+    # proportional to the number of dates and contracts, never to the rows already stored.
+    existing = dict(zip(manifest.dates, manifest.underlyings))
+    batch_dates = sorted({date for _, store in parts for date in store.dates})
+    check_new_dates(manifest, batch_dates)
+
+    # Unless the caller knows each date's underlying, the first part quoting a date defines it
+    new_underlyings: Dict[str, float] = dict(underlying_by_date or {})
+    for _, store in parts:
+        for date, underlying in zip(store.dates, store.underlying_by_date.tolist()):
+            new_underlyings.setdefault(date, underlying)
+    for date in batch_dates:
+        existing[date] = new_underlyings[date]
+
+    dates = sorted(existing)
+    expiries = set(manifest.expiries)
+    for _, store in parts:
+        expiries.update(store.expiries)
+
+    return Manifest(
+        metadata=DatasetMetadata(
+            dataset_name=manifest.metadata.dataset_name,
+            date_range={"start": dates[0], "end": dates[-1]} if dates else {},
+            record_count=manifest.metadata.record_count + sum(part.record_count for part, _ in parts)
+        ),
+        dates=dates,
+        underlyings=[existing[date] for date in dates],
+        expiries=sorted(expiries),
+        parts=manifest.parts + [part for part, _ in parts],
+        generation=manifest.generation + 1,
+        partitioning=manifest.partitioning
+    )
+
+
+def empty_manifest(dataset_name: str, partitioning: Optional[List[str]] = None) -> Manifest:
+    return Manifest(
+        metadata=DatasetMetadata(dataset_name=dataset_name, date_range={}, record_count=0),
+        dates=[],
+        underlyings=[],
+        expiries=[],
+        parts=[],
+        partitioning=list(partitioning or [])
+    )
+
+
+def subset_store(store: ColumnarOptionsStore, rows: np.ndarray) -> ColumnarOptionsStore:
+    # New store holding the given rows (kept in their original order) with its own dictionaries
+    rows = np.sort(rows)
+    date_values, date_codes = np.unique(store.date_codes[rows], return_inverse=True)
+    expiry_values, expiry_codes = np.unique(store.expiry_codes[rows], return_inverse=True)
+    return ColumnarOptionsStore(
+        dates=[store.dates[code] for code in date_values.tolist()],
+        expiries=[store.expiries[code] for code in expiry_values.tolist()],
+        date_codes=date_codes.astype(np.int32),
+        expiry_codes=expiry_codes.astype(np.int32),
+        strikes=store.strikes[rows],
+        type_codes=store.type_codes[rows],
+        mid_prices=store.mid_prices[rows],
+        underlyings=store.underlyings[rows]
+    )
+
+
+def split_store(store: ColumnarOptionsStore, partitioning: List[str]) -> Iterator[Tuple[str, ColumnarOptionsStore]]:
+    # Yield (label, part store) for each partition key present in the store, one part in memory
+    # at a time. Contracts are ordered expiry first, so each expiry's rows are one index slice.
+    if "expiry" not in partitioning:
+        yield "all", store
+        return
+
+    month_codes = None
+    if "trade_month" in partitioning:
+        months, month_codes = np.unique(np.array([date[:7] for date in store.dates]), return_inverse=True)
+
+    contract_bounds = np.searchsorted(store.contract_expiry_codes, np.arange(len(store.expiries) + 1))
+    for expiry_code, expiry in enumerate(store.expiries):
+        lo = store.contract_offsets[contract_bounds[expiry_code]]
+        hi = store.contract_offsets[contract_bounds[expiry_code + 1]]
+        if lo == hi:
+            continue
+        rows = store.order[lo:hi]
+        if month_codes is None:
+            yield expiry, subset_store(store, rows)
+            continue
+        row_months = month_codes[store.sorted_date_codes[lo:hi]]
+        for month_code in np.unique(row_months).tolist():
+            yield f"{expiry}-m{months[month_code]}", subset_store(store, rows[row_months == month_code])
+
+
+def write_parts(
+    parts_dir: Path,
+    generation: int,
+    dataset_name: str,
+    store: ColumnarOptionsStore,
+    partitioning: List[str]
+) -> List[Tuple[PartInfo, ColumnarOptionsStore]]:
+    # Split a store by the partitioning keys and write each piece as an immutable part file
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for label, part_store in split_store(store, partitioning):
+        file_name = f"{generation:06d}-{label}-{uuid.uuid4().hex[:8]}{BINARY_SUFFIX}"
+        metadata = DatasetMetadata(
+            dataset_name=dataset_name,
+            date_range={"start": part_store.dates[0], "end": part_store.dates[-1]},
+            record_count=part_store.record_count
+        )
+        write_binary_dataset(parts_dir / file_name, metadata, part_store)
+        written.append((part_info_from_store(file_name, part_store), part_store))
+    return written
+
+
+def write_partitioned_dataset(
+    manifest_path: Path,
+    dataset_name: str,
+    store: ColumnarOptionsStore,
+    partitioning: List[str]
+) -> Manifest:
+    # Write a whole dataset as parts split by expiry (and optionally trade month) plus its manifest.
+    # Underlying prices come from the source store so they match the unpartitioned dataset.
+    parts = write_parts(parts_dir_for(manifest_path), 1, dataset_name, store, partitioning)
+    manifest = add_parts(
+        empty_manifest(dataset_name, partitioning),
+        parts,
+        dict(zip(store.dates, store.underlying_by_date.tolist()))
+    )
+    write_manifest(manifest_path, manifest)
+    return manifest
+
+
+class PartitionedOptionsStore(OptionsStoreBase):
+    # Store over the parts of a manifest. Contract ids, date codes and row ids are global; each
+    # part keeps its own local dictionaries and index and is opened (memory-mapped) only when a
+    # lookup needs rows from it. A (contract, date) pair is quoted in at most one part.
+
+    def __init__(self, manifest: Manifest, open_part: Callable[[PartInfo], ColumnarOptionsStore]):
+        self.manifest = manifest
+        self.parts = manifest.parts
+        self.dates = list(manifest.dates)
+        self.expiries = list(manifest.expiries)
+        self.underlying_by_date = np.array(manifest.underlyings, dtype=np.float64)
+        self._dates_array = np.array(self.dates)
+        self._open_part = open_part
+        self._opened: Dict[int, Tuple[ColumnarOptionsStore, np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._open_lock = threading.Lock()
+
+        self.row_offsets = np.zeros(len(self.parts) + 1, dtype=np.int64)
+        np.cumsum([part.record_count for part in self.parts], out=self.row_offsets[1:])
+        self._build_contract_table()
+        self._build_lookups()
+
+    def _build_contract_table(self) -> None:
+        # Union of the parts' contracts, ordered by (expiry, type, strike) like a single store,
+        # plus a CSR list of the parts each contract appears in
+        expiry_lookup = {expiry: code for code, expiry in enumerate(self.expiries)}
+        expiry_codes, type_codes, strikes, part_ids = [], [], [], []
+        for part_id, part in enumerate(self.parts):
+            for expiry, by_type in part.contracts.items():
+                for option_type, part_strikes in by_type.items():
+                    expiry_codes.extend([expiry_lookup[expiry]] * len(part_strikes))
+                    type_codes.extend([TYPE_CODES[option_type]] * len(part_strikes))
+                    strikes.extend(part_strikes)
+                    part_ids.extend([part_id] * len(part_strikes))
+
+        expiry_codes = np.array(expiry_codes, dtype=np.int32)
+        type_codes = np.array(type_codes, dtype=np.int8)
+        strikes = np.array(strikes, dtype=np.float64)
+        part_ids = np.array(part_ids, dtype=np.int64)
+
+        order = np.lexsort((part_ids, strikes, type_codes, expiry_codes))
+        expiry_codes, type_codes, strikes, part_ids = (
+            expiry_codes[order], type_codes[order], strikes[order], part_ids[order]
+        )
+        is_new = np.ones(len(order), dtype=bool)
+        is_new[1:] = (
+            (expiry_codes[1:] != expiry_codes[:-1]) | (type_codes[1:] != type_codes[:-1]) | (strikes[1:] != strikes[:-1])
+        )
+
+        self.contract_expiry_codes = expiry_codes[is_new]
+        self.contract_type_codes = type_codes[is_new]
+        self.contract_strikes = strikes[is_new]
+        self.contract_part_offsets = np.append(np.flatnonzero(is_new), len(order)).astype(np.int64)
+        self.contract_part_ids = part_ids
+        # Global contract id of each (contract, part) entry, used to find a part's contracts
+        self._entry_contract_ids = np.cumsum(is_new) - 1
+
+    @property
+    def record_count(self) -> int:
+        return int(self.row_offsets[-1])
+
+    @property
+    def nbytes(self) -> int:
+        with self._open_lock:
+            opened = [entry[0] for entry in self._opened.values()]
+        return int(sum(store.nbytes for store in opened) + self.underlying_by_date.nbytes)
+
+    @property
+    def opened_part_count(self) -> int:
+        return len(self._opened)
+
+    def _part(self, part_id: int) -> Tuple[ColumnarOptionsStore, np.ndarray, np.ndarray, np.ndarray]:
+        # Open a part on first use. Alongside the store keep: the global code of each local date,
+        # and the (sorted) global ids of the part's contracts with their local ids.
+        entry = self._opened.get(part_id)
+        if entry is not None:
+            return entry
+        with self._open_lock:
+            entry = self._opened.get(part_id)
+            if entry is None:
+                store = self._open_part(self.parts[part_id])
+                global_dates = np.searchsorted(self._dates_array, np.array(store.dates)) if store.dates else np.array([], dtype=np.int64)
+                global_contracts = self._entry_contract_ids[self.contract_part_ids == part_id]
+                local_contracts = np.array([
+                    store.find_contract(
+                        float(self.contract_strikes[contract_id]),
+                        self.expiries[self.contract_expiry_codes[contract_id]],
+                        OPTION_TYPES[self.contract_type_codes[contract_id]]
+                    )
+                    for contract_id in global_contracts.tolist()
+                ], dtype=np.int64)
+                entry = (store, global_dates.astype(np.int64), global_contracts, local_contracts)
+                self._opened[part_id] = entry
+        return entry
+
+    def _parts_overlapping(self, start_date: str, end_date: str) -> List[int]:
+        return [
+            part_id for part_id, part in enumerate(self.parts)
+            if part.start_date <= end_date and part.end_date >= start_date
+        ]
+
+    def _local_date_codes(self, global_dates: np.ndarray, date_codes: np.ndarray) -> np.ndarray:
+        # Map global date codes into a part's local codes, -1 where the part has no such date
+        if len(global_dates) == 0:
+            return np.full(len(date_codes), -1, dtype=np.int64)
+        positions = np.searchsorted(global_dates, date_codes)
+        clipped = np.minimum(positions, len(global_dates) - 1)
+        return np.where(global_dates[clipped] == date_codes, clipped, -1)
+
+    def gather_matrix(self, contract_ids: np.ndarray, date_codes: np.ndarray) -> np.ndarray:
+        # Same contract as ColumnarOptionsStore.gather_matrix. Only parts that hold one of the
+        # contracts and overlap the requested dates are opened; each answers for its own rows.
+        contract_ids = np.asarray(contract_ids, dtype=np.int64)
+        date_codes = np.asarray(date_codes, dtype=np.int64)
+        prices = np.full((len(contract_ids), len(date_codes)), np.nan, dtype=np.float64)
+
+        valid = (date_codes >= 0) & (date_codes < len(self.dates))
+        if not len(contract_ids) or not valid.any():
+            return prices
+        first_date = self.dates[int(date_codes[valid].min())]
+        last_date = self.dates[int(date_codes[valid].max())]
+
+        starts = self.contract_part_offsets[contract_ids]
+        counts = self.contract_part_offsets[contract_ids + 1] - starts
+        slots = np.repeat(np.arange(len(contract_ids)), counts)
+        entries = np.arange(int(counts.sum())) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        entry_parts = self.contract_part_ids[entries]
+
+        for part_id in np.unique(entry_parts).tolist():
+            part = self.parts[part_id]
+            if part.start_date > last_date or part.end_date < first_date:
+                continue
+            store, global_dates, global_contracts, local_contracts = self._part(part_id)
+            part_slots = slots[entry_parts == part_id]
+            local_ids = local_contracts[np.searchsorted(global_contracts, contract_ids[part_slots])]
+            local_codes = np.where(valid, self._local_date_codes(global_dates, date_codes), -1)
+
+            part_prices = store.gather_matrix(local_ids, local_codes)
+            block = prices[part_slots]
+            quoted = ~np.isnan(part_prices)
+            block[quoted] = part_prices[quoted]
+            prices[part_slots] = block
+        return prices
+
+    def price_on(self, contract_id: int, date_code: int) -> Optional[float]:
+        date = self.dates[date_code]
+        start, end = self.contract_part_offsets[contract_id], self.contract_part_offsets[contract_id + 1]
+        for part_id in self.contract_part_ids[start:end].tolist():
+            part = self.parts[part_id]
+            if not part.start_date <= date <= part.end_date:
+                continue
+            store, _, global_contracts, local_contracts = self._part(part_id)
+            local_date = store.date_lookup.get(date)
+            if local_date is None:
+                continue
+            local_id = int(local_contracts[np.searchsorted(global_contracts, contract_id)])
+            price = store.price_on(local_id, local_date)
+            if price is not None:
+                return price
+        return None
+
+    def rows_in_date_code_range(self, lo: int, hi: int) -> np.ndarray:
+        if lo >= hi:
+            return np.array([], dtype=np.int64)
+        start_date, end_date = self.dates[lo], self.dates[hi - 1]
+        rows = []
+        for part_id in self._parts_overlapping(start_date, end_date):
+            store = self._part(part_id)[0]
+            local_lo, local_hi = store.date_code_range(start_date, end_date)
+            rows.append(store.rows_in_date_code_range(local_lo, local_hi) + self.row_offsets[part_id])
+        return np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+
+    def record(self, row: int) -> OptionRecord:
+        part_id = int(np.searchsorted(self.row_offsets, row, side="right")) - 1
+        return self._part(part_id)[0].record(row - int(self.row_offsets[part_id]))
+
+
+def open_partitioned_dataset(path: Path) -> OptionsDataset:
+    # Read a manifest and wrap its parts in a lazily opening store; no part file is touched yet
+    manifest = read_manifest(path)
+    parts_dir = parts_dir_for(path)
+
+    def open_part(part: PartInfo) -> ColumnarOptionsStore:
+        return get_columnar_store(open_binary_dataset(parts_dir / part.file))
+
+    return dataset_from_store(manifest.metadata, PartitionedOptionsStore(manifest, open_part))
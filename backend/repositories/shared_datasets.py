@@ -0,0 +1,164 @@
+import atexit
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from repositories.binary_format import BINARY_SUFFIX
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks (Windows): exports are still shared, but never cleaned up while in use
+    fcntl = None
+
+
+def _default_shared_dir() -> Path:
+    # /dev/shm is memory-backed, so a mapped export there is the only copy of the data in RAM
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+    return base / "backtester-datasets"
+
+
+SHARED_DATASETS = os.getenv("SHARED_DATASETS", "0") == "1"
+SHARED_DATASET_DIR = Path(os.getenv("SHARED_DATASET_DIR") or _default_shared_dir())
+
+_LOCK_FILE = ".lock"
+
+
+@contextmanager
+def _exclusive(lock_path: Path) -> Iterator[None]:
+    # Cross-process mutex on a lock file, held while one process writes an export
+    with open(lock_path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+def _remove_if_unused(path: Path) -> bool:
+    # Delete an export nobody holds a reference to. Attached processes hold a shared flock on the
+    # file, so the exclusive lock is only granted once the last of them has let go.
+    if fcntl is None:
+        return False
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    try:
+        path.unlink(missing_ok=True)
+    finally:
+        os.close(fd)
+    return True
+
+
+class SharedDatasetRegistry:
+    # Memory-mappable exports of datasets that several processes (uvicorn workers, sweep workers)
+    # attach to instead of each parsing its own copy. The first process to need a version of a
+    # dataset writes the export under a cross-process lock; the rest wait and map the same file,
+    # so the OS keeps one copy of its pages for all of them.
+    #
+    # Reference counting is done with flock: each attached process holds a shared lock on the
+    # export, and a file is only removed by a process that can take the exclusive lock. Locks are
+    # released by the kernel when a process dies, so a crashed worker never pins an export.
+
+    def __init__(self, root: Path = SHARED_DATASET_DIR, enabled: bool = SHARED_DATASETS):
+        self.root = Path(root)
+        self.enabled = enabled
+        self._leases: Dict[str, Tuple[Path, int]] = {}
+        self._lock = threading.Lock()
+
+    def export_dir(self, dataset_name: str, source_path: Path) -> Path:
+        source_key = hashlib.sha1(str(source_path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.root / f"{dataset_name}-{source_key}"
+
+    def export_path(self, dataset_name: str, source_path: Path) -> Path:
+        # One export per source file version
+        stat = source_path.stat()
+        return self.export_dir(dataset_name, source_path) / f"{stat.st_mtime_ns}-{stat.st_size}{BINARY_SUFFIX}"
+
+    def publish(self, dataset_name: str, source_path: Path, build: Callable[[Path], None]) -> Path:
+        # Path of the export for the current version of source_path, calling build(path) to write
+        # it if no process has yet. Exports of older versions are removed once unused.
+        export_path = self.export_path(dataset_name, source_path)
+        if export_path.exists():
+            return export_path
+
+        export_path.parent.mkdir(parents=True, exist_ok=True)
+        with _exclusive(export_path.parent / _LOCK_FILE):
+            if not export_path.exists():
+                build(export_path)
+            for stale_path in export_path.parent.glob(f"*{BINARY_SUFFIX}"):
+                if stale_path != export_path and not self._is_leased(stale_path):
+                    _remove_if_unused(stale_path)
+        return export_path
+
+    def attach(self, dataset_name: str, source_path: Path, build: Callable[[Path], None]) -> Path:
+        # Publish the current version and take a reference to it for this process. The reference
+        # to the dataset's previous version, if any, is dropped.
+        while True:
+            export_path = self.publish(dataset_name, source_path, build)
+            fd = self._reference(export_path)
+            if fd is not None:
+                break
+            # Removed before we held a reference (it went stale, or its last user left); publish again
+
+        # Keyed by export directory: datasets of the same name in different data directories are distinct
+        key = str(export_path.parent)
+        with self._lock:
+            previous = self._leases.get(key)
+            self._leases[key] = (export_path, fd)
+        if previous is not None:
+            self._release(previous)
+        return export_path
+
+    def release_all(self) -> None:
+        # Drop every reference held by this process and delete the exports no other process uses
+        with self._lock:
+            leases = list(self._leases.values())
+            self._leases.clear()
+        for lease in leases:
+            self._release(lease)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"shared_mode": self.enabled, "shared_attached": len(self._leases)}
+
+    def _reference(self, export_path: Path) -> Optional[int]:
+        # Open the export holding a shared lock on it, or None if it no longer exists
+        try:
+            fd = os.open(export_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            # The last holder may have removed it between our open and our lock
+            try:
+                removed = os.stat(export_path).st_ino != os.fstat(fd).st_ino
+            except FileNotFoundError:
+                removed = True
+            if removed:
+                os.close(fd)
+                return None
+        return fd
+
+    def _is_leased(self, path: Path) -> bool:
+        with self._lock:
+            return any(leased_path == path for leased_path, _ in self._leases.values())
+
+    def _release(self, lease: Tuple[Path, int]) -> None:
+        path, fd = lease
+        os.close(fd)
+        if not self._is_leased(path):
+            _remove_if_unused(path)
+
+
+# Process-wide registry; references are released when the process exits normally
+shared_datasets = SharedDatasetRegistry()
+atexit.register(shared_datasets.release_all)
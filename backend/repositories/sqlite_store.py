@@ -0,0 +1,225 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from models.options import DatasetMetadata, OptionsDataset, OptionRecord
+from repositories.columnar_store import (
+    OPTION_TYPES, ColumnarOptionsStore, OptionsStoreBase, dataset_from_store
+)
+
+SQLITE_SUFFIX = ".sqlite"
+SCHEMA_VERSION = 1
+# Rows are inserted in batches of this size so memory-mapped inputs are never copied whole
+INSERT_BATCH_ROWS = 50_000
+
+# Rows keep their storage order in the rowid (row id + 1). The contract index covers the price
+# lookups (expiry, type, strike, date -> mid_price) and trading_days is a clustered date ->
+# underlying table, so the hot queries never touch the quotes table itself.
+_SCHEMA = (
+    "CREATE TABLE dataset (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE trading_days (date TEXT PRIMARY KEY, underlying REAL NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE contracts (contract_id INTEGER PRIMARY KEY, expiry TEXT NOT NULL, type TEXT NOT NULL, "
+    "strike REAL NOT NULL)",
+    "CREATE TABLE quotes (date TEXT NOT NULL, underlying REAL NOT NULL, expiry TEXT NOT NULL, "
+    "strike REAL NOT NULL, type TEXT NOT NULL, mid_price REAL NOT NULL)"
+)
+_INDEXES = (
+    "CREATE INDEX quotes_contract_date ON quotes (expiry, type, strike, date, mid_price)",
+    "CREATE INDEX quotes_date ON quotes (date)"
+)
+
+# Statements are fixed strings so each connection prepares them once and reuses them from its
+# statement cache. Duplicate (contract, date) quotes resolve to the earliest row, as in the
+# columnar store; SQLite takes the bare columns from the MIN(rowid) row.
+_SERIES_SQL = (
+    "SELECT date, mid_price, MIN(rowid) FROM quotes "
+    "WHERE expiry = ? AND type = ? AND strike = ? AND date BETWEEN ? AND ? "
+    "GROUP BY date ORDER BY date"
+)
+_PRICE_SQL = (
+    "SELECT mid_price, MIN(rowid) FROM quotes "
+    "WHERE expiry = ? AND type = ? AND strike = ? AND date = ?"
+)
+_ROWS_IN_RANGE_SQL = "SELECT rowid - 1 FROM quotes WHERE date BETWEEN ? AND ? ORDER BY rowid"
+_RECORD_SQL = "SELECT date, underlying, expiry, strike, type, mid_price FROM quotes WHERE rowid = ?"
+
+
+def _quote_rows(store: ColumnarOptionsStore, start: int, stop: int) -> Iterator[Tuple]:
+    dates = np.array(store.dates, dtype=object)
+    expiries = np.array(store.expiries, dtype=object)
+    types = np.array(OPTION_TYPES, dtype=object)
+    return zip(
+        dates[store.date_codes[start:stop]].tolist(),
+        store.underlyings[start:stop].tolist(),
+        expiries[store.expiry_codes[start:stop]].tolist(),
+        store.strikes[start:stop].tolist(),
+        types[store.type_codes[start:stop]].tolist(),
+        store.mid_prices[start:stop].tolist()
+    )
+
+
+def write_sqlite_dataset(path: Path, metadata: DatasetMetadata, store: ColumnarOptionsStore) -> None:
+    # Write a store to a SQLite database in WAL mode, replacing the target atomically. Indexes are
+    # built after the bulk insert, which is much faster than maintaining them row by row.
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    for stale in (tmp_path, Path(f"{tmp_path}-wal"), Path(f"{tmp_path}-shm")):
+        stale.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.executemany("INSERT INTO dataset (key, value) VALUES (?, ?)", [
+                ("schema_version", str(SCHEMA_VERSION)),
+                ("metadata", metadata.model_dump_json()),
+                ("record_count", str(store.record_count))
+            ])
+            conn.executemany(
+                "INSERT INTO trading_days (date, underlying) VALUES (?, ?)",
+                zip(store.dates, store.underlying_by_date.tolist())
+            )
+            conn.executemany(
+                "INSERT INTO contracts (contract_id, expiry, type, strike) VALUES (?, ?, ?, ?)",
+                (
+                    (contract_id, store.expiries[expiry_code], OPTION_TYPES[type_code], strike)
+                    for contract_id, (expiry_code, type_code, strike) in enumerate(zip(
+                        store.contract_expiry_codes.tolist(),
+                        store.contract_type_codes.tolist(),
+                        store.contract_strikes.tolist()
+                    ))
+                )
+            )
+            for start in range(0, store.record_count, INSERT_BATCH_ROWS):
+                conn.executemany(
+                    "INSERT INTO quotes (date, underlying, expiry, strike, type, mid_price) VALUES (?, ?, ?, ?, ?, ?)",
+                    _quote_rows(store, start, start + INSERT_BATCH_ROWS)
+                )
+            for statement in _INDEXES:
+                conn.execute(statement)
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+
+
+class SqliteOptionsStore(OptionsStoreBase):
+    # Store backed by a SQLite file. The date and contract dictionaries (small: one row per date
+    # and per contract) are read into memory on open; quotes stay on disk and are fetched through
+    # the covering indexes. Each thread gets its own read-only connection, and WAL mode lets any
+    # number of them read concurrently.
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._uri = f"{path.resolve().as_uri()}?mode=ro"
+        self._local = threading.local()
+
+        conn = self._connection()
+        settings = dict(conn.execute("SELECT key, value FROM dataset"))
+        if int(settings.get("schema_version", 0)) != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported SQLite dataset schema in {path.name}")
+        self.metadata = DatasetMetadata.model_validate_json(settings["metadata"])
+        self._record_count = int(settings["record_count"])
+
+        trading_days = conn.execute("SELECT date, underlying FROM trading_days ORDER BY date").fetchall()
+        self.dates = [date for date, _ in trading_days]
+        self.underlying_by_date = np.array([underlying for _, underlying in trading_days], dtype=np.float64)
+        self._dates_array = np.array(self.dates)
+
+        contracts = conn.execute("SELECT expiry, type, strike FROM contracts ORDER BY contract_id").fetchall()
+        self.expiries = sorted({expiry for expiry, _, _ in contracts})
+        expiry_lookup = {expiry: code for code, expiry in enumerate(self.expiries)}
+        type_lookup = {name: code for code, name in enumerate(OPTION_TYPES)}
+        self.contract_expiry_codes = np.array([expiry_lookup[expiry] for expiry, _, _ in contracts], dtype=np.int32)
+        self.contract_type_codes = np.array([type_lookup[option_type] for _, option_type, _ in contracts], dtype=np.int8)
+        self.contract_strikes = np.array([strike for _, _, strike in contracts], dtype=np.float64)
+        self._contract_keys = contracts
+
+        self._build_lookups()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._uri, uri=True)
+            self._local.conn = conn
+        return conn
+
+    @property
+    def record_count(self) -> int:
+        return self._record_count
+
+    @property
+    def nbytes(self) -> int:
+        # Only the dictionaries live in memory; SQLite's page cache is not counted
+        return int(
+            self.underlying_by_date.nbytes + self.contract_expiry_codes.nbytes
+            + self.contract_type_codes.nbytes + self.contract_strikes.nbytes
+        )
+
+    def price_series(self, contract_id: int, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Date codes and mid prices of one contract's quotes with date codes in [lo, hi), in one
+        # index range scan
+        if lo >= hi:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        expiry, option_type, strike = self._contract_keys[contract_id]
+        rows = self._connection().execute(
+            _SERIES_SQL, (expiry, option_type, strike, self.dates[lo], self.dates[hi - 1])
+        ).fetchall()
+        date_codes = np.searchsorted(self._dates_array, np.array([date for date, _, _ in rows], dtype=str))
+        return date_codes.astype(np.int64), np.array([price for _, price, _ in rows], dtype=np.float64)
+
+    def gather_matrix(self, contract_ids: np.ndarray, date_codes: np.ndarray) -> np.ndarray:
+        # One range query per contract over the span of the requested dates, then a searchsorted
+        # to place each quote in its column
+        contract_ids = np.asarray(contract_ids, dtype=np.int64)
+        date_codes = np.asarray(date_codes, dtype=np.int64)
+        prices = np.full((len(contract_ids), len(date_codes)), np.nan, dtype=np.float64)
+
+        known = (date_codes >= 0) & (date_codes < len(self.dates))
+        if not known.any():
+            return prices
+        lo = int(date_codes[known].min())
+        hi = int(date_codes[known].max()) + 1
+
+        for slot, contract_id in enumerate(contract_ids.tolist()):
+            series_codes, series_prices = self.price_series(contract_id, lo, hi)
+            if len(series_codes) == 0:
+                continue
+            hits = np.searchsorted(series_codes, date_codes)
+            found = known & (hits < len(series_codes))
+            found[found] = series_codes[hits[found]] == date_codes[found]
+            prices[slot, found] = series_prices[hits[found]]
+        return prices
+
+    def price_on(self, contract_id: int, date_code: int) -> Optional[float]:
+        expiry, option_type, strike = self._contract_keys[contract_id]
+        price, _ = self._connection().execute(
+            _PRICE_SQL, (expiry, option_type, strike, self.dates[date_code])
+        ).fetchone()
+        return price
+
+    def rows_in_date_code_range(self, lo: int, hi: int) -> np.ndarray:
+        if lo >= hi:
+            return np.array([], dtype=np.int64)
+        rows = self._connection().execute(_ROWS_IN_RANGE_SQL, (self.dates[lo], self.dates[hi - 1]))
+        return np.fromiter((row for row, in rows), dtype=np.int64)
+
+    def record(self, row: int) -> OptionRecord:
+        date, underlying, expiry, strike, option_type, mid_price = self._connection().execute(
+            _RECORD_SQL, (row + 1,)
+        ).fetchone()
+        return OptionRecord.model_construct(
+            date=date, underlying=underlying, expiry=expiry, strike=strike, type=option_type, mid_price=mid_price
+        )
+
+
+def open_sqlite_dataset(path: Path) -> OptionsDataset:
+    # Open a SQLite dataset; only its date and contract tables are read up front
+    store = SqliteOptionsStore(path)
+    return dataset_from_store(store.metadata, store)
@@ -0,0 +1,240 @@
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from components.greeks import TRADING_DAYS_PER_YEAR, black_scholes_greeks, implied_volatility
+from models.backtest import (
+    BacktestResponse, ColumnarBacktestResponse, ColumnarGreeksBacktestResponse, ColumnarGreeksBacktestResults,
+    DailyPnLColumnsWithGreeks, DailyPnLWithGreeks, GreeksBacktestResponse, GreeksBacktestResults
+)
+from models.options import OptionChainResponse, OptionChainRow
+from models.strategy import StrategyConfig
+from repositories.columnar_store import (
+    OPTION_TYPES, TYPE_CODES, ColumnarOptionsStore, OptionsStoreBase, get_columnar_store
+)
+from repositories.dataset_repository import DatasetRepository
+from repositories.option_analytics import GREEK_COLUMNS, AnalyticsCache, OptionAnalytics
+from services.timing import timed_stage
+
+GREEKS_RISK_FREE_RATE = float(os.getenv("GREEKS_RISK_FREE_RATE", "0.04"))
+
+# Quotes solved per batch, which bounds the solver's temporary arrays
+ANALYTICS_CHUNK_ROWS = 1_000_000
+
+# Decimal places each analytics value is reported with
+GREEK_DECIMALS = {"implied_volatility": 4, "delta": 4, "gamma": 6, "theta": 4, "vega": 4}
+
+
+class ChainQueryError(Exception):
+    def __init__(self, message: str, error_code: str):
+        super().__init__(message)
+        self.error_code = error_code
+
+
+class OptionAnalyticsService:
+    # Implied volatility and Greeks for every quote of a dataset, solved once per dataset version
+    # with vectorised NumPy and cached next to the dataset. Backtests and chain queries then read
+    # them with an indexed lookup.
+
+    def __init__(
+        self,
+        dataset_repo: DatasetRepository,
+        rate: float = GREEKS_RISK_FREE_RATE,
+        cache: Optional[AnalyticsCache] = None
+    ):
+        self.dataset_repo = dataset_repo
+        self.rate = rate
+        self.cache = cache if cache is not None else AnalyticsCache(dataset_repo.data_dir, dataset_repo.cache)
+
+    def get_analytics(self, dataset_name: str) -> Optional[Tuple[OptionsStoreBase, OptionAnalytics]]:
+        # The dataset's store with its analytics, computing them if this version has none yet
+        source_path = self.dataset_repo.resolve_dataset_path(dataset_name)
+        version = self.dataset_repo.get_dataset_version(dataset_name) if source_path is not None else None
+        dataset = self.dataset_repo.load_dataset(dataset_name) if version is not None else None
+        if dataset is None:
+            return None
+        store = get_columnar_store(dataset)
+
+        with timed_stage("greeks"):
+            analytics = self.cache.get(
+                dataset_name, source_path, dataset, version, self.rate, lambda: self.compute_analytics(store, version)
+            )
+        return store, analytics
+
+    def compute_analytics(self, store: OptionsStoreBase, version: str) -> OptionAnalytics:
+        contract_ids, date_codes, prices = self.quote_columns(store)
+        years_by_date_expiry = self.years_to_expiry_table(store)
+        is_call = store.contract_type_codes == TYPE_CODES["call"]
+
+        columns = {name: np.empty(len(prices), dtype=np.float32) for name in GREEK_COLUMNS}
+        for start in range(0, len(prices), ANALYTICS_CHUNK_ROWS):
+            stop = start + ANALYTICS_CHUNK_ROWS
+            contracts = contract_ids[start:stop]
+            dates = date_codes[start:stop]
+            quote_is_call = is_call[contracts]
+            spot = store.underlying_by_date[dates]
+            strike = store.contract_strikes[contracts]
+            years = years_by_date_expiry[dates, store.contract_expiry_codes[contracts]]
+
+            volatility = implied_volatility(quote_is_call, spot, strike, years, prices[start:stop], self.rate)
+            greeks = black_scholes_greeks(quote_is_call, spot, strike, years, volatility, self.rate)
+            columns["implied_volatility"][start:stop] = volatility
+            for name, values in greeks.items():
+                columns[name][start:stop] = values
+
+        return OptionAnalytics(
+            version=version,
+            rate=self.rate,
+            date_count=len(store.dates),
+            contract_count=len(store.contract_strikes),
+            keys=contract_ids * len(store.dates) + date_codes,
+            columns=columns
+        )
+
+    def quote_columns(self, store: OptionsStoreBase) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Contract id, date code and mid price of every quote, ordered by contract then date
+        if isinstance(store, ColumnarOptionsStore):
+            # The index already holds the quotes in that order
+            counts = np.diff(store.contract_offsets)
+            contract_ids = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+            return contract_ids, store.sorted_date_codes.astype(np.int64), store.mid_prices[store.order]
+
+        # Partitioned and SQLite stores: gather blocks of contracts over every date and keep the quotes
+        all_dates = np.arange(len(store.dates), dtype=np.int64)
+        block = max(1, ANALYTICS_CHUNK_ROWS // max(len(all_dates), 1))
+        contract_parts, date_parts, price_parts = [], [], []
+        for start in range(0, len(store.contract_strikes), block):
+            contracts = np.arange(start, min(start + block, len(store.contract_strikes)), dtype=np.int64)
+            matrix = store.gather_matrix(contracts, all_dates)
+            rows, columns = np.nonzero(~np.isnan(matrix))
+            contract_parts.append(contracts[rows])
+            date_parts.append(columns.astype(np.int64))
+            price_parts.append(matrix[rows, columns])
+        if not contract_parts:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, np.array([], dtype=np.float64)
+        return np.concatenate(contract_parts), np.concatenate(date_parts), np.concatenate(price_parts)
+
+    def years_to_expiry_table(self, store: OptionsStoreBase) -> np.ndarray:
+        # (date x expiry) trading-day year fractions, counting business days like the data generator
+        dates = np.array(store.dates, dtype="datetime64[D]")
+        expiries = np.array(store.expiries, dtype="datetime64[D]")
+        return np.busday_count(dates[:, None], expiries[None, :]) / TRADING_DAYS_PER_YEAR
+
+    def attach_greeks(self, response: BacktestResponse, strategy: StrategyConfig) -> BacktestResponse:
+        # Copy of a successful backtest response with the contract's analytics added to each day.
+        # Responses may be shared through the result cache, so they are never modified in place.
+        if response.status != "success" or response.results is None:
+            return response
+        resolved = self.get_analytics(strategy.dataset_name)
+        if resolved is None:
+            return response
+        store, analytics = resolved
+
+        results = response.results
+        columnar = isinstance(response, ColumnarBacktestResponse)
+        dates = results.daily_pnl.dates if columnar else [day.date for day in results.daily_pnl]
+        series = self.contract_series(store, analytics, strategy, dates)
+
+        with timed_stage("build_response"):
+            if columnar:
+                return ColumnarGreeksBacktestResponse(
+                    **response.model_dump(exclude={"results"}),
+                    results=ColumnarGreeksBacktestResults(
+                        daily_pnl=DailyPnLColumnsWithGreeks(**results.daily_pnl.model_dump(), **series),
+                        **results.model_dump(exclude={"daily_pnl"})
+                    )
+                )
+            return GreeksBacktestResponse(
+                **response.model_dump(exclude={"results"}),
+                results=GreeksBacktestResults(
+                    daily_pnl=[
+                        DailyPnLWithGreeks(
+                            date=day.date,
+                            cumulative_pnl=day.cumulative_pnl,
+                            underlying_price=day.underlying_price,
+                            **{name: values[position] for name, values in series.items()}
+                        )
+                        for position, day in enumerate(results.daily_pnl)
+                    ],
+                    **results.model_dump(exclude={"daily_pnl"})
+                )
+            )
+
+    def contract_series(
+        self,
+        store: OptionsStoreBase,
+        analytics: OptionAnalytics,
+        strategy: StrategyConfig,
+        dates: List[str]
+    ) -> Dict[str, List[Optional[float]]]:
+        # Each analytics column for one contract on the given dates
+        contract_id = store.find_contract(strategy.strike, strategy.expiry, strategy.option_type)
+        if contract_id is None:
+            return {name: [None] * len(dates) for name in GREEK_COLUMNS}
+        date_codes = np.array([store.date_lookup.get(date, -1) for date in dates], dtype=np.int64)
+        values = analytics.lookup(np.full(len(dates), contract_id, dtype=np.int64), date_codes)
+        # Dates missing from the dataset must not alias into the previous contract's keys
+        for column in values.values():
+            column[date_codes < 0] = np.nan
+        return self.as_reported(values)
+
+    def get_option_chain(
+        self,
+        dataset_name: str,
+        date: str,
+        expiry: Optional[str] = None,
+        option_type: Optional[str] = None
+    ) -> Optional[OptionChainResponse]:
+        # Every contract quoted on a date (optionally one expiry and/or type) with its analytics,
+        # ordered by expiry, type and strike; None if the dataset does not exist
+        resolved = self.get_analytics(dataset_name)
+        if resolved is None:
+            return None
+        store, analytics = resolved
+
+        date_code = store.date_lookup.get(date)
+        if date_code is None:
+            raise ChainQueryError(f"No data for {date} in dataset '{dataset_name}'", "DATE_NOT_FOUND")
+
+        selected = np.ones(len(store.contract_strikes), dtype=bool)
+        if expiry is not None:
+            expiry_code = store.expiry_lookup.get(expiry)
+            if expiry_code is None:
+                raise ChainQueryError(f"Expiry {expiry} not in dataset '{dataset_name}'", "EXPIRY_NOT_FOUND")
+            selected &= store.contract_expiry_codes == expiry_code
+        if option_type is not None:
+            selected &= store.contract_type_codes == TYPE_CODES[option_type]
+
+        contract_ids = np.flatnonzero(selected)
+        prices = store.gather_matrix(contract_ids, np.array([date_code], dtype=np.int64))[:, 0]
+        quoted = ~np.isnan(prices)
+        contract_ids, prices = contract_ids[quoted], prices[quoted]
+        values = self.as_reported(analytics.lookup(contract_ids, np.full(len(contract_ids), date_code)))
+
+        return OptionChainResponse(
+            dataset_name=dataset_name,
+            date=date,
+            underlying_price=float(store.underlying_by_date[date_code]),
+            risk_free_rate=analytics.rate,
+            rows=[
+                OptionChainRow(
+                    expiry=store.expiries[store.contract_expiry_codes[contract_id]],
+                    strike=float(store.contract_strikes[contract_id]),
+                    option_type=OPTION_TYPES[store.contract_type_codes[contract_id]],
+                    mid_price=price,
+                    **{name: column[position] for name, column in values.items()}
+                )
+                for position, (contract_id, price) in enumerate(zip(contract_ids.tolist(), prices.tolist()))
+            ]
+        )
+
+    def as_reported(self, values: Dict[str, np.ndarray]) -> Dict[str, List[Optional[float]]]:
+        # Rounded lists with None in place of NaN, ready for the response models
+        return {
+            name: [
+                None if math.isnan(value) else round(value, GREEK_DECIMALS[name])
+                for value in column.tolist()
+            ]
+            for name, column in values.items()
+        }
@@ -1,17 +1,80 @@
 import time
-from typing import Tuple, List
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, List, Union
+import numpy as np
 from models.strategy import StrategyConfig, StrategyValidationResponse
 from models.backtest import (
     BacktestRequest, BacktestResponse, BacktestResults,
-    DailyPnL, StrategySummary, BacktestPeriod
+    DailyPnL, StrategySummary, BacktestPeriod,
+    ColumnarBacktestResponse, ColumnarBacktestResults, DailyPnLColumns,
+    DistributionSummary, RollingBacktestResponse, RollingBacktestResults,
+    RollingBacktestSummary, RollingEntryResult
 )
 from repositories.dataset_repository import DatasetRepository
 from repositories.options_repository import OptionsRepository
+from services.json_encoding import encode_ndjson
+from services.result_cache import BacktestResultCache, backtest_cache_key
+from services.timing import timed_stage
+
+CONTRACT_MULTIPLIER = 100
+
+# Daily rows per chunk of a streamed NDJSON backtest
+NDJSON_ROWS_PER_CHUNK = 500
+
+# Price cells per block when rolling entries are recomputed one P/L series each
+ROLLING_EXACT_MAX_CELLS = 1_000_000
+
+# Called with (stage, fraction complete) as a backtest moves through its stages
+ProgressCallback = Callable[[str, float], None]
+
+
+class BacktestCancelled(Exception):
+    # Raised from a progress callback to abandon a running backtest
+    pass
+
+
+@dataclass
+class PreparedBacktest:
+    # A backtest whose window and entry have been resolved, ready for the P/L computation
+    request: BacktestRequest
+    options_repo: OptionsRepository
+    backtest_dates: List[str]
+    first_code: int
+    end_code: int
+    entry_price: float
+    started_at: float
+
+
+@dataclass
+class BacktestOutcome:
+    prepared: PreparedBacktest
+    # Daily series, already rounded to cents
+    pnl: np.ndarray
+    underlying: np.ndarray
+    final_pnl: float
+    win_rate: float
+    max_drawdown: float
+    position_closed: bool
+    exit_reason: str
+
+
+@dataclass
+class RollingEntries:
+    # One element per trading day the position could have been opened on (the contract was quoted)
+    positions: np.ndarray
+    entry_prices: np.ndarray
+    total_days: np.ndarray
+    final_pnl: np.ndarray
+    win_rate: np.ndarray
+    max_drawdown: np.ndarray
+    position_closed: bool
+    exit_reason: str
 
 
 class BacktestService:
-    def __init__(self, dataset_repo: DatasetRepository):
+    def __init__(self, dataset_repo: DatasetRepository, result_cache: Optional[BacktestResultCache] = None):
         self.dataset_repo = dataset_repo
+        self.result_cache = result_cache
 
     def validate_strategy(self, strategy: StrategyConfig) -> StrategyValidationResponse:
         # Validate that the user's strategy parameters are valid before running backtest
@@ -38,11 +101,12 @@ class BacktestService:
         available_dates = options_repo.get_available_dates()
         entry_price = None
 
-        for date in available_dates:
-            price = options_repo.get_option_price(date, strategy.strike, strategy.expiry, strategy.option_type)
-            if price:
-                entry_price = price
-                break
+        with timed_stage("price_lookup"):
+            for date in available_dates:
+                price = options_repo.get_option_price(date, strategy.strike, strategy.expiry, strategy.option_type)
+                if price:
+                    entry_price = price
+                    break
 
         if entry_price is None:
             return StrategyValidationResponse(
@@ -57,47 +121,155 @@ class BacktestService:
             entry_price=entry_price
         )
 
-    def execute_backtest(self, request: BacktestRequest) -> BacktestResponse:
+    def get_result_key(self, request: BacktestRequest) -> Optional[str]:
+        # Content address of the request against the current dataset version (None if the dataset is missing)
+        with timed_stage("result_key"):
+            dataset_version = self.dataset_repo.get_dataset_version(request.strategy.dataset_name)
+            if dataset_version is None:
+                return None
+            return backtest_cache_key(request, dataset_version)
+
+    def execute_backtest_cached(
+        self,
+        request: BacktestRequest,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Tuple[BacktestResponse, Optional[str]]:
+        # Serve a memoised response when the same request was run against the same dataset version.
+        # Returns the response with its result key, which doubles as the HTTP ETag.
+        key = self.get_result_key(request)
+        return self.execute_backtest_for_key(request, key, progress_callback), key
+
+    def execute_backtest_for_key(
+        self,
+        request: BacktestRequest,
+        key: Optional[str],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> BacktestResponse:
+        # execute_backtest_cached for a caller that already holds the request's result key
+        if key is None or self.result_cache is None:
+            return self.execute_backtest(request, progress_callback)
+
+        with timed_stage("result_cache"):
+            cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.execute_backtest(request, progress_callback)
+        # Only successes are stored; errors are cheap to recompute and may be transient
+        if response.status == "success":
+            self.result_cache.put(key, response)
+        return response
+
+    def execute_backtest(
+        self,
+        request: BacktestRequest,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> BacktestResponse:
         # Main backtest execution - runs the strategy simulation and calculates P/L over the date range
-        start_time = time.time()
+        report = progress_callback or (lambda stage, fraction: None)
+        try:
+            prepared = self.prepare_backtest(request, report)
+            if isinstance(prepared, BacktestResponse):
+                return prepared
+            outcome = self.compute_backtest(prepared, report)
+            report("building_response", 0.9)
+            with timed_stage("build_response"):
+                return self.build_response(outcome)
+        except BacktestCancelled:
+            raise
+        except Exception as e:
+            return self.failed_response(e)
 
+    def execute_backtest_columnar(self, request: BacktestRequest) -> BacktestResponse:
+        # Same backtest, with the daily series returned as parallel arrays instead of per-day objects
         try:
-            dataset = self.dataset_repo.load_dataset(request.strategy.dataset_name)
-            if not dataset:
-                return BacktestResponse(
-                    status="error",
-                    message=f"Dataset '{request.strategy.dataset_name}' not found",
-                    error_code="DATASET_NOT_FOUND"
+            prepared = self.prepare_backtest(request)
+            if isinstance(prepared, BacktestResponse):
+                return prepared
+            outcome = self.compute_backtest(prepared)
+            with timed_stage("build_response"):
+                return self.build_columnar_response(outcome)
+        except Exception as e:
+            return self.failed_response(e)
+
+    def execute_backtest_columnar_cached(self, request: BacktestRequest) -> Tuple[BacktestResponse, Optional[str]]:
+        # Columnar responses are served from memoised results when present but not stored themselves
+        key = self.get_result_key(request)
+        return self.execute_backtest_columnar_for_key(request, key), key
+
+    def execute_backtest_columnar_for_key(self, request: BacktestRequest, key: Optional[str]) -> BacktestResponse:
+        cached = None
+        if key is not None and self.result_cache is not None:
+            with timed_stage("result_cache"):
+                cached = self.result_cache.get(key)
+        if cached is not None:
+            with timed_stage("build_response"):
+                return self.columnar_from_response(cached)
+        return self.execute_backtest_columnar(request)
+
+    def execute_rolling_backtest(self, request: BacktestRequest) -> RollingBacktestResponse:
+        # Walk-forward backtest: the same position opened on every trading day of the window and held
+        # to its end, summarised as a distribution across entry dates
+        started_at = time.perf_counter()
+        try:
+            window = self.resolve_window(
+                request.strategy.dataset_name,
+                request.date_range.start_date,
+                min(request.date_range.end_date, request.strategy.expiry)
+            )
+            if isinstance(window, BacktestResponse):
+                return RollingBacktestResponse(status="error", message=window.message, error_code=window.error_code)
+            options_repo, backtest_dates, first_code, end_code = window
+            strategy = request.strategy
+
+            with timed_stage("gather_prices"):
+                prices, underlying = self.gather_series(
+                    options_repo, strategy, np.arange(first_code, end_code, dtype=np.int64)
                 )
-
-            options_repo = OptionsRepository(dataset)
-
-            available_dates = options_repo.get_available_dates()
-            if not available_dates:
-                return BacktestResponse(
+            with timed_stage("compute_pnl"):
+                entries = self.compute_rolling_entries(strategy, backtest_dates, prices, underlying)
+            if len(entries.positions) == 0:
+                return RollingBacktestResponse(
                     status="error",
-                    message="No data available in dataset",
-                    error_code="INSUFFICIENT_DATA"
+                    message=f"No pricing data between {backtest_dates[0]} and {backtest_dates[-1]}",
+                    error_code="NO_PRICING_DATA"
                 )
 
-            start_date = request.date_range.start_date
-            end_date = request.date_range.end_date
-            expiry = request.strategy.expiry
-
-            # Get dates within backtest range, stopping at expiry
-            backtest_dates = [
-                d for d in available_dates
-                if start_date <= d <= min(end_date, expiry)
-            ]
-
-            if not backtest_dates:
-                return BacktestResponse(
-                    status="error",
-                    message=f"No data available for entry date {start_date}",
-                    error_code="INSUFFICIENT_DATA"
+            with timed_stage("build_response"):
+                return RollingBacktestResponse(
+                    status="success",
+                    backtest_period=BacktestPeriod(
+                        start_date=request.date_range.start_date,
+                        end_date=backtest_dates[-1],
+                        total_days=len(backtest_dates)
+                    ),
+                    results=self.build_rolling_results(backtest_dates, entries),
+                    execution_time_ms=int((time.perf_counter() - started_at) * 1000)
                 )
+        except Exception as e:
+            failed = self.failed_response(e)
+            return RollingBacktestResponse(status="error", message=failed.message, error_code=failed.error_code)
 
-            entry_date = backtest_dates[0]
+    def prepare_backtest(
+        self,
+        request: BacktestRequest,
+        report: ProgressCallback = lambda stage, fraction: None
+    ) -> Union[PreparedBacktest, BacktestResponse]:
+        # Resolve the dataset, the trading dates in the window and the entry price; returns an
+        # error response when the backtest cannot run
+        started_at = time.perf_counter()
+        report("loading_dataset", 0.0)
+        window = self.resolve_window(
+            request.strategy.dataset_name,
+            request.date_range.start_date,
+            min(request.date_range.end_date, request.strategy.expiry)
+        )
+        if isinstance(window, BacktestResponse):
+            return window
+        options_repo, backtest_dates, first_code, end_code = window
+
+        entry_date = backtest_dates[0]
+        with timed_stage("price_lookup"):
             entry_price = options_repo.get_option_price(
                 entry_date,
                 request.strategy.strike,
@@ -105,140 +277,604 @@ class BacktestService:
                 request.strategy.option_type
             )
 
-            if entry_price is None:
-                return BacktestResponse(
-                    status="error",
-                    message=f"No pricing data for entry date {entry_date}",
-                    error_code="NO_PRICING_DATA"
-                )
+        if entry_price is None:
+            return BacktestResponse(
+                status="error",
+                message=f"No pricing data for entry date {entry_date}",
+                error_code="NO_PRICING_DATA"
+            )
+
+        return PreparedBacktest(
+            request=request,
+            options_repo=options_repo,
+            backtest_dates=backtest_dates,
+            first_code=first_code,
+            end_code=end_code,
+            entry_price=entry_price,
+            started_at=started_at
+        )
 
-            # Run backtest calculations
-            daily_pnl_data, final_pnl, position_closed, exit_reason = self.calculate_pnl(
-                options_repo,
-                request.strategy,
-                backtest_dates,
-                entry_price
+    def resolve_window(
+        self,
+        dataset_name: str,
+        start_date: str,
+        end_date: str
+    ) -> Union[Tuple[OptionsRepository, List[str], int, int], BacktestResponse]:
+        # Trading dates in [start_date, end_date] (callers cap end_date at the expiry) with their date
+        # code range; returns an error response when the window is empty
+        dataset = self.dataset_repo.load_dataset(dataset_name)
+        if not dataset:
+            return BacktestResponse(
+                status="error",
+                message=f"Dataset '{dataset_name}' not found",
+                error_code="DATASET_NOT_FOUND"
             )
 
-            win_rate = self.calculate_win_rate(daily_pnl_data)
-            max_drawdown = self.calculate_max_drawdown(daily_pnl_data)
+        options_repo = OptionsRepository(dataset)
 
-            execution_time_ms = int((time.time() - start_time) * 1000)
+        available_dates = options_repo.get_available_dates()
+        if not available_dates:
+            return BacktestResponse(
+                status="error",
+                message="No data available in dataset",
+                error_code="INSUFFICIENT_DATA"
+            )
 
+        first_code, end_code = options_repo.store.date_code_range(start_date, end_date)
+        backtest_dates = available_dates[first_code:end_code]
+
+        if not backtest_dates:
             return BacktestResponse(
-                status="success",
-                strategy_summary=StrategySummary(
-                    option_type=request.strategy.option_type,
-                    strike=request.strategy.strike,
-                    expiry=request.strategy.expiry,
-                    position_direction=request.strategy.position_direction,
-                    quantity=request.strategy.quantity,
-                    entry_price=entry_price,
-                    entry_date=entry_date
-                ),
-                backtest_period=BacktestPeriod(
-                    start_date=start_date,
-                    end_date=backtest_dates[-1],
-                    total_days=len(backtest_dates)
+                status="error",
+                message=f"No data available for entry date {start_date}",
+                error_code="INSUFFICIENT_DATA"
+            )
+
+        return options_repo, backtest_dates, first_code, end_code
+
+    def compute_backtest(
+        self,
+        prepared: PreparedBacktest,
+        report: ProgressCallback = lambda stage, fraction: None
+    ) -> BacktestOutcome:
+        # Run backtest calculations over the whole window as array operations
+        report("gathering_prices", 0.3)
+        strategy = prepared.request.strategy
+        with timed_stage("gather_prices"):
+            prices, underlying = self.gather_series(
+                prepared.options_repo, strategy, np.arange(prepared.first_code, prepared.end_code, dtype=np.int64)
+            )
+        with timed_stage("compute_pnl"):
+            cumulative_pnl, position_closed, exit_reason = self.compute_pnl_series(
+                strategy, prepared.backtest_dates, prices, underlying, prepared.entry_price
+            )
+
+        report("computing_statistics", 0.6)
+        with timed_stage("statistics"):
+            rounded_pnl = self.round_series(cumulative_pnl)
+            return BacktestOutcome(
+                prepared=prepared,
+                pnl=rounded_pnl,
+                underlying=self.round_series(underlying),
+                final_pnl=round(float(cumulative_pnl[-1]), 2),
+                win_rate=self.win_rate_from_series(rounded_pnl),
+                max_drawdown=self.max_drawdown_from_series(rounded_pnl),
+                position_closed=position_closed,
+                exit_reason=exit_reason
+            )
+
+    def strategy_summary(self, prepared: PreparedBacktest) -> StrategySummary:
+        strategy = prepared.request.strategy
+        return StrategySummary(
+            option_type=strategy.option_type,
+            strike=strategy.strike,
+            expiry=strategy.expiry,
+            position_direction=strategy.position_direction,
+            quantity=strategy.quantity,
+            entry_price=prepared.entry_price,
+            entry_date=prepared.backtest_dates[0]
+        )
+
+    def backtest_period(self, prepared: PreparedBacktest) -> BacktestPeriod:
+        return BacktestPeriod(
+            start_date=prepared.request.date_range.start_date,
+            end_date=prepared.backtest_dates[-1],
+            total_days=len(prepared.backtest_dates)
+        )
+
+    def build_response(self, outcome: BacktestOutcome) -> BacktestResponse:
+        prepared = outcome.prepared
+        return BacktestResponse(
+            status="success",
+            strategy_summary=self.strategy_summary(prepared),
+            backtest_period=self.backtest_period(prepared),
+            results=BacktestResults(
+                daily_pnl=self.build_daily_pnl(prepared.backtest_dates, outcome.pnl, outcome.underlying),
+                final_pnl=outcome.final_pnl,
+                win_rate=outcome.win_rate,
+                max_drawdown=outcome.max_drawdown,
+                position_closed=outcome.position_closed,
+                exit_reason=outcome.exit_reason
+            ),
+            execution_time_ms=int((time.perf_counter() - prepared.started_at) * 1000)
+        )
+
+    def build_columnar_response(self, outcome: BacktestOutcome) -> ColumnarBacktestResponse:
+        prepared = outcome.prepared
+        return ColumnarBacktestResponse(
+            status="success",
+            strategy_summary=self.strategy_summary(prepared),
+            backtest_period=self.backtest_period(prepared),
+            results=ColumnarBacktestResults(
+                daily_pnl=DailyPnLColumns(
+                    dates=prepared.backtest_dates,
+                    cumulative_pnl=outcome.pnl.tolist(),
+                    underlying_price=outcome.underlying.tolist()
                 ),
-                results=BacktestResults(
-                    daily_pnl=daily_pnl_data,
-                    final_pnl=final_pnl,
-                    win_rate=win_rate,
-                    max_drawdown=max_drawdown,
-                    position_closed=position_closed,
-                    exit_reason=exit_reason
+                final_pnl=outcome.final_pnl,
+                win_rate=outcome.win_rate,
+                max_drawdown=outcome.max_drawdown,
+                position_closed=outcome.position_closed,
+                exit_reason=outcome.exit_reason
+            ),
+            execution_time_ms=int((time.perf_counter() - prepared.started_at) * 1000)
+        )
+
+    def columnar_from_response(self, response: BacktestResponse) -> BacktestResponse:
+        # Columnar view of an already built response (e.g. one served from the result cache)
+        if response.results is None:
+            return response
+        results = response.results
+        return ColumnarBacktestResponse(
+            **response.model_dump(exclude={"results"}),
+            results=ColumnarBacktestResults(
+                daily_pnl=DailyPnLColumns(
+                    dates=[day.date for day in results.daily_pnl],
+                    cumulative_pnl=[day.cumulative_pnl for day in results.daily_pnl],
+                    underlying_price=[day.underlying_price for day in results.daily_pnl]
                 ),
-                execution_time_ms=execution_time_ms
+                **results.model_dump(exclude={"daily_pnl"})
             )
+        )
 
+    def iter_ndjson_events(
+        self,
+        request: BacktestRequest,
+        rows_per_chunk: int = NDJSON_ROWS_PER_CHUNK
+    ) -> Iterator[bytes]:
+        # The backtest as newline-delimited JSON, produced in stages so each chunk can be sent as
+        # soon as it exists: a summary line once the entry is resolved, then the daily rows, each
+        # chunk computed only when it is asked for, then a results line with the statistics
+        # accumulated along the way. Failures end the stream with an error line.
+        try:
+            prepared = self.prepare_backtest(request)
+            if isinstance(prepared, BacktestResponse):
+                yield encode_ndjson([self.error_event(prepared)])
+                return
+            yield encode_ndjson([{
+                "type": "summary",
+                "status": "success",
+                "strategy_summary": self.strategy_summary(prepared).model_dump(),
+                "backtest_period": self.backtest_period(prepared).model_dump()
+            }])
+
+            strategy = prepared.request.strategy
+            day_count = len(prepared.backtest_dates)
+            carried_pnl = 0.0
+            positive_days = 0
+            peak = -np.inf
+            drawdown = 0.0
+            position_closed, exit_reason = False, "backtest_end"
+            for start in range(0, day_count, rows_per_chunk):
+                dates = prepared.backtest_dates[start:start + rows_per_chunk]
+                first_code = prepared.first_code + start
+                with timed_stage("gather_prices"):
+                    prices, underlying = self.gather_series(
+                        prepared.options_repo, strategy, np.arange(first_code, first_code + len(dates), dtype=np.int64)
+                    )
+                with timed_stage("compute_pnl"):
+                    cumulative_pnl, position_closed, exit_reason = self.compute_pnl_chunk(
+                        strategy, dates, prices, underlying, prepared.entry_price, carried_pnl
+                    )
+                    carried_pnl = float(cumulative_pnl[-1])
+
+                with timed_stage("statistics"):
+                    rounded_pnl = self.round_series(cumulative_pnl)
+                    positive_days += int(np.count_nonzero(rounded_pnl > 0))
+                    running_peak = np.maximum(np.maximum.accumulate(rounded_pnl), peak)
+                    drawdown = max(drawdown, float(np.max(running_peak - rounded_pnl)))
+                    peak = float(running_peak[-1])
+
+                yield encode_ndjson(
+                    {"type": "daily_pnl", "date": date, "cumulative_pnl": pnl, "underlying_price": price}
+                    for date, pnl, price in zip(dates, rounded_pnl.tolist(), self.round_series(underlying).tolist())
+                )
+
+            yield encode_ndjson([{
+                "type": "results",
+                "final_pnl": round(carried_pnl, 2),
+                "win_rate": round((positive_days / day_count) * 100, 2),
+                "max_drawdown": round(-drawdown, 2),
+                "position_closed": position_closed,
+                "exit_reason": exit_reason,
+                "execution_time_ms": int((time.perf_counter() - prepared.started_at) * 1000)
+            }])
         except Exception as e:
-            return BacktestResponse(
-                status="error",
-                message=f"Internal server error during backtest execution: {str(e)}",
-                error_code="BACKTEST_FAILED"
-            )
+            yield encode_ndjson([self.error_event(self.failed_response(e))])
 
-    def calculate_pnl(
+    def compute_pnl_chunk(
+        self,
+        strategy: StrategyConfig,
+        dates: List[str],
+        prices: np.ndarray,
+        underlying: np.ndarray,
+        entry_price: float,
+        carried_pnl: float
+    ) -> Tuple[np.ndarray, bool, str]:
+        # compute_pnl_series over one chunk of the window. Days before the chunk's first quote hold
+        # the P/L carried from the previous chunk instead of starting from zero; only the window's
+        # last date can be the expiry, so only the last chunk settles.
+        cumulative_pnl, position_closed, exit_reason = self.compute_pnl_series(
+            strategy, dates, prices, underlying, entry_price
+        )
+        quoted = np.flatnonzero(~np.isnan(prices))
+        carried_days = quoted[0] if len(quoted) else len(dates)
+        if position_closed:
+            carried_days = min(carried_days, len(dates) - 1)
+        cumulative_pnl[:carried_days] = carried_pnl
+        return cumulative_pnl, position_closed, exit_reason
+
+    def error_event(self, response: BacktestResponse) -> Dict[str, Any]:
+        return {"type": "error", "status": "error", "message": response.message, "error_code": response.error_code}
+
+    def failed_response(self, error: Exception) -> BacktestResponse:
+        return BacktestResponse(
+            status="error",
+            message=f"Internal server error during backtest execution: {str(error)}",
+            error_code="BACKTEST_FAILED"
+        )
+
+    def gather_series(
         self,
         options_repo: OptionsRepository,
         strategy: StrategyConfig,
-        backtest_dates: List[str],
-        entry_price: float
-    ) -> Tuple[List[DailyPnL], float, bool, str]:
-        # Calculate daily mark-to-market P/L throughout the backtest period
-        CONTRACT_MULTIPLIER = 100
-        position_multiplier = 1 if strategy.position_direction == "buy" else -1
-
-        daily_pnl_data = []
-        cumulative_pnl = 0.0
-        position_closed = False
-        exit_reason = "backtest_end"
-
-        for date in backtest_dates:
-            current_price = options_repo.get_option_price(date, strategy.strike, strategy.expiry, strategy.option_type)
-            underlying_price = options_repo.get_underlying_price(date)
-
-            # Check if we've reached expiry
-            if date == strategy.expiry:
-                if strategy.option_type == "call":
-                    intrinsic_value = max(0, underlying_price - strategy.strike)
-                else:  # put
-                    intrinsic_value = max(0, strategy.strike - underlying_price)
-
-                settlement_pnl = (intrinsic_value - entry_price) * position_multiplier * CONTRACT_MULTIPLIER * strategy.quantity
-                cumulative_pnl = settlement_pnl
-                position_closed = True
-                exit_reason = "expiry"
-
-                daily_pnl_data.append(DailyPnL(
-                    date=date,
-                    cumulative_pnl=round(cumulative_pnl, 2),
-                    underlying_price=round(underlying_price, 2)
-                ))
-                break
-
-            # MTM P/L calculation
-            if current_price is not None:
-                daily_change = (current_price - entry_price) * position_multiplier * CONTRACT_MULTIPLIER * strategy.quantity
-                cumulative_pnl = daily_change
-
-            daily_pnl_data.append(DailyPnL(
-                date=date,
-                cumulative_pnl=round(cumulative_pnl, 2),
-                underlying_price=round(underlying_price, 2) if underlying_price else 0.0
-            ))
+        date_codes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Pull the option price and underlying series for the whole window in one indexed gather
+        store = options_repo.store
+        known = date_codes >= 0
+        prices = np.full(len(date_codes), np.nan, dtype=np.float64)
+        underlying = np.zeros(len(date_codes), dtype=np.float64)
+
+        contract_id = store.find_contract(strategy.strike, strategy.expiry, strategy.option_type)
+        if contract_id is not None:
+            prices[known] = store.gather_prices(contract_id, date_codes[known])
+        underlying[known] = store.underlying_by_date[date_codes[known]]
+        return prices, underlying
+
+    def compute_pnl_matrix(
+        self,
+        prices: np.ndarray,
+        lengths: np.ndarray,
+        entry_prices: np.ndarray,
+        position_multipliers: np.ndarray,
+        quantities: np.ndarray,
+        intrinsic_values: np.ndarray
+    ) -> np.ndarray:
+        # Mark-to-market P/L for many positions at once. Each row is one position over a shared date
+        # axis; days without a quote carry the previous value, a non-NaN intrinsic value settles the
+        # row on its last day, and columns past a row's length repeat its final value.
+        row_count, column_count = prices.shape
+        rows = np.arange(row_count)
+        columns = np.arange(column_count)
+
+        mtm = (
+            (prices - entry_prices[:, None]) * position_multipliers[:, None]
+            * CONTRACT_MULTIPLIER * quantities[:, None]
+        )
+        quoted = np.where(~np.isnan(mtm), columns, -1)
+        last_quoted = np.maximum.accumulate(quoted, axis=1) if column_count else quoted
+        cumulative_pnl = np.where(
+            last_quoted >= 0,
+            np.take_along_axis(mtm, np.maximum(last_quoted, 0), axis=1),
+            0.0
+        )
 
-        final_pnl = cumulative_pnl
-        return daily_pnl_data, round(final_pnl, 2), position_closed, exit_reason
+        last_columns = lengths - 1
+        settling = rows[~np.isnan(intrinsic_values)]
+        cumulative_pnl[settling, last_columns[settling]] = (
+            (intrinsic_values[settling] - entry_prices[settling]) * position_multipliers[settling]
+            * CONTRACT_MULTIPLIER * quantities[settling]
+        )
 
-    def calculate_win_rate(self, daily_pnl_data: List[DailyPnL]) -> float:
-        # Win rate = percentage of days where cumulative P/L was positive
-        if not daily_pnl_data:
-            return 0.0
+        final_values = cumulative_pnl[rows, last_columns]
+        return np.where(columns[None, :] < lengths[:, None], cumulative_pnl, final_values[:, None])
+
+    def intrinsic_values(self, option_types: List[str], strikes: np.ndarray, underlying_prices: np.ndarray) -> np.ndarray:
+        # Expiry settlement value per position
+        is_call = np.array([option_type == "call" for option_type in option_types], dtype=bool)
+        return np.where(
+            is_call,
+            np.maximum(0, underlying_prices - strikes),
+            np.maximum(0, strikes - underlying_prices)
+        )
 
-        positive_days = sum(1 for day in daily_pnl_data if day.cumulative_pnl > 0)
-        win_rate = (positive_days / len(daily_pnl_data)) * 100
+    def compute_pnl_series(
+        self,
+        strategy: StrategyConfig,
+        backtest_dates: List[str],
+        prices: np.ndarray,
+        underlying: np.ndarray,
+        entry_price: float
+    ) -> Tuple[np.ndarray, bool, str]:
+        # Single-position P/L series; reaching expiry settles at intrinsic value (dates never run past expiry)
+        if not backtest_dates:
+            return np.zeros(0, dtype=np.float64), False, "backtest_end"
+
+        position_closed = backtest_dates[-1] == strategy.expiry
+        intrinsic = np.array([np.nan], dtype=np.float64)
+        if position_closed:
+            intrinsic = self.intrinsic_values(
+                [strategy.option_type], np.array([strategy.strike], dtype=np.float64), underlying[-1:]
+            )
 
-        return round(win_rate, 2)
+        cumulative_pnl = self.compute_pnl_matrix(
+            prices[None, :],
+            np.array([len(backtest_dates)]),
+            np.array([entry_price], dtype=np.float64),
+            np.array([1 if strategy.position_direction == "buy" else -1]),
+            np.array([strategy.quantity]),
+            intrinsic
+        )[0]
+        return cumulative_pnl, position_closed, "expiry" if position_closed else "backtest_end"
+
+    def compute_rolling_entries(
+        self,
+        strategy: StrategyConfig,
+        backtest_dates: List[str],
+        prices: np.ndarray,
+        underlying: np.ndarray
+    ) -> RollingEntries:
+        # Statistics of every entry date from one price series, without a P/L series per entry.
+        # Held from a quoted day, a position's P/L on day j is scale * (value[j] - entry price), where
+        # value is the last quote carried forward (settled at intrinsic value on expiry) and scale holds
+        # the direction, quantity and contract multiplier. So the final P/L is a single subtraction, the
+        # max drawdown is the largest drop in the suffix of value after the entry (a running minimum
+        # and maximum from the end) and winning days are the later days whose value clears the entry
+        # price, counted with a Fenwick tree while walking backwards: O(n log n) overall. The window
+        # is never empty (resolve_window rejects that).
+        # That shortcut equals rounding each day's P/L first (as single backtests do) only while every
+        # P/L is a whole number of cents, i.e. every value in the suffix has at most four decimals.
+        # Entries whose suffix holds a finer value are recomputed from their own P/L series instead.
+        day_count = len(backtest_dates)
+        days = np.arange(day_count)
+        quoted = ~np.isnan(prices)
+        last_quoted = np.maximum.accumulate(np.where(quoted, days, -1))
+        values = np.where(last_quoted >= 0, prices[np.maximum(last_quoted, 0)], np.nan)
+
+        position_closed = backtest_dates[-1] == strategy.expiry
+        if position_closed:
+            values[-1] = self.intrinsic_values(
+                [strategy.option_type], np.array([strategy.strike], dtype=np.float64), underlying[-1:]
+            )[0]
+
+        positions = np.flatnonzero(quoted)
+        entry_prices = prices[positions]
+        direction = 1 if strategy.position_direction == "buy" else -1
+        scale = CONTRACT_MULTIPLIER * strategy.quantity
+        total_days = day_count - positions
+
+        # Same operation order as compute_pnl_matrix, so final figures match single backtests exactly
+        final_pnl = (values[-1] - entry_prices) * direction * CONTRACT_MULTIPLIER * strategy.quantity
+
+        # Signed values rise when the position gains, so drawdowns are drops and wins are rises in them.
+        # Days before the first quote precede every entry and never enter a suffix statistic.
+        signed = np.where(np.isnan(values), 0.0, values) * direction
+        suffix_min = np.minimum.accumulate(signed[::-1])[::-1]
+        suffix_drop = np.maximum.accumulate((signed - suffix_min)[::-1])[::-1]
+        max_drawdown = -suffix_drop[positions] * scale
+
+        # A day counts as a win once its P/L rounds to at least one cent
+        thresholds = entry_prices * direction + 0.005 / scale
+        winning_days = self.suffix_counts_at_least(signed, positions, thresholds)
+        win_rate = winning_days / total_days * 100
+
+        scaled = values * 10_000
+        off_grid = np.abs(scaled - np.round(scaled)) > 1e-4
+        inexact = np.logical_or.accumulate(off_grid[::-1])[::-1][positions]
+        if inexact.any():
+            win_rate[inexact], max_drawdown[inexact] = self.exact_rolling_statistics(
+                strategy, prices, values[-1] if position_closed else np.nan, positions[inexact]
+            )
 
-    def calculate_max_drawdown(self, daily_pnl_data: List[DailyPnL]) -> float:
-        # Max drawdown = largest peak-to-trough decline in cumulative P/L
-        if not daily_pnl_data:
-            return 0.0
+        return RollingEntries(
+            positions=positions,
+            entry_prices=entry_prices,
+            total_days=total_days,
+            final_pnl=final_pnl,
+            win_rate=win_rate,
+            max_drawdown=max_drawdown,
+            position_closed=position_closed,
+            exit_reason="expiry" if position_closed else "backtest_end"
+        )
 
-        peak = float('-inf')
-        max_drawdown = 0.0
+    def exact_rolling_statistics(
+        self,
+        strategy: StrategyConfig,
+        prices: np.ndarray,
+        settlement: float,
+        positions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Win rate and max drawdown of the given entries from their rounded P/L series, the way a
+        # single backtest opened on each entry date computes them. Rows are built in blocks of at
+        # most ROLLING_EXACT_MAX_CELLS prices; a NaN settlement leaves positions open.
+        day_count = len(prices)
+        win_rate = np.zeros(len(positions), dtype=np.float64)
+        max_drawdown = np.zeros(len(positions), dtype=np.float64)
+        rows_per_block = max(1, ROLLING_EXACT_MAX_CELLS // day_count)
+        direction = 1 if strategy.position_direction == "buy" else -1
+
+        for start in range(0, len(positions), rows_per_block):
+            block = positions[start:start + rows_per_block]
+            lengths = day_count - block
+            columns = block[:, None] + np.arange(int(lengths.max()))[None, :]
+            shifted = np.where(columns < day_count, prices[np.minimum(columns, day_count - 1)], np.nan)
+            pnl = self.round_series(self.compute_pnl_matrix(
+                shifted,
+                lengths,
+                prices[block],
+                np.full(len(block), direction),
+                np.full(len(block), strategy.quantity),
+                np.full(len(block), settlement, dtype=np.float64)
+            ))
+            win_rate[start:start + len(block)] = self.win_rate_matrix(pnl, lengths)
+            max_drawdown[start:start + len(block)] = self.max_drawdown_matrix(pnl)
+        return win_rate, max_drawdown
+
+    def suffix_counts_at_least(self, values: np.ndarray, positions: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+        # For each position p (ascending), how many of values[p:] are >= its threshold. Values are
+        # added to a Fenwick tree over their sorted ranks from the end, so each query sees its suffix.
+        ordered = np.sort(values)
+        ranks = (np.searchsorted(ordered, values, side="left") + 1).tolist()
+        below = np.searchsorted(ordered, thresholds, side="left").tolist()
+        tree = [0] * (len(values) + 1)
+        counts = [0] * len(positions)
+
+        added = 0
+        next_value = len(values) - 1
+        for query in range(len(positions) - 1, -1, -1):
+            while next_value >= positions[query]:
+                index = ranks[next_value]
+                while index < len(tree):
+                    tree[index] += 1
+                    index += index & -index
+                added += 1
+                next_value -= 1
+            smaller, index = 0, below[query]
+            while index > 0:
+                smaller += tree[index]
+                index -= index & -index
+            counts[query] = added - smaller
+        return np.array(counts, dtype=np.float64)
+
+    def build_rolling_results(self, backtest_dates: List[str], entries: RollingEntries) -> RollingBacktestResults:
+        final_pnl = self.round_series(entries.final_pnl)
+        win_rate = self.round_series(entries.win_rate)
+        max_drawdown = self.round_series(entries.max_drawdown)
+        entry_dates = [backtest_dates[position] for position in entries.positions.tolist()]
+        profitable_entries = int(np.count_nonzero(final_pnl > 0))
+
+        return RollingBacktestResults(
+            entries=[
+                RollingEntryResult(
+                    entry_date=entry_date,
+                    entry_price=entry_price,
+                    total_days=total_days,
+                    final_pnl=entry_pnl,
+                    win_rate=entry_win_rate,
+                    max_drawdown=entry_drawdown
+                )
+                for entry_date, entry_price, total_days, entry_pnl, entry_win_rate, entry_drawdown in zip(
+                    entry_dates, entries.entry_prices.tolist(), entries.total_days.tolist(),
+                    final_pnl.tolist(), win_rate.tolist(), max_drawdown.tolist()
+                )
+            ],
+            summary=RollingBacktestSummary(
+                entries_tested=len(entry_dates),
+                entries_skipped=len(backtest_dates) - len(entry_dates),
+                profitable_entries=profitable_entries,
+                profitable_pct=round(profitable_entries / len(entry_dates) * 100, 2),
+                best_entry_date=entry_dates[int(np.argmax(final_pnl))],
+                worst_entry_date=entry_dates[int(np.argmin(final_pnl))],
+                final_pnl=self.distribution_summary(final_pnl),
+                win_rate=self.distribution_summary(win_rate),
+                max_drawdown=self.distribution_summary(max_drawdown)
+            ),
+            position_closed=entries.position_closed,
+            exit_reason=entries.exit_reason
+        )
+
+    def distribution_summary(self, values: np.ndarray) -> DistributionSummary:
+        # Adding zero turns -0.0 (e.g. a drawdown of nothing) into 0.0
+        values = values + 0.0
+        p5, p25, median, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95]).tolist()
+        return DistributionSummary(
+            count=len(values),
+            mean=round(float(np.mean(values)), 2),
+            std=round(float(np.std(values)), 2),
+            min=round(float(np.min(values)), 2),
+            p5=round(p5, 2),
+            p25=round(p25, 2),
+            median=round(median, 2),
+            p75=round(p75, 2),
+            p95=round(p95, 2),
+            max=round(float(np.max(values)), 2)
+        )
 
-        for day in daily_pnl_data:
-            pnl = day.cumulative_pnl
+    def round_series(self, values: np.ndarray) -> np.ndarray:
+        # Round to cents exactly as Python's round() does. np.round only disagrees on values sitting
+        # within float error of a half cent, so those few are re-rounded one by one.
+        rounded = np.round(values, 2)
+        scaled = values * 100
+        ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 + 1e-12 * np.abs(scaled)
+        if ambiguous.any():
+            rounded[ambiguous] = [round(value, 2) for value in values[ambiguous].tolist()]
+        return rounded
+
+    def build_daily_pnl(self, backtest_dates: List[str], pnl: np.ndarray, underlying: np.ndarray) -> List[DailyPnL]:
+        # Response objects are only created once all numbers are final
+        return [
+            DailyPnL(date=date, cumulative_pnl=cumulative_pnl, underlying_price=underlying_price)
+            for date, cumulative_pnl, underlying_price in zip(backtest_dates, pnl.tolist(), underlying.tolist())
+        ]
 
-            if pnl > peak:
-                peak = pnl
+    def calculate_pnl(
+        self,
+        options_repo: OptionsRepository,
+        strategy: StrategyConfig,
+        backtest_dates: List[str],
+        entry_price: float
+    ) -> Tuple[List[DailyPnL], float, bool, str]:
+        # Calculate daily mark-to-market P/L throughout the backtest period
+        date_codes = np.array(
+            [options_repo.store.date_lookup.get(date, -1) for date in backtest_dates],
+            dtype=np.int64
+        )
+        prices, underlying = self.gather_series(options_repo, strategy, date_codes)
+        cumulative_pnl, position_closed, exit_reason = self.compute_pnl_series(
+            strategy, backtest_dates, prices, underlying, entry_price
+        )
 
-            drawdown = peak - pnl
+        final_pnl = round(float(cumulative_pnl[-1]), 2) if len(cumulative_pnl) else 0.0
+        daily_pnl_data = self.build_daily_pnl(
+            backtest_dates, self.round_series(cumulative_pnl), self.round_series(underlying)
+        )
+        return daily_pnl_data, final_pnl, position_closed, exit_reason
+
+    def win_rate_matrix(self, pnl: np.ndarray, lengths: np.ndarray) -> List[float]:
+        # Win rate per row = percentage of in-window days where cumulative P/L was positive
+        in_window = np.arange(pnl.shape[1])[None, :] < lengths[:, None]
+        positive_days = np.count_nonzero((pnl > 0) & in_window, axis=1)
+        return [
+            round((days / length) * 100, 2) if length else 0.0
+            for days, length in zip(positive_days.tolist(), lengths.tolist())
+        ]
+
+    def max_drawdown_matrix(self, pnl: np.ndarray) -> List[float]:
+        # Max drawdown per row = largest peak-to-trough decline (padding repeats the last value, so it adds none)
+        if pnl.shape[1] == 0:
+            return [0.0] * pnl.shape[0]
+        drawdowns = np.max(np.maximum.accumulate(pnl, axis=1) - pnl, axis=1)
+        return [round(-drawdown, 2) for drawdown in drawdowns.tolist()]
+
+    def win_rate_from_series(self, pnl: np.ndarray) -> float:
+        return self.win_rate_matrix(pnl[None, :], np.array([len(pnl)]))[0]
+
+    def max_drawdown_from_series(self, pnl: np.ndarray) -> float:
+        return self.max_drawdown_matrix(pnl[None, :])[0]
 
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+    def calculate_win_rate(self, daily_pnl_data: List[DailyPnL]) -> float:
+        return self.win_rate_from_series(np.array([day.cumulative_pnl for day in daily_pnl_data], dtype=np.float64))
 
-        return round(-max_drawdown, 2)
+    def calculate_max_drawdown(self, daily_pnl_data: List[DailyPnL]) -> float:
+        return self.max_drawdown_from_series(np.array([day.cumulative_pnl for day in daily_pnl_data], dtype=np.float64))
@@ -0,0 +1,80 @@
+import threading
+from typing import Any, Callable, Dict
+from repositories.dataset_repository import DatasetRepository
+from services.analytics_service import OptionAnalyticsService
+from services.backtest_service import BacktestService
+from services.dataset_service import DatasetService
+from services.job_service import JobManager
+from services.multileg_service import MultiLegBacktestService
+from services.result_cache import backtest_result_cache
+from services.sweep_service import SweepService
+from services.upload_service import UploadService
+from services.warmup_service import WARMUP_DATASETS, WarmupService, parse_warmup_datasets
+
+
+class ServiceContainer:
+    # Builds each service the first time a request needs it (importing the controllers does no
+    # work) and hands the same instance to every controller. Services that own worker threads or
+    # processes are shut down with the application.
+
+    def __init__(self, data_dir: str = "data", warmup_datasets: str = WARMUP_DATASETS):
+        self.data_dir = data_dir
+        self.warmup_datasets = warmup_datasets
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = factory()
+                    self._instances[name] = instance
+        return instance
+
+    def dataset_repo(self) -> DatasetRepository:
+        return self._get("dataset_repo", lambda: DatasetRepository(self.data_dir))
+
+    def backtest_service(self) -> BacktestService:
+        return self._get("backtest_service", lambda: BacktestService(self.dataset_repo(), backtest_result_cache))
+
+    def analytics_service(self) -> OptionAnalyticsService:
+        return self._get("analytics_service", lambda: OptionAnalyticsService(self.dataset_repo()))
+
+    def multileg_service(self) -> MultiLegBacktestService:
+        return self._get(
+            "multileg_service",
+            lambda: MultiLegBacktestService(self.dataset_repo(), self.backtest_service())
+        )
+
+    def sweep_service(self) -> SweepService:
+        return self._get("sweep_service", lambda: SweepService(self.dataset_repo(), self.backtest_service()))
+
+    def dataset_service(self) -> DatasetService:
+        return self._get("dataset_service", lambda: DatasetService(self.dataset_repo()))
+
+    def upload_service(self) -> UploadService:
+        return self._get("upload_service", lambda: UploadService(self.dataset_repo()))
+
+    def job_manager(self) -> JobManager:
+        return self._get("job_manager", JobManager)
+
+    def warmup_service(self) -> WarmupService:
+        return self._get(
+            "warmup_service",
+            lambda: WarmupService(self.dataset_repo(), parse_warmup_datasets(self.warmup_datasets))
+        )
+
+    def shutdown(self) -> None:
+        # Stop background work of the services that were created; the rest never started any
+        with self._lock:
+            instances = dict(self._instances)
+        if "warmup_service" in instances:
+            instances["warmup_service"].stop()
+        for name in ("job_manager", "upload_service", "sweep_service"):
+            if name in instances:
+                instances[name].shutdown()
+
+
+container = ServiceContainer()
@@ -1,7 +1,6 @@
 from typing import Optional
-from models.options import DatasetListResponse, DatasetMetadataResponse
+from models.options import DatasetListResponse, DatasetMetadataResponse, DatasetCacheStats
 from repositories.dataset_repository import DatasetRepository
-from repositories.options_repository import OptionsRepository
 
 
 class DatasetService:
@@ -14,20 +13,20 @@ class DatasetService:
         return DatasetListResponse(datasets=datasets, total_count=len(datasets))
 
     def get_dataset_metadata(self, dataset_name: str) -> Optional[DatasetMetadataResponse]:
-        # Load detailed metadata including all available strikes and expiries
+        # Detailed metadata including all available strikes and expiries, served from the catalog sidecar
         # This is used when user selects a dataset to populate form options
-        dataset = self.dataset_repo.load_dataset(dataset_name)
-        if not dataset:
+        entry = self.dataset_repo.get_catalog_entry(dataset_name)
+        if not entry:
             return None
 
-        options_repo = OptionsRepository(dataset)
-        available_expiries = options_repo.get_available_expiries()
-        available_strikes = options_repo.get_all_strikes_by_expiry()
-
         return DatasetMetadataResponse(
-            name=dataset.metadata.dataset_name,
-            date_range=dataset.metadata.date_range,
-            available_expiries=available_expiries,
-            available_strikes=available_strikes,
-            record_count=dataset.metadata.record_count
+            name=entry.metadata.dataset_name,
+            date_range=entry.metadata.date_range,
+            available_expiries=entry.expiries,
+            available_strikes=entry.strikes_by_expiry,
+            record_count=entry.metadata.record_count
         )
+
+    def get_cache_stats(self) -> DatasetCacheStats:
+        # Hit/miss/eviction counters of the shared dataset cache, plus the shared-export references this process holds
+        return DatasetCacheStats(**self.dataset_repo.cache.stats(), **self.dataset_repo.shared.stats())
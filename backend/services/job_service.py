@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from models.job import JobStatusResponse
+from services.backtest_service import BacktestCancelled, ProgressCallback
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_QUEUE_DEPTH = int(os.getenv("JOB_MAX_QUEUE_DEPTH", "32"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "600"))
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class Job:
+    job_id: str
+    created_at: str = field(default_factory=_now_iso)
+    status: str = "queued"
+    stage: Optional[str] = None
+    progress: float = 0.0
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    finished_monotonic: Optional[float] = None
+    result: Any = None
+    message: Optional[str] = None
+    error_code: Optional[str] = None
+    # Bumped on every change so event streams can tell when there is something new to send
+    version: int = 0
+    cancel_requested: threading.Event = field(default_factory=threading.Event)
+    future: Optional[Future] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_status(self) -> JobStatusResponse:
+        return JobStatusResponse(
+            job_id=self.job_id,
+            status=self.status,
+            stage=self.stage,
+            progress=self.progress,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            message=self.message,
+            error_code=self.error_code
+        )
+
+
+class JobManager:
+    # In-process job runner: a bounded thread pool, a cap on queued + running jobs and a TTL on
+    # finished results. Needs no external broker, so it works on a single box.
+
+    def __init__(
+        self,
+        max_workers: int = JOB_WORKERS,
+        max_queue_depth: int = JOB_MAX_QUEUE_DEPTH,
+        result_ttl_seconds: float = JOB_RESULT_TTL_SECONDS
+    ):
+        self.max_queue_depth = max_queue_depth
+        self.result_ttl_seconds = result_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="backtest-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, task: Callable[[ProgressCallback], Any]) -> Job:
+        # Queue a task; it receives a progress callback that also aborts the task once cancelled
+        self.purge_expired()
+
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if not job.is_finished)
+            if active >= self.max_queue_depth:
+                raise JobQueueFullError(f"Job queue is full ({active} active jobs)")
+
+            job = Job(job_id=uuid.uuid4().hex)
+            self._jobs[job.job_id] = job
+            job.future = self._executor.submit(self._run, job, task)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None or job.is_finished:
+            return job
+
+        job.cancel_requested.set()
+        # A job that has not started yet can be dropped from the pool queue straight away
+        if job.future is not None and job.future.cancel():
+            self._finish(job, "cancelled", message="Job cancelled before it started")
+        return job
+
+    def purge_expired(self) -> None:
+        # Forget finished jobs (and their results) once their TTL has passed
+        cutoff = time.monotonic() - self.result_ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_monotonic is not None and job.finished_monotonic < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs.values()):
+            job.cancel_requested.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, task: Callable[[ProgressCallback], Any]) -> None:
+        if job.cancel_requested.is_set():
+            self._finish(job, "cancelled", message="Job cancelled before it started")
+            return
+
+        self._update(job, status="running", started_at=_now_iso(), stage="starting")
+
+        def report_progress(stage: str, fraction: float) -> None:
+            if job.cancel_requested.is_set():
+                raise BacktestCancelled()
+            self._update(job, stage=stage, progress=max(job.progress, min(fraction, 1.0)))
+
+        try:
+            result = task(report_progress)
+        except BacktestCancelled:
+            self._finish(job, "cancelled", message="Job cancelled while running")
+            return
+        except Exception as e:
+            self._finish(job, "failed", message=f"Job failed: {str(e)}", error_code="JOB_FAILED")
+            return
+
+        # Tasks report their own domain errors (e.g. DATASET_NOT_FOUND) inside the result
+        self._finish(job, "succeeded", result=result, progress=1.0, stage="done")
+
+    def _update(self, job: Job, **changes: Any) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.version += 1
+
+    def _finish(self, job: Job, status: str, **changes: Any) -> None:
+        self._update(
+            job,
+            status=status,
+            finished_at=_now_iso(),
+            finished_monotonic=time.monotonic(),
+            **changes
+        )
@@ -0,0 +1,12 @@
+from typing import Any, Iterable
+import orjson
+
+
+def encode_json(payload: Any) -> bytes:
+    # Compact JSON for plain dicts/lists and NumPy arrays
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def encode_ndjson(rows: Iterable[Any]) -> bytes:
+    # One JSON document per line, each terminated by a newline
+    return b"".join(encode_json(row) + b"\n" for row in rows)
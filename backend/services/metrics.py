@@ -0,0 +1,128 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bounds in seconds, from sub-millisecond lookups to multi-second dataset loads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    # Monotonically increasing count per label combination
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    # Cumulative bucket counts, sum and count per label combination, as Prometheus expects them
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: [count per bucket (last one is +Inf)], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[label_values] = series
+            series[0][slot] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total[0]) for labels, (counts, total) in self._series.items())
+        for label_values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    # In-process metrics rendered in the Prometheus text exposition format. Each worker process
+    # keeps its own registry, so scrape every worker (or run one) to see all requests.
+
+    def __init__(self):
+        self._metrics: List[object] = []
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help_text, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, help_text, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+metrics = MetricsRegistry()
+
+http_requests_total = metrics.counter(
+    "backtester_http_requests_total", "HTTP requests handled, by route and status code", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics.histogram(
+    "backtester_http_request_duration_seconds", "Time to produce an HTTP response, by route", ("method", "route")
+)
+stage_duration_seconds = metrics.histogram(
+    "backtester_stage_duration_seconds", "Time spent in each stage of request handling", ("stage",)
+)
@@ -0,0 +1,175 @@
+import time
+from bisect import bisect_right
+from typing import List, Tuple
+import numpy as np
+from models.backtest import BacktestPeriod, BacktestResponse, BacktestResults
+from models.multileg import (
+    LegSummary, MultiLegBacktestRequest, MultiLegBacktestResponse, MultiLegStrategySummary, StrategyLeg
+)
+from repositories.columnar_store import OptionsStoreBase
+from repositories.dataset_repository import DatasetRepository
+from services.backtest_service import CONTRACT_MULTIPLIER, BacktestService
+from services.timing import timed_stage
+
+
+class MultiLegBacktestService:
+    # Backtests of strategies made of several legs (spreads, straddles, condors). Every leg's price
+    # series comes from one gather over the store, so the cost barely grows with the number of legs.
+
+    def __init__(self, dataset_repo: DatasetRepository, backtest_service: BacktestService = None):
+        self.dataset_repo = dataset_repo
+        self.backtest_service = backtest_service or BacktestService(dataset_repo)
+
+    def execute_backtest(self, request: MultiLegBacktestRequest) -> MultiLegBacktestResponse:
+        # Open every leg on the first trading day of the range and mark the combined position to market
+        # until the range ends or the last leg expires; each leg settles at intrinsic value on its expiry
+        started_at = time.perf_counter()
+        strategy = request.strategy
+        try:
+            last_expiry = max(leg.expiry for leg in strategy.legs)
+            window = self.backtest_service.resolve_window(
+                strategy.dataset_name, request.date_range.start_date, min(request.date_range.end_date, last_expiry)
+            )
+            if isinstance(window, BacktestResponse):
+                return MultiLegBacktestResponse(status="error", message=window.message, error_code=window.error_code)
+            options_repo, backtest_dates, first_code, end_code = window
+
+            expired = [number for number, leg in enumerate(strategy.legs, start=1) if leg.expiry < backtest_dates[0]]
+            if expired:
+                return MultiLegBacktestResponse(
+                    status="error",
+                    message=f"Leg {expired[0]} ({self.describe_leg(strategy.legs[expired[0] - 1])}) "
+                            f"expires before entry date {backtest_dates[0]}",
+                    error_code="INVALID_EXPIRY"
+                )
+
+            with timed_stage("gather_prices"):
+                prices, underlying = self.gather_legs(
+                    options_repo.store, strategy.legs, np.arange(first_code, end_code, dtype=np.int64)
+                )
+
+            entry_prices = prices[:, 0]
+            missing = np.flatnonzero(np.isnan(entry_prices))
+            if len(missing):
+                leg = strategy.legs[missing[0]]
+                return MultiLegBacktestResponse(
+                    status="error",
+                    message=f"No pricing data for leg {missing[0] + 1} ({self.describe_leg(leg)}) "
+                            f"on entry date {backtest_dates[0]}",
+                    error_code="NO_PRICING_DATA"
+                )
+
+            with timed_stage("compute_pnl"):
+                leg_pnl, settled = self.compute_leg_pnl(strategy.legs, backtest_dates, prices, underlying)
+                cumulative_pnl = leg_pnl.sum(axis=0)
+
+            service = self.backtest_service
+            with timed_stage("statistics"):
+                rounded_pnl = service.round_series(cumulative_pnl)
+                position_closed = bool(settled.all())
+                results = BacktestResults(
+                    daily_pnl=service.build_daily_pnl(backtest_dates, rounded_pnl, service.round_series(underlying)),
+                    final_pnl=round(float(cumulative_pnl[-1]), 2),
+                    win_rate=service.win_rate_from_series(rounded_pnl),
+                    max_drawdown=service.max_drawdown_from_series(rounded_pnl),
+                    position_closed=position_closed,
+                    exit_reason="expiry" if position_closed else "backtest_end"
+                )
+
+            with timed_stage("build_response"):
+                return MultiLegBacktestResponse(
+                    status="success",
+                    strategy_summary=self.strategy_summary(
+                        strategy.legs, backtest_dates[0], entry_prices, leg_pnl[:, -1], settled
+                    ),
+                    backtest_period=BacktestPeriod(
+                        start_date=request.date_range.start_date,
+                        end_date=backtest_dates[-1],
+                        total_days=len(backtest_dates)
+                    ),
+                    results=results,
+                    execution_time_ms=int((time.perf_counter() - started_at) * 1000)
+                )
+        except Exception as e:
+            failed = self.backtest_service.failed_response(e)
+            return MultiLegBacktestResponse(status="error", message=failed.message, error_code=failed.error_code)
+
+    def gather_legs(
+        self,
+        store: OptionsStoreBase,
+        legs: List[StrategyLeg],
+        date_codes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # One (leg x date) price matrix from a single gather; legs whose contract is not in the
+        # dataset keep a row of NaN
+        prices = np.full((len(legs), len(date_codes)), np.nan, dtype=np.float64)
+        contract_ids = [store.find_contract(leg.strike, leg.expiry, leg.option_type) for leg in legs]
+        found = [row for row, contract_id in enumerate(contract_ids) if contract_id is not None]
+        if found:
+            prices[found] = store.gather_matrix(
+                np.array([contract_ids[row] for row in found], dtype=np.int64), date_codes
+            )
+        return prices, store.underlying_by_date[date_codes].astype(np.float64)
+
+    def compute_leg_pnl(
+        self,
+        legs: List[StrategyLeg],
+        backtest_dates: List[str],
+        prices: np.ndarray,
+        underlying: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # P/L of every leg on the shared date axis. A leg's row ends on its last trading day on or
+        # before its expiry, settles there if that day is the expiry, and holds its final value after.
+        # Returns the (leg x date) P/L and whether each leg settled.
+        lengths = np.array([bisect_right(backtest_dates, leg.expiry) for leg in legs], dtype=np.int64)
+        settled = np.array([
+            length > 0 and backtest_dates[length - 1] == leg.expiry for leg, length in zip(legs, lengths.tolist())
+        ], dtype=bool)
+
+        intrinsic = np.full(len(legs), np.nan, dtype=np.float64)
+        if settled.any():
+            intrinsic[settled] = self.backtest_service.intrinsic_values(
+                [leg.option_type for leg, closes in zip(legs, settled.tolist()) if closes],
+                np.array([leg.strike for leg in legs], dtype=np.float64)[settled],
+                underlying[lengths[settled] - 1]
+            )
+
+        leg_pnl = self.backtest_service.compute_pnl_matrix(
+            prices,
+            lengths,
+            prices[:, 0],
+            np.array([1 if leg.position_direction == "buy" else -1 for leg in legs]),
+            np.array([leg.quantity for leg in legs]),
+            intrinsic
+        )
+        return leg_pnl, settled
+
+    def strategy_summary(
+        self,
+        legs: List[StrategyLeg],
+        entry_date: str,
+        entry_prices: np.ndarray,
+        final_pnl: np.ndarray,
+        settled: np.ndarray
+    ) -> MultiLegStrategySummary:
+        directions = np.array([1 if leg.position_direction == "buy" else -1 for leg in legs])
+        quantities = np.array([leg.quantity for leg in legs])
+        entry_cost = float(np.sum(entry_prices * directions * quantities)) * CONTRACT_MULTIPLIER
+        return MultiLegStrategySummary(
+            entry_date=entry_date,
+            entry_cost=round(entry_cost, 2),
+            legs=[
+                LegSummary(
+                    **leg.model_dump(),
+                    entry_price=entry_price,
+                    final_pnl=round(leg_pnl, 2),
+                    position_closed=closes
+                )
+                for leg, entry_price, leg_pnl, closes in zip(
+                    legs, entry_prices.tolist(), final_pnl.tolist(), settled.tolist()
+                )
+            ]
+        )
+
+    def describe_leg(self, leg: StrategyLeg) -> str:
+        return f"{leg.position_direction} {leg.quantity} {leg.option_type} {leg.strike:g} {leg.expiry}"
@@ -0,0 +1,134 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from services.timing import record_stage
+
+REQUEST_EXECUTOR_WORKERS = int(os.getenv("REQUEST_EXECUTOR_WORKERS", "4"))
+REQUEST_EXECUTOR_MAX_QUEUE = int(os.getenv("REQUEST_EXECUTOR_MAX_QUEUE", "64"))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "30"))
+
+
+class ExecutorSaturatedError(Exception):
+    pass
+
+
+class ExecutorTimeoutError(Exception):
+    pass
+
+
+class DurationStats:
+    # Running count / total / max of a duration in milliseconds
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3)
+        }
+
+
+class RequestExecutor:
+    # Runs blocking service calls off the event loop on a fixed-size thread pool. At most
+    # max_workers calls run at once and at most max_queue more wait; beyond that callers are
+    # rejected straight away. Time spent waiting for a worker and time spent running are
+    # recorded separately.
+
+    def __init__(
+        self,
+        max_workers: int = REQUEST_EXECUTOR_WORKERS,
+        max_queue: int = REQUEST_EXECUTOR_MAX_QUEUE,
+        timeout_seconds: float = REQUEST_TIMEOUT_SECONDS
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="request-worker")
+        self._lock = threading.Lock()
+
+        self._waiting = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.queue_wait = DurationStats()
+        self.execution = DurationStats()
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # Await func(*args, **kwargs) on the pool, subject to the concurrency limit and timeout
+        with self._lock:
+            if self._waiting + self._running >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Server is busy ({self._running} running, {self._waiting} waiting)"
+                )
+            self._waiting += 1
+
+        submitted_at = time.monotonic()
+        # Run in the caller's context so stage timers reach the request that submitted the call
+        context = contextvars.copy_context()
+
+        def task() -> Any:
+            started_at = time.monotonic()
+            with self._lock:
+                self._waiting -= 1
+                self._running += 1
+                self.queue_wait.record((started_at - submitted_at) * 1000)
+            try:
+                context.run(record_stage, "executor_wait", started_at - submitted_at)
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.completed += 1
+                    self.execution.record((time.monotonic() - started_at) * 1000)
+
+        future = self._pool.submit(task)
+        # A timeout, a cancelled caller (e.g. a disconnected stream) or shutdown cancels the future.
+        # That only succeeds while it is still queued, in which case task never runs to release its
+        # place; a call that already started keeps its worker until it returns.
+        future.add_done_callback(self._release_if_cancelled)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise ExecutorTimeoutError(f"Request did not complete within {self.timeout_seconds:g} seconds")
+
+    def _release_if_cancelled(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self._waiting -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout_seconds,
+                "running": self._running,
+                "waiting": self._waiting,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "queue_wait": self.queue_wait.to_dict(),
+                "execution": self.execution.to_dict()
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+request_executor = RequestExecutor()
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from models.backtest import BacktestRequest, BacktestResponse
+
+BACKTEST_CACHE_MAX_ENTRIES = int(os.getenv("BACKTEST_CACHE_MAX_ENTRIES", "256"))
+BACKTEST_CACHE_DB = os.getenv("BACKTEST_CACHE_DB")
+BACKTEST_CACHE_DB_MAX_ENTRIES = int(os.getenv("BACKTEST_CACHE_DB_MAX_ENTRIES", "10000"))
+
+# How many disk writes happen between prunes of the on-disk tier
+_PRUNE_INTERVAL = 100
+
+
+def backtest_cache_key(request: BacktestRequest, dataset_version: str) -> str:
+    # Content address of a backtest: canonical JSON of the request plus the dataset file version
+    canonical = json.dumps(request.model_dump(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{canonical}|{dataset_version}".encode("utf-8")).hexdigest()
+
+
+class BacktestResultCache:
+    # Two-tier memo of successful backtest responses: an in-memory LRU in front of an optional
+    # SQLite file that survives restarts. Keys already include the dataset version, so editing a
+    # dataset makes old entries unreachable rather than needing explicit invalidation.
+
+    def __init__(
+        self,
+        max_entries: int = BACKTEST_CACHE_MAX_ENTRIES,
+        db_path: Optional[str] = BACKTEST_CACHE_DB,
+        db_max_entries: int = BACKTEST_CACHE_DB_MAX_ENTRIES
+    ):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+        self._entries: "OrderedDict[str, BacktestResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS backtest_results ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS backtest_results_created ON backtest_results (created_at)"
+                )
+
+    def get(self, key: str) -> Optional[BacktestResponse]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return response
+
+        response = self._read_disk(key)
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, response)
+        return response
+
+    def put(self, key: str, response: BacktestResponse) -> None:
+        self._remember(key, response)
+        self._write_disk(key, response)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM backtest_results")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": bool(self.db_path)
+            }
+
+    def _remember(self, key: str, response: BacktestResponse) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps the cache safe to use from any thread
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _read_disk(self, key: str) -> Optional[BacktestResponse]:
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT response FROM backtest_results WHERE key = ?", (key,)).fetchone()
+            return BacktestResponse.model_validate_json(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            # A broken disk tier degrades to a cache miss
+            print(f"Error reading backtest result cache: {e}")
+            return None
+
+    def _write_disk(self, key: str, response: BacktestResponse) -> None:
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO backtest_results (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response.model_dump_json(), time.time())
+                )
+                with self._lock:
+                    self._writes_since_prune += 1
+                    prune = self._writes_since_prune >= _PRUNE_INTERVAL
+                    if prune:
+                        self._writes_since_prune = 0
+                if prune:
+                    conn.execute(
+                        "DELETE FROM backtest_results WHERE key NOT IN ("
+                        "SELECT key FROM backtest_results ORDER BY created_at DESC LIMIT ?)",
+                        (self.db_max_entries,)
+                    )
+        except sqlite3.Error as e:
+            print(f"Error writing backtest result cache: {e}")
+
+
+backtest_result_cache = BacktestResultCache()
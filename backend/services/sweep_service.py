@@ -0,0 +1,347 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+import numpy as np
+from models.backtest import DateRange, DailyPnLColumns
+from models.strategy import StrategyConfig
+from models.sweep import ColumnarSweepResponse, ColumnarSweepResult, SweepRequest, SweepResponse, SweepResult
+from repositories.columnar_store import OptionsStoreBase, get_columnar_store
+from repositories.dataset_repository import DatasetRepository, open_mapped_dataset
+from repositories.options_repository import OptionsRepository
+from services.backtest_service import BacktestService
+from services.timing import timed_stage
+
+MAX_SWEEP_COMBINATIONS = int(os.getenv("SWEEP_MAX_COMBINATIONS", "20000"))
+SWEEP_WORKERS = int(os.getenv("SWEEP_WORKERS", os.cpu_count() or 1))
+SWEEP_CHUNK_SIZE = int(os.getenv("SWEEP_CHUNK_SIZE", "2000"))
+
+# Stores opened inside pool workers, keyed by binary file path and version
+_worker_stores: Dict[Tuple[str, int, int], OptionsStoreBase] = {}
+
+
+def _evaluate_chunk(
+    binary_path: str,
+    combinations: List[StrategyConfig],
+    date_range: DateRange,
+    include_daily_pnl: bool,
+    columnar: bool = False
+) -> List[SweepResult]:
+    # Runs in a pool worker: memory-map the dataset (once per worker and file version) and
+    # evaluate one slice of the grid with exactly the same code as the in-process path
+    stat = os.stat(binary_path)
+    key = (binary_path, stat.st_mtime_ns, stat.st_size)
+    store = _worker_stores.get(key)
+    if store is None:
+        _worker_stores.clear()
+        store = get_columnar_store(open_mapped_dataset(Path(binary_path)))
+        _worker_stores[key] = store
+    return SweepService(dataset_repo=None).evaluate_combinations(
+        store, combinations, date_range, include_daily_pnl, columnar
+    )
+
+
+class SweepService:
+    def __init__(
+        self,
+        dataset_repo: DatasetRepository,
+        backtest_service: BacktestService = None,
+        max_workers: int = SWEEP_WORKERS,
+        chunk_size: int = SWEEP_CHUNK_SIZE
+    ):
+        self.dataset_repo = dataset_repo
+        self.backtest_service = backtest_service or BacktestService(dataset_repo)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def build_combinations(self, request: SweepRequest) -> List[StrategyConfig]:
+        # Cartesian product of the requested grids; empty lists fall back to the template value
+        template = request.strategy
+        return [
+            StrategyConfig(
+                dataset_name=template.dataset_name,
+                option_type=option_type,
+                strike=strike,
+                expiry=expiry,
+                position_direction=position_direction,
+                quantity=quantity
+            )
+            for strike, expiry, option_type, position_direction, quantity in product(
+                request.strikes or [template.strike],
+                request.expiries or [template.expiry],
+                request.option_types or [template.option_type],
+                request.position_directions or [template.position_direction],
+                request.quantities or [template.quantity]
+            )
+        ]
+
+    def run_sweep(self, request: SweepRequest, columnar: bool = False) -> SweepResponse:
+        # Evaluate every combination of the grid against one loaded and indexed dataset. With
+        # columnar=True each result's daily series is returned as parallel arrays.
+        start_time = time.perf_counter()
+        dataset_name = request.strategy.dataset_name
+
+        try:
+            combinations = self.build_combinations(request)
+            if len(combinations) > MAX_SWEEP_COMBINATIONS:
+                return SweepResponse(
+                    status="error",
+                    dataset_name=dataset_name,
+                    total_combinations=len(combinations),
+                    message=f"Sweep has {len(combinations)} combinations; the limit is {MAX_SWEEP_COMBINATIONS}",
+                    error_code="SWEEP_TOO_LARGE"
+                )
+
+            dataset = self.dataset_repo.load_dataset(dataset_name)
+            if not dataset:
+                return SweepResponse(
+                    status="error",
+                    message=f"Dataset '{dataset_name}' not found",
+                    error_code="DATASET_NOT_FOUND"
+                )
+
+            options_repo = OptionsRepository(dataset)
+            if not options_repo.get_available_dates():
+                return SweepResponse(
+                    status="error",
+                    message="No data available in dataset",
+                    error_code="INSUFFICIENT_DATA"
+                )
+
+            with timed_stage("sweep_evaluate"):
+                if self.max_workers > 1 and len(combinations) > self.chunk_size:
+                    results = self.evaluate_in_pool(
+                        dataset_name, options_repo.store, combinations, request.date_range,
+                        request.include_daily_pnl, columnar
+                    )
+                else:
+                    results = self.evaluate_combinations(
+                        options_repo.store, combinations, request.date_range, request.include_daily_pnl, columnar
+                    )
+            ranked = self.rank_results(results, request.rank_by)
+
+            response_type = ColumnarSweepResponse if columnar else SweepResponse
+            return response_type(
+                status="success",
+                dataset_name=dataset_name,
+                total_combinations=len(combinations),
+                successful_combinations=sum(1 for result in ranked if result.status == "success"),
+                results=ranked,
+                execution_time_ms=int((time.perf_counter() - start_time) * 1000)
+            )
+
+        except Exception as e:
+            return SweepResponse(
+                status="error",
+                dataset_name=dataset_name,
+                message=f"Internal server error during sweep execution: {str(e)}",
+                error_code="SWEEP_FAILED"
+            )
+
+    def evaluate_combinations(
+        self,
+        store: OptionsStoreBase,
+        combinations: List[StrategyConfig],
+        date_range: DateRange,
+        include_daily_pnl: bool = False,
+        columnar: bool = False
+    ) -> List[SweepResult]:
+        # Batched equivalent of BacktestService.execute_backtest for each combination. All windows
+        # start on the same entry date and differ only in where they stop (end date or expiry), so
+        # one (contract x date) price gather feeds a single (combination x date) P/L matrix.
+        start_date = date_range.start_date
+        end_date = date_range.end_date
+        first_code, _ = store.date_code_range(start_date, end_date)
+        result_type = ColumnarSweepResult if columnar else SweepResult
+
+        lengths = np.array([
+            store.date_code_range(start_date, min(end_date, strategy.expiry))[1] - first_code
+            for strategy in combinations
+        ], dtype=np.int64)
+        contract_ids = np.array([
+            -1 if contract_id is None else contract_id
+            for contract_id in (
+                store.find_contract(strategy.strike, strategy.expiry, strategy.option_type)
+                for strategy in combinations
+            )
+        ], dtype=np.int64)
+
+        results: List[SweepResult] = [None] * len(combinations)
+        for i in np.flatnonzero(lengths <= 0).tolist():
+            results[i] = self._error_result(
+                combinations[i], f"No data available for entry date {start_date}", "INSUFFICIENT_DATA", result_type
+            )
+
+        entry_date = store.dates[first_code] if first_code < len(store.dates) else None
+        window = lengths > 0
+        width = int(lengths.max()) if window.any() else 0
+        date_codes = np.arange(first_code, first_code + width, dtype=np.int64)
+
+        unique_contracts, contract_rows = np.unique(contract_ids[window & (contract_ids >= 0)], return_inverse=True)
+        contract_prices = store.gather_matrix(unique_contracts, date_codes)
+        prices = np.full((len(combinations), width), np.nan, dtype=np.float64)
+        prices[window & (contract_ids >= 0)] = contract_prices[contract_rows]
+
+        entry_prices = prices[:, 0] if width else np.full(len(combinations), np.nan)
+        for i in np.flatnonzero(window & np.isnan(entry_prices)).tolist():
+            results[i] = self._error_result(
+                combinations[i], f"No pricing data for entry date {entry_date}", "NO_PRICING_DATA", result_type
+            )
+
+        valid = np.flatnonzero(window & ~np.isnan(entry_prices))
+        if len(valid) == 0:
+            return results
+
+        valid_strategies = [combinations[i] for i in valid.tolist()]
+        valid_lengths = lengths[valid]
+        valid_prices = prices[valid]
+        # Columns past a combination's own window belong to later dates and must not be marked
+        valid_prices[np.arange(width)[None, :] >= valid_lengths[:, None]] = np.nan
+
+        underlying = store.underlying_by_date[date_codes]
+        last_dates = [store.dates[first_code + length - 1] for length in valid_lengths.tolist()]
+        position_closed = np.array([
+            last_date == strategy.expiry for last_date, strategy in zip(last_dates, valid_strategies)
+        ], dtype=bool)
+
+        intrinsic = np.full(len(valid), np.nan, dtype=np.float64)
+        intrinsic[position_closed] = self.backtest_service.intrinsic_values(
+            [strategy.option_type for strategy, closed in zip(valid_strategies, position_closed) if closed],
+            np.array([strategy.strike for strategy in valid_strategies], dtype=np.float64)[position_closed],
+            underlying[valid_lengths[position_closed] - 1]
+        )
+
+        cumulative_pnl = self.backtest_service.compute_pnl_matrix(
+            valid_prices,
+            valid_lengths,
+            entry_prices[valid],
+            np.array([1 if strategy.position_direction == "buy" else -1 for strategy in valid_strategies]),
+            np.array([strategy.quantity for strategy in valid_strategies]),
+            intrinsic
+        )
+        rounded_pnl = self.backtest_service.round_series(cumulative_pnl)
+        win_rates = self.backtest_service.win_rate_matrix(rounded_pnl, valid_lengths)
+        max_drawdowns = self.backtest_service.max_drawdown_matrix(rounded_pnl)
+        final_pnls = cumulative_pnl[np.arange(len(valid)), valid_lengths - 1].tolist()
+        rounded_underlying = self.backtest_service.round_series(underlying) if include_daily_pnl else None
+
+        for row, i in enumerate(valid.tolist()):
+            strategy = combinations[i]
+            length = int(valid_lengths[row])
+            daily_pnl = None
+            if include_daily_pnl and columnar:
+                daily_pnl = DailyPnLColumns(
+                    dates=store.dates[first_code:first_code + length],
+                    cumulative_pnl=rounded_pnl[row, :length].tolist(),
+                    underlying_price=rounded_underlying[:length].tolist()
+                )
+            elif include_daily_pnl:
+                daily_pnl = self.backtest_service.build_daily_pnl(
+                    store.dates[first_code:first_code + length],
+                    rounded_pnl[row, :length],
+                    rounded_underlying[:length]
+                )
+
+            results[i] = result_type(
+                status="success",
+                option_type=strategy.option_type,
+                strike=strategy.strike,
+                expiry=strategy.expiry,
+                position_direction=strategy.position_direction,
+                quantity=strategy.quantity,
+                entry_date=entry_date,
+                entry_price=float(entry_prices[i]),
+                final_pnl=round(final_pnls[row], 2),
+                win_rate=win_rates[row],
+                max_drawdown=max_drawdowns[row],
+                position_closed=bool(position_closed[row]),
+                exit_reason="expiry" if position_closed[row] else "backtest_end",
+                total_days=length,
+                daily_pnl=daily_pnl
+            )
+
+        return results
+
+    def evaluate_in_pool(
+        self,
+        dataset_name: str,
+        store: OptionsStoreBase,
+        combinations: List[StrategyConfig],
+        date_range: DateRange,
+        include_daily_pnl: bool = False,
+        columnar: bool = False
+    ) -> List[SweepResult]:
+        # Split the grid into chunks and evaluate them on the process pool. Workers attach to one
+        # memory-mapped binary copy of the dataset instead of each receiving a pickled copy.
+        binary_path = self.dataset_repo.get_shared_binary_path(dataset_name)
+        if binary_path is None:
+            return self.evaluate_combinations(store, combinations, date_range, include_daily_pnl, columnar)
+
+        chunks = [
+            combinations[start:start + self.chunk_size]
+            for start in range(0, len(combinations), self.chunk_size)
+        ]
+        executor = self._get_executor()
+        try:
+            futures = [
+                executor.submit(_evaluate_chunk, str(binary_path), chunk, date_range, include_daily_pnl, columnar)
+                for chunk in chunks
+            ]
+            # Chunks are reassembled in grid order, so ranking sees the same sequence as a single-process run
+            return [result for future in futures for result in future.result()]
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+    def shutdown(self) -> None:
+        # Stop the worker processes (they are started again on the next large sweep)
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn avoids forking a process that is running server threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def rank_results(self, results: List[SweepResult], rank_by: str) -> List[SweepResult]:
+        # Best first by the chosen metric (higher is better for all three); failed combinations go last
+        successful = sorted(
+            (result for result in results if result.status == "success"),
+            key=lambda result: getattr(result, rank_by),
+            reverse=True
+        )
+        for rank, result in enumerate(successful, start=1):
+            result.rank = rank
+        return successful + [result for result in results if result.status != "success"]
+
+    def _error_result(
+        self,
+        strategy: StrategyConfig,
+        message: str,
+        error_code: str,
+        result_type: Type[SweepResult] = SweepResult
+    ) -> SweepResult:
+        return result_type(
+            status="error",
+            option_type=strategy.option_type,
+            strike=strategy.strike,
+            expiry=strategy.expiry,
+            position_direction=strategy.position_direction,
+            quantity=strategy.quantity,
+            message=message,
+            error_code=error_code
+        )
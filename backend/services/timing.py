@@ -0,0 +1,66 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+from services.metrics import stage_duration_seconds
+
+
+class StageTimer:
+    # Wall time per named stage of one request, on the monotonic clock. A stage entered more than
+    # once (e.g. a lookup per date) accumulates. Stages may nest, so they need not add up to the total.
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def as_ms(self) -> Dict[str, float]:
+        # Stages in the order they were first entered, plus the total so far
+        with self._lock:
+            timings = {stage: round(seconds * 1000, 3) for stage, seconds in self._stages.items()}
+        timings["total"] = round(self.elapsed() * 1000, 3)
+        return timings
+
+    def server_timing(self) -> str:
+        # Value of a Server-Timing header (durations in milliseconds)
+        return ", ".join(f"{stage};dur={duration_ms}" for stage, duration_ms in self.as_ms().items())
+
+
+# Timer of the request being handled. The request executor runs calls in a copy of the caller's
+# context, so stages timed on worker threads are recorded against the right request.
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar("stage_timer", default=None)
+
+
+def start_request_timer() -> StageTimer:
+    timer = StageTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def current_timer() -> Optional[StageTimer]:
+    return _current_timer.get()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    # Add a duration measured elsewhere to the current request and to the stage histogram
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.record(stage, seconds)
+    stage_duration_seconds.observe(seconds, stage)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started_at)
@@ -0,0 +1,324 @@
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from models.upload import DatasetUploadStatus
+from repositories.binary_format import BINARY_SUFFIX
+from repositories.dataset_repository import DatasetRepository
+from repositories.ingestion import IngestionError, IngestionProgress, ingest_file
+from repositories.partitioned_store import DatasetAppendError
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 ** 3)))
+UPLOAD_INGEST_WORKERS = int(os.getenv("UPLOAD_INGEST_WORKERS", "1"))
+
+UPLOAD_STAGING_DIR = ".uploads"
+DATASET_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,99}$")
+ACTIVE_STATUSES = ("receiving", "queued", "ingesting")
+
+# Share of the progress bar given to receiving the body; ingestion fills the rest
+_RECEIVE_PROGRESS_SHARE = 0.5
+
+
+class UploadRejectedError(Exception):
+    def __init__(self, message: str, error_code: str, status_code: int):
+        super().__init__(message)
+        self.error_code = error_code
+        self.status_code = status_code
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class DatasetUpload:
+    dataset_name: str
+    upload_id: str
+    staging_path: Path
+    mode: str = "create"
+    content_length: Optional[int] = None
+    source_format: Optional[str] = None
+    created_at: str = field(default_factory=_now_iso)
+    status: str = "receiving"
+    progress: float = 0.0
+    bytes_received: int = 0
+    rows_read: int = 0
+    rows_rejected: int = 0
+    record_count: Optional[int] = None
+    finished_at: Optional[str] = None
+    message: Optional[str] = None
+    error_code: Optional[str] = None
+
+    def to_status(self) -> DatasetUploadStatus:
+        return DatasetUploadStatus(
+            dataset_name=self.dataset_name,
+            upload_id=self.upload_id,
+            mode=self.mode,
+            status=self.status,
+            progress=self.progress,
+            bytes_received=self.bytes_received,
+            rows_read=self.rows_read,
+            rows_rejected=self.rows_rejected,
+            record_count=self.record_count,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            message=self.message,
+            error_code=self.error_code
+        )
+
+
+class _MultipartFileReader:
+    # Streaming multipart parser that keeps only the bytes of the first file part. Bytes are
+    # handed back per fed chunk, so nothing beyond one network chunk is buffered.
+
+    def __init__(self, boundary: bytes):
+        self.filename: Optional[str] = None
+        self.found_file = False
+        self._in_file = False
+        self._pending: List[bytes] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end
+        })
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        self.parser.write(chunk)
+        data, self._pending = self._pending, []
+        return data
+
+    def finish(self) -> None:
+        self.parser.finalize()
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if b"filename" in params and not self.found_file:
+            self._in_file = True
+            self.filename = params[b"filename"].decode("utf-8", errors="replace")
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self.found_file = True
+
+
+class UploadService:
+    # Receives dataset uploads onto disk next to the data directory, then ingests them on a
+    # background worker into <data_dir>/<name>.optbin, or appends them to an existing dataset as a
+    # new part. Files only appear, via an atomic rename, once complete, so readers never see a
+    # partial dataset.
+
+    def __init__(
+        self,
+        dataset_repo: DatasetRepository,
+        max_bytes: int = UPLOAD_MAX_BYTES,
+        ingest_workers: int = UPLOAD_INGEST_WORKERS
+    ):
+        self.dataset_repo = dataset_repo
+        self.max_bytes = max_bytes
+        self.staging_dir = dataset_repo.data_dir / UPLOAD_STAGING_DIR
+        self._executor = ThreadPoolExecutor(max_workers=ingest_workers, thread_name_prefix="dataset-ingest")
+        self._uploads: Dict[str, DatasetUpload] = {}
+        self._lock = threading.Lock()
+
+    def begin(
+        self,
+        dataset_name: str,
+        content_length: Optional[int] = None,
+        overwrite: bool = False,
+        append: bool = False
+    ) -> DatasetUpload:
+        # Validate an upload before any of its body is read and reserve the dataset name
+        if not DATASET_NAME_PATTERN.match(dataset_name or ""):
+            raise UploadRejectedError(
+                "Dataset name must be 1-100 letters, digits, '_' or '-'", "INVALID_DATASET_NAME", 400
+            )
+        if content_length is not None and content_length > self.max_bytes:
+            raise UploadRejectedError(
+                f"Upload of {content_length} bytes exceeds the {self.max_bytes} byte limit", "UPLOAD_TOO_LARGE", 413
+            )
+        if append and not self.dataset_repo.dataset_exists(dataset_name):
+            raise UploadRejectedError(
+                f"Dataset '{dataset_name}' not found", "DATASET_NOT_FOUND", 404
+            )
+        if not append and not overwrite and self.dataset_repo.dataset_exists(dataset_name):
+            raise UploadRejectedError(
+                f"Dataset '{dataset_name}' already exists", "DATASET_EXISTS", 409
+            )
+
+        with self._lock:
+            current = self._uploads.get(dataset_name)
+            if current is not None and current.status in ACTIVE_STATUSES:
+                raise UploadRejectedError(
+                    f"Dataset '{dataset_name}' is already being uploaded", "UPLOAD_IN_PROGRESS", 409
+                )
+            upload_id = uuid.uuid4().hex
+            upload = DatasetUpload(
+                dataset_name=dataset_name,
+                upload_id=upload_id,
+                staging_path=self.staging_dir / f"{upload_id}.upload",
+                mode="append" if append else "create",
+                content_length=content_length
+            )
+            self._uploads[dataset_name] = upload
+        return upload
+
+    async def receive(
+        self,
+        upload: DatasetUpload,
+        body: AsyncIterator[bytes],
+        content_type: str,
+        source_format: Optional[str] = None
+    ) -> None:
+        # Stream the request body (raw, or the first file part of a multipart form) to the
+        # staging file, enforcing the size limit as bytes arrive
+        media_type, params = parse_options_header(content_type or "")
+        reader = None
+        if media_type == b"multipart/form-data":
+            if b"boundary" not in params:
+                self._reject(upload, UploadRejectedError("Multipart upload has no boundary", "INVALID_UPLOAD", 400))
+            reader = _MultipartFileReader(params[b"boundary"])
+
+        try:
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+            with open(upload.staging_path, "wb") as f:
+                async for chunk in body:
+                    upload.bytes_received += len(chunk)
+                    if upload.bytes_received > self.max_bytes:
+                        raise UploadRejectedError(
+                            f"Upload exceeds the {self.max_bytes} byte limit", "UPLOAD_TOO_LARGE", 413
+                        )
+                    parts = reader.feed(chunk) if reader is not None else [chunk]
+                    if parts:
+                        await run_in_threadpool(f.writelines, parts)
+                    if upload.content_length:
+                        upload.progress = min(upload.bytes_received / upload.content_length, 1.0) * _RECEIVE_PROGRESS_SHARE
+
+            if reader is not None:
+                reader.finish()
+                if not reader.found_file:
+                    raise UploadRejectedError("Multipart upload has no file part", "INVALID_UPLOAD", 400)
+        except UploadRejectedError as e:
+            self._reject(upload, e)
+        except Exception as e:
+            self._reject(upload, UploadRejectedError(f"Upload failed: {e}", "UPLOAD_FAILED", 400))
+
+        filename = reader.filename if reader is not None else None
+        upload.source_format = source_format or self._detect_format(filename, media_type)
+
+    def start_ingestion(self, upload: DatasetUpload) -> None:
+        upload.status = "queued"
+        upload.progress = _RECEIVE_PROGRESS_SHARE
+        self._executor.submit(self._ingest, upload)
+
+    def get_status(self, dataset_name: str) -> Optional[DatasetUploadStatus]:
+        # Status of the latest upload of a dataset, or "ready" for datasets that were added another way
+        with self._lock:
+            upload = self._uploads.get(dataset_name)
+        if upload is not None:
+            return upload.to_status()
+
+        entry = self.dataset_repo.get_catalog_entry(dataset_name)
+        if entry is None:
+            return None
+        return DatasetUploadStatus(
+            dataset_name=dataset_name,
+            status="ready",
+            progress=1.0,
+            record_count=entry.record_count
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ingest(self, upload: DatasetUpload) -> None:
+        upload.status = "ingesting"
+
+        def on_progress(progress: IngestionProgress) -> None:
+            upload.rows_read = progress.rows_read
+            upload.rows_rejected = progress.rows_rejected
+            if progress.total_bytes:
+                share = progress.bytes_read / progress.total_bytes
+                upload.progress = min(_RECEIVE_PROGRESS_SHARE + share * (1 - _RECEIVE_PROGRESS_SHARE), 0.99)
+
+        try:
+            if upload.mode == "append":
+                metadata = self.dataset_repo.append_dataset(
+                    upload.dataset_name,
+                    upload.staging_path,
+                    source_format=upload.source_format,
+                    progress_callback=on_progress
+                )
+                upload.record_count = metadata.record_count
+            else:
+                result = ingest_file(
+                    upload.staging_path,
+                    output_path=self.dataset_repo.data_dir / f"{upload.dataset_name}{BINARY_SUFFIX}",
+                    dataset_name=upload.dataset_name,
+                    source_format=upload.source_format,
+                    progress_callback=on_progress
+                )
+                # The manifest of an earlier partitioned dataset would keep shadowing the new file
+                self.dataset_repo.remove_partitioned(upload.dataset_name)
+                upload.record_count = result.record_count
+            self._finish(upload, "ready")
+        except DatasetAppendError as e:
+            self._finish(upload, "failed", message=str(e), error_code="APPEND_REJECTED")
+        except IngestionError as e:
+            self._finish(upload, "failed", message=str(e), error_code="INVALID_DATASET")
+        except Exception as e:
+            self._finish(upload, "failed", message=f"Ingestion failed: {e}", error_code="INGESTION_FAILED")
+        finally:
+            upload.staging_path.unlink(missing_ok=True)
+
+    def _finish(self, upload: DatasetUpload, status: str, message: str = None, error_code: str = None) -> None:
+        upload.status = status
+        upload.finished_at = _now_iso()
+        upload.message = message
+        upload.error_code = error_code
+        if status == "ready":
+            upload.progress = 1.0
+
+    def _reject(self, upload: DatasetUpload, error: UploadRejectedError) -> None:
+        upload.staging_path.unlink(missing_ok=True)
+        self._finish(upload, "failed", message=str(error), error_code=error.error_code)
+        raise error
+
+    def _detect_format(self, filename: Optional[str], media_type: bytes) -> str:
+        if filename and filename.lower().endswith(".csv"):
+            return "csv"
+        if media_type in (b"text/csv", b"application/csv"):
+            return "csv"
+        return "json"
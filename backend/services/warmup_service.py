@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from models.system import DatasetWarmupStatus, ReadinessResponse
+from repositories.columnar_store import get_columnar_store
+from repositories.dataset_repository import DatasetRepository
+
+# Comma-separated dataset names to preload at startup, "*" for every dataset, unset to skip warm-up
+WARMUP_DATASETS = os.getenv("WARMUP_DATASETS", "")
+
+
+def parse_warmup_datasets(value: str) -> Optional[List[str]]:
+    # None means every dataset; an empty list disables warm-up
+    value = value.strip()
+    if value == "*":
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+@dataclass
+class DatasetWarmup:
+    dataset_name: str
+    status: str = "pending"
+    duration_ms: Optional[int] = None
+    record_count: Optional[int] = None
+    message: Optional[str] = None
+
+    def to_status(self) -> DatasetWarmupStatus:
+        return DatasetWarmupStatus(
+            dataset_name=self.dataset_name,
+            status=self.status,
+            duration_ms=self.duration_ms,
+            record_count=self.record_count,
+            message=self.message
+        )
+
+
+class WarmupService:
+    # Loads, validates and indexes datasets on a background thread after startup, so the first
+    # request for each of them hits the cache. Readiness is reached once every dataset has been
+    # attempted; datasets that fail to load are reported but do not hold readiness back forever.
+    # Loaded datasets are checked against the cache whenever readiness is asked for, so ones that
+    # later warm-ups (or requests) evicted are reported as not_cached instead of ready.
+
+    def __init__(self, dataset_repo: DatasetRepository, dataset_names: Optional[List[str]] = None):
+        self.dataset_repo = dataset_repo
+        # None warms every dataset in the data directory
+        self.dataset_names = dataset_names
+        self._warmups: Dict[str, DatasetWarmup] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        names = self.dataset_names
+        if names is None:
+            names = self.dataset_repo.list_dataset_names()
+        with self._lock:
+            self._warmups = {name: DatasetWarmup(dataset_name=name) for name in names}
+        self._thread = threading.Thread(target=self._run, name="dataset-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def readiness(self) -> ReadinessResponse:
+        with self._lock:
+            warmups = [warmup.to_status() for warmup in self._warmups.values()]
+        for warmup in warmups:
+            if warmup.status == "ready" and not self.dataset_repo.is_dataset_cached(warmup.dataset_name):
+                warmup.status = "not_cached"
+                warmup.message = "Evicted from the dataset cache since it was loaded (see DATASET_CACHE_MAX_BYTES)"
+        finished = sum(1 for warmup in warmups if warmup.status in ("ready", "not_cached", "failed"))
+        return ReadinessResponse(
+            status="ready" if finished == len(warmups) else "warming",
+            datasets_total=len(warmups),
+            datasets_finished=finished,
+            datasets=warmups
+        )
+
+    def _run(self) -> None:
+        for warmup in list(self._warmups.values()):
+            if self._stopping.is_set():
+                return
+            self._warm(warmup)
+
+    def _warm(self, warmup: DatasetWarmup) -> None:
+        start_time = time.perf_counter()
+        self._update(warmup, status="loading")
+        try:
+            # Parses (or maps) the dataset into the shared cache, builds its index and catalog sidecar
+            dataset = self.dataset_repo.load_dataset(warmup.dataset_name)
+            if dataset is None:
+                self._update(warmup, status="failed", message=f"Dataset '{warmup.dataset_name}' not found or invalid")
+                return
+            store = get_columnar_store(dataset)
+            self.dataset_repo.get_catalog_entry(warmup.dataset_name)
+            self._update(warmup, status="ready", record_count=store.record_count)
+        except Exception as e:
+            self._update(warmup, status="failed", message=f"Warm-up failed: {e}")
+        finally:
+            with self._lock:
+                warmup.duration_ms = int((time.perf_counter() - start_time) * 1000)
+
+    def _update(self, warmup: DatasetWarmup, **changes) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(warmup, name, value)
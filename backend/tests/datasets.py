@@ -0,0 +1,116 @@
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from models.options import OptionRecord, OptionsDataset
+
+OPTION_TYPES = ("call", "put")
+STRIKES = (90.0, 100.5, 110.0)
+
+
+def random_rows(
+    rng: random.Random,
+    dates: List[str],
+    expiries: List[str],
+    coverage: float = 0.75
+) -> List[Dict[str, Any]]:
+    # Quotes for a random subset of the (date, contract) grid in shuffled order, with occasional
+    # duplicate quotes and underlying prices that disagree within a date
+    underlying = {date: rng.uniform(50, 150) for date in dates}
+    rows = []
+    for date in dates:
+        for expiry in expiries:
+            for strike in STRIKES:
+                for option_type in OPTION_TYPES:
+                    if rng.random() >= coverage:
+                        continue
+                    rows.append({
+                        "date": date,
+                        "underlying": underlying[date] if rng.random() < 0.9 else rng.uniform(50, 150),
+                        "expiry": expiry,
+                        "strike": strike,
+                        "type": option_type,
+                        "mid_price": rng.choice([round(rng.uniform(0.01, 20), 2), rng.uniform(0.001, 20)])
+                    })
+    rows += [dict(row, mid_price=round(rng.uniform(0.01, 20), 2)) for row in rng.sample(rows, len(rows) // 20)]
+    rng.shuffle(rows)
+    return rows
+
+
+def write_csv_rows(path: Path, rows: List[Dict[str, Any]]) -> Path:
+    # The rows in the CSV ingestion schema; repr keeps every float exact
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "underlying", "expiry", "strike", "type", "mid_price"])
+        for row in rows:
+            writer.writerow([
+                row["date"], repr(row["underlying"]), row["expiry"], repr(row["strike"]), row["type"],
+                repr(row["mid_price"])
+            ])
+    return path
+
+
+def random_schedule(rng: random.Random, month: str = "2024-01") -> Dict[str, List[str]]:
+    # Trading dates with gaps, and expiries both inside and after them
+    dates = sorted(f"{month}-{day:02d}" for day in rng.sample(range(1, 29), rng.randint(2, 15)))
+    expiries = sorted({rng.choice(dates) for _ in range(3)} | {"2024-03-15"})
+    return {"dates": dates, "expiries": expiries}
+
+
+def write_json_dataset(path: Path, rows: List[Dict[str, Any]]) -> Path:
+    dates = sorted({row["date"] for row in rows})
+    document = {
+        "metadata": {
+            "dataset_name": path.stem,
+            "date_range": {"start": dates[0], "end": dates[-1]} if dates else {},
+            "record_count": len(rows)
+        },
+        "data": rows
+    }
+    path.write_text(json.dumps(document))
+    return path
+
+
+def random_request(rng: random.Random, dataset_name: str, schedule: Dict[str, List[str]]) -> Dict[str, Any]:
+    # A single-leg backtest request over the schedule, often with bounds outside the trading dates
+    dates = schedule["dates"]
+    return {
+        "strategy": {
+            "dataset_name": dataset_name,
+            "option_type": rng.choice(OPTION_TYPES),
+            "strike": rng.choice(STRIKES),
+            "expiry": rng.choice(schedule["expiries"]),
+            "position_direction": rng.choice(["buy", "sell"]),
+            "quantity": rng.randint(1, 5)
+        },
+        "date_range": {
+            "start_date": rng.choice(dates + ["2023-12-29"]),
+            "end_date": rng.choice(dates + ["2024-03-01"])
+        }
+    }
+
+
+def random_multileg_request(rng: random.Random, dataset_name: str, schedule: Dict[str, List[str]]) -> Dict[str, Any]:
+    # One to four legs on random contracts of the schedule, usually expiring on different dates
+    single = random_request(rng, dataset_name, schedule)
+    legs = []
+    for _ in range(rng.randint(1, 4)):
+        leg = random_request(rng, dataset_name, schedule)["strategy"]
+        del leg["dataset_name"]
+        legs.append(leg)
+    return {"strategy": {"dataset_name": dataset_name, "legs": legs}, "date_range": single["date_range"]}
+
+
+def write_random_dataset(data_dir: Path, dataset_name: str, seed: int) -> Tuple[Path, Dict[str, List[str]]]:
+    # A random JSON dataset in data_dir, with the schedule its requests should draw from
+    rng = random.Random(seed)
+    schedule = random_schedule(rng)
+    rows = random_rows(rng, schedule["dates"], schedule["expiries"])
+    path = write_json_dataset(data_dir / f"{dataset_name}.json", rows)
+    return path, schedule
+
+
+def load_records(path: Path) -> List[OptionRecord]:
+    # Records of a JSON dataset in file order, parsed independently of any repository
+    return OptionsDataset.model_validate_json(path.read_bytes()).data
@@ -0,0 +1,283 @@
+from typing import Any, Dict, List, Optional, Tuple
+from models.backtest import (
+    BacktestRequest, BacktestResponse, BacktestResults, BacktestPeriod, DailyPnL, StrategySummary
+)
+from models.multileg import (
+    LegSummary, MultiLegBacktestRequest, MultiLegBacktestResponse, MultiLegStrategySummary, StrategyLeg
+)
+from models.options import OptionRecord
+from models.strategy import StrategyConfig, StrategyValidationResponse
+
+CONTRACT_MULTIPLIER = 100
+
+
+class ScalarBacktester:
+    # The original record-by-record backtest, kept as the oracle the vectorised engine and every
+    # storage backend are checked against. Lookups scan the records in file order, so the first
+    # quote of a duplicated contract wins and a date's underlying comes from its first record.
+
+    def __init__(self, records: List[OptionRecord]):
+        self.records = records
+
+    def get_option_price(self, date: str, strike: float, expiry: str, option_type: str) -> Optional[float]:
+        for record in self.records:
+            if (record.date == date and record.strike == strike and
+                    record.expiry == expiry and record.type == option_type):
+                return record.mid_price
+        return None
+
+    def get_underlying_price(self, date: str) -> Optional[float]:
+        for record in self.records:
+            if record.date == date:
+                return record.underlying
+        return None
+
+    def get_available_dates(self) -> List[str]:
+        return sorted(set(record.date for record in self.records))
+
+    def validate_strategy(self, strategy: StrategyConfig) -> StrategyValidationResponse:
+        exists = any(
+            record.strike == strategy.strike and record.expiry == strategy.expiry
+            and record.type == strategy.option_type
+            for record in self.records
+        )
+        if not exists:
+            available_strikes = sorted(set(
+                record.strike for record in self.records
+                if record.expiry == strategy.expiry and record.type == strategy.option_type
+            ))
+            return StrategyValidationResponse(
+                valid=False,
+                message=f"Strike {strategy.strike} not available for expiry {strategy.expiry}. "
+                        f"Available strikes: {available_strikes[:10]}",
+                error_code="INVALID_STRIKE"
+            )
+
+        entry_price = None
+        for date in self.get_available_dates():
+            price = self.get_option_price(date, strategy.strike, strategy.expiry, strategy.option_type)
+            if price:
+                entry_price = price
+                break
+        if entry_price is None:
+            return StrategyValidationResponse(
+                valid=False, message="No pricing data available for this option", error_code="NO_PRICING_DATA"
+            )
+        return StrategyValidationResponse(
+            valid=True, message="Strategy configuration is valid", entry_price=entry_price
+        )
+
+    def execute_backtest(self, request: BacktestRequest) -> Dict[str, Any]:
+        # The response as a dict, without execution_time_ms and timings
+        available_dates = self.get_available_dates()
+        if not available_dates:
+            return self.error("No data available in dataset", "INSUFFICIENT_DATA")
+
+        strategy = request.strategy
+        start_date, end_date = request.date_range.start_date, request.date_range.end_date
+        backtest_dates = [date for date in available_dates if start_date <= date <= min(end_date, strategy.expiry)]
+        if not backtest_dates:
+            return self.error(f"No data available for entry date {start_date}", "INSUFFICIENT_DATA")
+
+        entry_date = backtest_dates[0]
+        entry_price = self.get_option_price(entry_date, strategy.strike, strategy.expiry, strategy.option_type)
+        if entry_price is None:
+            return self.error(f"No pricing data for entry date {entry_date}", "NO_PRICING_DATA")
+
+        daily_pnl, final_pnl, position_closed, exit_reason = self.calculate_pnl(strategy, backtest_dates, entry_price)
+        response = BacktestResponse(
+            status="success",
+            strategy_summary=StrategySummary(
+                option_type=strategy.option_type,
+                strike=strategy.strike,
+                expiry=strategy.expiry,
+                position_direction=strategy.position_direction,
+                quantity=strategy.quantity,
+                entry_price=entry_price,
+                entry_date=entry_date
+            ),
+            backtest_period=BacktestPeriod(
+                start_date=start_date, end_date=backtest_dates[-1], total_days=len(backtest_dates)
+            ),
+            results=BacktestResults(
+                daily_pnl=daily_pnl,
+                final_pnl=final_pnl,
+                win_rate=self.calculate_win_rate(daily_pnl),
+                max_drawdown=self.calculate_max_drawdown(daily_pnl),
+                position_closed=position_closed,
+                exit_reason=exit_reason
+            )
+        )
+        return response.model_dump(exclude={"execution_time_ms", "timings"})
+
+    def calculate_pnl(self, strategy: StrategyConfig, backtest_dates: List[str], entry_price: float):
+        position_multiplier = 1 if strategy.position_direction == "buy" else -1
+        daily_pnl = []
+        cumulative_pnl = 0.0
+        position_closed = False
+        exit_reason = "backtest_end"
+
+        for date in backtest_dates:
+            current_price = self.get_option_price(date, strategy.strike, strategy.expiry, strategy.option_type)
+            underlying_price = self.get_underlying_price(date)
+
+            if date == strategy.expiry:
+                if strategy.option_type == "call":
+                    intrinsic_value = max(0, underlying_price - strategy.strike)
+                else:
+                    intrinsic_value = max(0, strategy.strike - underlying_price)
+                cumulative_pnl = (
+                    (intrinsic_value - entry_price) * position_multiplier * CONTRACT_MULTIPLIER * strategy.quantity
+                )
+                position_closed = True
+                exit_reason = "expiry"
+                daily_pnl.append(DailyPnL(
+                    date=date, cumulative_pnl=round(cumulative_pnl, 2), underlying_price=round(underlying_price, 2)
+                ))
+                break
+
+            if current_price is not None:
+                cumulative_pnl = (
+                    (current_price - entry_price) * position_multiplier * CONTRACT_MULTIPLIER * strategy.quantity
+                )
+            daily_pnl.append(DailyPnL(
+                date=date,
+                cumulative_pnl=round(cumulative_pnl, 2),
+                underlying_price=round(underlying_price, 2) if underlying_price else 0.0
+            ))
+
+        return daily_pnl, round(cumulative_pnl, 2), position_closed, exit_reason
+
+    def calculate_win_rate(self, daily_pnl: List[DailyPnL]) -> float:
+        if not daily_pnl:
+            return 0.0
+        positive_days = sum(1 for day in daily_pnl if day.cumulative_pnl > 0)
+        return round((positive_days / len(daily_pnl)) * 100, 2)
+
+    def calculate_max_drawdown(self, daily_pnl: List[DailyPnL]) -> float:
+        if not daily_pnl:
+            return 0.0
+        peak = float("-inf")
+        max_drawdown = 0.0
+        for day in daily_pnl:
+            peak = max(peak, day.cumulative_pnl)
+            max_drawdown = max(max_drawdown, peak - day.cumulative_pnl)
+        return round(-max_drawdown, 2)
+
+    def execute_multileg_backtest(self, request: MultiLegBacktestRequest) -> Dict[str, Any]:
+        # Every leg is a single backtest opened on the first trading day of the window. The legs'
+        # unrounded daily P/L are summed; a leg holds its final value after its expiry.
+        strategy = request.strategy
+        available_dates = self.get_available_dates()
+        if not available_dates:
+            return self.multileg_error("No data available in dataset", "INSUFFICIENT_DATA")
+
+        start_date, end_date = request.date_range.start_date, request.date_range.end_date
+        last_expiry = max(leg.expiry for leg in strategy.legs)
+        backtest_dates = [date for date in available_dates if start_date <= date <= min(end_date, last_expiry)]
+        if not backtest_dates:
+            return self.multileg_error(f"No data available for entry date {start_date}", "INSUFFICIENT_DATA")
+
+        entry_date = backtest_dates[0]
+        for number, leg in enumerate(strategy.legs, start=1):
+            if leg.expiry < entry_date:
+                return self.multileg_error(
+                    f"Leg {number} ({self.describe_leg(leg)}) expires before entry date {entry_date}", "INVALID_EXPIRY"
+                )
+        entry_prices = [
+            self.get_option_price(entry_date, leg.strike, leg.expiry, leg.option_type) for leg in strategy.legs
+        ]
+        for number, (leg, entry_price) in enumerate(zip(strategy.legs, entry_prices), start=1):
+            if entry_price is None:
+                return self.multileg_error(
+                    f"No pricing data for leg {number} ({self.describe_leg(leg)}) on entry date {entry_date}",
+                    "NO_PRICING_DATA"
+                )
+
+        legs = [
+            self.leg_pnl(leg, backtest_dates, entry_price) for leg, entry_price in zip(strategy.legs, entry_prices)
+        ]
+        daily_pnl = [
+            DailyPnL(
+                date=date,
+                cumulative_pnl=round(sum(pnl[day] for pnl, _ in legs), 2),
+                underlying_price=round(self.get_underlying_price(date), 2)
+            )
+            for day, date in enumerate(backtest_dates)
+        ]
+        position_closed = all(settled for _, settled in legs)
+        entry_cost = sum(
+            entry_price * (1 if leg.position_direction == "buy" else -1) * leg.quantity
+            for leg, entry_price in zip(strategy.legs, entry_prices)
+        ) * CONTRACT_MULTIPLIER
+
+        response = MultiLegBacktestResponse(
+            status="success",
+            strategy_summary=MultiLegStrategySummary(
+                entry_date=entry_date,
+                entry_cost=round(entry_cost, 2),
+                legs=[
+                    LegSummary(
+                        **leg.model_dump(),
+                        entry_price=entry_price,
+                        final_pnl=round(pnl[-1], 2),
+                        position_closed=settled
+                    )
+                    for leg, entry_price, (pnl, settled) in zip(strategy.legs, entry_prices, legs)
+                ]
+            ),
+            backtest_period=BacktestPeriod(
+                start_date=start_date, end_date=backtest_dates[-1], total_days=len(backtest_dates)
+            ),
+            results=BacktestResults(
+                daily_pnl=daily_pnl,
+                final_pnl=round(sum(pnl[-1] for pnl, _ in legs), 2),
+                win_rate=self.calculate_win_rate(daily_pnl),
+                max_drawdown=self.calculate_max_drawdown(daily_pnl),
+                position_closed=position_closed,
+                exit_reason="expiry" if position_closed else "backtest_end"
+            )
+        )
+        return response.model_dump(exclude={"execution_time_ms", "timings"})
+
+    def leg_pnl(self, leg: StrategyLeg, backtest_dates: List[str], entry_price: float) -> Tuple[List[float], bool]:
+        # calculate_pnl for one leg without rounding, held flat after the leg's last day
+        position_multiplier = 1 if leg.position_direction == "buy" else -1
+        pnl = []
+        cumulative_pnl = 0.0
+        settled = False
+        for date in backtest_dates:
+            if date > leg.expiry or settled:
+                pnl.append(cumulative_pnl)
+                continue
+            if date == leg.expiry:
+                underlying_price = self.get_underlying_price(date)
+                if leg.option_type == "call":
+                    intrinsic_value = max(0, underlying_price - leg.strike)
+                else:
+                    intrinsic_value = max(0, leg.strike - underlying_price)
+                cumulative_pnl = (
+                    (intrinsic_value - entry_price) * position_multiplier * CONTRACT_MULTIPLIER * leg.quantity
+                )
+                settled = True
+            else:
+                current_price = self.get_option_price(date, leg.strike, leg.expiry, leg.option_type)
+                if current_price is not None:
+                    cumulative_pnl = (
+                        (current_price - entry_price) * position_multiplier * CONTRACT_MULTIPLIER * leg.quantity
+                    )
+            pnl.append(cumulative_pnl)
+        return pnl, settled
+
+    def describe_leg(self, leg: StrategyLeg) -> str:
+        return f"{leg.position_direction} {leg.quantity} {leg.option_type} {leg.strike:g} {leg.expiry}"
+
+    def multileg_error(self, message: str, error_code: str) -> Dict[str, Any]:
+        return MultiLegBacktestResponse(status="error", message=message, error_code=error_code).model_dump(
+            exclude={"execution_time_ms", "timings"}
+        )
+
+    def error(self, message: str, error_code: str) -> Dict[str, Any]:
+        return BacktestResponse(status="error", message=message, error_code=error_code).model_dump(
+            exclude={"execution_time_ms", "timings"}
+        )
@@ -0,0 +1,59 @@
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from controllers.backtest_controller import router
+from services.container import container
+from tests.datasets import write_json_dataset
+
+ROWS = [
+    {"date": date, "underlying": 100.0, "expiry": "2024-03-15", "strike": 100.0, "type": "call", "mid_price": price}
+    for date, price in [("2024-03-11", 2.5), ("2024-03-12", 3.1), ("2024-03-13", 2.75)]
+]
+
+
+def backtest_body(strike: float) -> dict:
+    return {
+        "strategy": {
+            "dataset_name": "etag", "option_type": "call", "strike": strike, "expiry": "2024-03-15",
+            "position_direction": "buy", "quantity": 1
+        },
+        "date_range": {"start_date": "2024-03-11", "end_date": "2024-03-13"}
+    }
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    write_json_dataset(tmp_path / "etag.json", ROWS)
+    monkeypatch.setattr(container, "data_dir", str(tmp_path))
+    monkeypatch.setattr(container, "_instances", {})
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_matching_etag_revalidates_a_success(client):
+    response = client.post("/api/backtest/run", json=backtest_body(100.0))
+    assert response.status_code == 200 and response.json()["status"] == "success"
+    etag = response.headers["ETag"]
+
+    revalidated = client.post("/api/backtest/run", json=backtest_body(100.0), headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+
+    other = client.post("/api/backtest/run", json=backtest_body(100.0), headers={"If-None-Match": '"stale"'})
+    assert other.status_code == 200 and other.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("if_none_match", ["*", '"stale", *'])
+def test_wildcard_never_revalidates_a_failing_request(client, if_none_match):
+    response = client.post("/api/backtest/run", json=backtest_body(1.0), headers={"If-None-Match": if_none_match})
+    assert response.status_code == 200
+    assert json.loads(response.content)["error_code"] == "NO_PRICING_DATA"
+    assert "ETag" not in response.headers
+
+
+def test_wildcard_runs_a_successful_request(client):
+    response = client.post("/api/backtest/run", json=backtest_body(100.0), headers={"If-None-Match": "*"})
+    assert response.status_code == 200 and response.json()["status"] == "success"
+    assert "ETag" in response.headers
@@ -0,0 +1,59 @@
+import random
+import pytest
+from models.backtest import BacktestRequest
+from models.strategy import StrategyConfig
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from services.backtest_service import BacktestService
+from tests.datasets import load_records, random_request, write_random_dataset
+from tests.reference import ScalarBacktester
+
+SEEDS = range(10)
+REQUESTS_PER_DATASET = 60
+
+
+def without_timing(response):
+    return response.model_dump(exclude={"execution_time_ms", "timings"})
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_vectorised_backtest_matches_scalar_reference(tmp_path, seed):
+    path, schedule = write_random_dataset(tmp_path, "parity", seed)
+    reference = ScalarBacktester(load_records(path))
+    service = BacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    rng = random.Random(seed)
+
+    for _ in range(REQUESTS_PER_DATASET):
+        request = BacktestRequest(**random_request(rng, "parity", schedule))
+        expected = reference.execute_backtest(request)
+        assert without_timing(service.execute_backtest(request)) == expected
+
+        columnar = without_timing(service.execute_backtest_columnar(request))
+        if expected["status"] == "success":
+            daily_pnl = expected["results"]["daily_pnl"]
+            assert columnar["results"]["daily_pnl"] == {
+                "dates": [day["date"] for day in daily_pnl],
+                "cumulative_pnl": [day["cumulative_pnl"] for day in daily_pnl],
+                "underlying_price": [day["underlying_price"] for day in daily_pnl]
+            }
+            assert {key: value for key, value in columnar["results"].items() if key != "daily_pnl"} == {
+                key: value for key, value in expected["results"].items() if key != "daily_pnl"
+            }
+        else:
+            assert columnar == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_validation_and_statistics_match_scalar_reference(tmp_path, seed):
+    path, schedule = write_random_dataset(tmp_path, "parity", seed)
+    reference = ScalarBacktester(load_records(path))
+    service = BacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    rng = random.Random(seed)
+
+    for _ in range(REQUESTS_PER_DATASET):
+        strategy = StrategyConfig(**random_request(rng, "parity", schedule)["strategy"])
+        assert service.validate_strategy(strategy) == reference.validate_strategy(strategy)
+
+        daily_pnl, _, _, _ = reference.calculate_pnl(strategy, schedule["dates"][:rng.randint(1, 5)], 3.3)
+        assert service.calculate_win_rate(daily_pnl) == reference.calculate_win_rate(daily_pnl)
+        assert service.calculate_max_drawdown(daily_pnl) == reference.calculate_max_drawdown(daily_pnl)
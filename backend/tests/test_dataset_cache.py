@@ -0,0 +1,157 @@
+import os
+import random
+import threading
+import time
+import numpy as np
+from models.options import OptionsDataset
+from repositories.dataset_cache import DatasetCache, estimate_dataset_bytes
+from repositories.dataset_repository import DatasetRepository
+from repositories.option_analytics import ANALYTICS_FORMAT
+from services.analytics_service import OptionAnalyticsService
+from tests.datasets import random_rows, write_json_dataset
+
+
+def load_json(path):
+    return OptionsDataset.model_validate_json(path.read_bytes())
+
+
+def write_dataset(tmp_path, name, seed=0):
+    rng = random.Random(seed)
+    return write_json_dataset(tmp_path / f"{name}.json", random_rows(rng, ["2024-01-02", "2024-01-03"], ["2024-02-16"]))
+
+
+def test_concurrent_loads_parse_once_and_leave_no_lock_behind(tmp_path):
+    path = write_dataset(tmp_path, "A")
+    cache = DatasetCache()
+    calls = []
+    waiting = threading.Barrier(4)
+
+    def slow_load(load_path):
+        calls.append(load_path)
+        time.sleep(0.05)
+        return load_json(load_path)
+
+    def load():
+        waiting.wait(5)
+        return cache.get_or_load(path, slow_load)
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert len(cache._load_locks) == 0
+
+    # Nor are the locks of other files once their loads finish
+    for name in ("B", "C", "D"):
+        cache.get_or_load(write_dataset(tmp_path, name), load_json)
+    assert len(cache._load_locks) == 0
+
+
+def test_clear_resets_entries_and_counters(tmp_path):
+    path = write_dataset(tmp_path, "A")
+    cache = DatasetCache()
+    cache.get_or_load(path, load_json)
+    cache.get_or_load(path, load_json)
+    cache.invalidate(path)
+
+    cache.clear()
+    assert cache.stats() == {
+        "hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "entries": 0, "current_bytes": 0,
+        "max_bytes": cache.max_bytes
+    }
+
+
+def test_attachment_counts_against_budget_and_leaves_with_its_dataset(tmp_path):
+    path = write_dataset(tmp_path, "A")
+    cache = DatasetCache()
+    dataset = cache.get_or_load(path, load_json)
+    dataset_bytes = estimate_dataset_bytes(dataset)
+
+    assert cache.attach(path, dataset, "derived", "value", 1000)
+    assert cache.get_attachment(path, dataset, "derived") == "value"
+    assert cache.stats()["current_bytes"] == dataset_bytes + 1000
+
+    # Replacing an attachment swaps its bytes rather than adding them
+    assert cache.attach(path, dataset, "derived", "smaller", 10)
+    assert cache.stats()["current_bytes"] == dataset_bytes + 10
+
+    cache.invalidate(path)
+    assert cache.stats()["current_bytes"] == 0
+    reloaded = cache.get_or_load(path, load_json)
+    assert cache.get_attachment(path, reloaded, "derived") is None
+
+
+def test_attachment_is_not_kept_for_another_dataset_version(tmp_path):
+    path = write_dataset(tmp_path, "A")
+    cache = DatasetCache()
+    stale = cache.get_or_load(path, load_json)
+    write_dataset(tmp_path, "A", seed=1)
+    os.utime(path, ns=(1, 1))
+    current = cache.get_or_load(path, load_json)
+
+    assert current is not stale
+    assert not cache.attach(path, stale, "derived", "value", 10)
+    assert cache.get_attachment(path, current, "derived") is None
+
+
+def test_attachment_evicts_other_datasets_and_respects_the_budget(tmp_path):
+    first, second = write_dataset(tmp_path, "A"), write_dataset(tmp_path, "B", seed=1)
+    probe = DatasetCache()
+    first_bytes = estimate_dataset_bytes(probe.get_or_load(first, load_json))
+    second_bytes = estimate_dataset_bytes(probe.get_or_load(second, load_json))
+
+    cache = DatasetCache(max_bytes=first_bytes + second_bytes + 100)
+    cache.get_or_load(first, load_json)
+    dataset = cache.get_or_load(second, load_json)
+    assert cache.attach(second, dataset, "derived", "value", 200)
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["current_bytes"] == second_bytes + 200
+
+    # An attachment that cannot fit next to its own dataset is not retained
+    assert not cache.attach(second, dataset, "derived", "huge", cache.max_bytes)
+    assert cache.get_attachment(second, dataset, "derived") is None
+    assert cache.stats()["current_bytes"] == second_bytes
+
+
+def test_analytics_live_in_the_dataset_cache(tmp_path):
+    write_dataset(tmp_path, "SPX_Greeks")
+    cache = DatasetCache()
+    repo = DatasetRepository(str(tmp_path), cache=cache)
+    service = OptionAnalyticsService(repo)
+
+    store, analytics = service.get_analytics("SPX_Greeks")
+    dataset = repo.load_dataset("SPX_Greeks")
+    assert cache.stats()["current_bytes"] == estimate_dataset_bytes(dataset) + analytics.nbytes
+    assert service.get_analytics("SPX_Greeks")[1] is analytics
+    # The build lock is only kept while a build runs or is waited for
+    assert len(service.cache._build_locks) == 0
+
+    # Dropping the dataset drops its analytics; the sidecar then serves the next request
+    cache.invalidate(repo.resolve_dataset_path("SPX_Greeks"))
+    reread = service.get_analytics("SPX_Greeks")[1]
+    assert reread is not analytics and reread.version == analytics.version
+    assert (tmp_path / ".analytics" / "SPX_Greeks.greeks.npz").exists()
+
+
+def test_sidecar_from_an_older_solver_is_rebuilt(tmp_path):
+    write_dataset(tmp_path, "SPX_Greeks")
+    service = OptionAnalyticsService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    analytics = service.get_analytics("SPX_Greeks")[1]
+
+    # Same dataset version and rate, but written before sidecars carried a format number
+    sidecar = tmp_path / ".analytics" / "SPX_Greeks.greeks.npz"
+    stale = {name: np.full_like(values, 0.05) for name, values in analytics.columns.items()}
+    np.savez(
+        sidecar, version=np.array(analytics.version), rate=np.array(analytics.rate),
+        date_count=np.array(analytics.date_count), contract_count=np.array(analytics.contract_count),
+        keys=analytics.keys, **stale
+    )
+
+    fresh_service = OptionAnalyticsService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    rebuilt = fresh_service.get_analytics("SPX_Greeks")[1]
+    for name, values in analytics.columns.items():
+        np.testing.assert_array_equal(rebuilt.columns[name], values)
+    with np.load(sidecar) as archive:
+        assert int(archive["format"]) == ANALYTICS_FORMAT
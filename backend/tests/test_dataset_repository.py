@@ -0,0 +1,64 @@
+import json
+import os
+import random
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from repositories.partitioned_store import PARTITIONED_SUFFIX
+from repositories.shared_datasets import SharedDatasetRegistry
+from tests.datasets import random_rows, write_json_dataset
+
+
+def make_appended_dataset(tmp_path):
+    # A JSON dataset with a later batch of dates appended to it
+    rng = random.Random(7)
+    expiries = ["2024-01-19", "2024-02-16"]
+    source = write_json_dataset(tmp_path / "SPX_Test.json", random_rows(rng, ["2024-01-02", "2024-01-03"], expiries))
+    batch = write_json_dataset(tmp_path / "batch.json", random_rows(rng, ["2024-01-04", "2024-01-05"], expiries))
+    repo = DatasetRepository(str(tmp_path))
+    repo.append_dataset("SPX_Test", batch)
+    return repo, source
+
+
+def test_manifest_wins_over_a_newer_source(tmp_path):
+    repo, source = make_appended_dataset(tmp_path)
+    manifest_path = tmp_path / f"SPX_Test{PARTITIONED_SUFFIX}"
+    assert repo.resolve_dataset_path("SPX_Test") == manifest_path
+
+    # Touching the converted JSON must not hide the appended days
+    future_ns = manifest_path.stat().st_mtime_ns + 10 ** 10
+    os.utime(source, ns=(future_ns, future_ns))
+    assert repo.resolve_dataset_path("SPX_Test") == manifest_path
+    dataset = repo.load_dataset("SPX_Test")
+    assert dataset.metadata.date_range == {"start": "2024-01-02", "end": "2024-01-05"}
+
+
+def test_remove_partitioned_serves_the_remaining_files(tmp_path):
+    repo, source = make_appended_dataset(tmp_path)
+    assert repo.load_dataset("SPX_Test").metadata.date_range["end"] == "2024-01-05"
+
+    repo.remove_partitioned("SPX_Test")
+    assert repo.resolve_dataset_path("SPX_Test") == source
+    assert not (tmp_path / "SPX_Test.parts").exists()
+    assert repo.load_dataset("SPX_Test").metadata.date_range["end"] == "2024-01-03"
+
+
+def test_shared_export_keeps_the_source_metadata(tmp_path):
+    # Metadata that disagrees with the rows is served as written, shared or not
+    rng = random.Random(3)
+    rows = random_rows(rng, ["2024-01-02", "2024-01-03"], ["2024-01-19"])
+    document = json.loads(write_json_dataset(tmp_path / "SPX_Meta.json", rows).read_text())
+    document["metadata"] = {
+        "dataset_name": "SPX Meta", "date_range": {"start": "2023-12-01", "end": "2024-01-31"}, "record_count": 999
+    }
+    (tmp_path / "SPX_Meta.json").write_text(json.dumps(document))
+
+    private = DatasetRepository(str(tmp_path), cache=DatasetCache())
+    shared = DatasetRepository(
+        str(tmp_path), cache=DatasetCache(), shared=SharedDatasetRegistry(root=tmp_path / "shared", enabled=True)
+    )
+    private_dataset = private.load_dataset("SPX_Meta")
+    shared_dataset = shared.load_dataset("SPX_Meta")
+    assert shared.get_shared_binary_path("SPX_Meta").is_relative_to(tmp_path / "shared")
+    assert shared_dataset.metadata == private_dataset.metadata
+    assert shared_dataset.metadata.record_count == 999
+    assert shared_dataset._columnar_store.record_count == private_dataset._columnar_store.record_count == len(rows)
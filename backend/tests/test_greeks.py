@@ -0,0 +1,98 @@
+import math
+import numpy as np
+import pytest
+from components.greeks import TRADING_DAYS_PER_YEAR, black_scholes_greeks, implied_volatility
+from components.pricing import black_scholes_price
+
+RATES = (0.0, 0.04)
+
+
+def contract_grid():
+    # Calls and puts from deep in to deep out of the money, one day to three years, 5% to 300% volatility
+    grid = np.meshgrid(
+        [True, False],
+        [60.0, 80.0, 95.0, 100.0, 105.0, 120.0, 150.0],
+        [1 / TRADING_DAYS_PER_YEAR, 5 / TRADING_DAYS_PER_YEAR, 0.25, 1.0, 3.0],
+        [0.05, 0.2, 0.6, 1.49, 3.0],
+        indexing="ij"
+    )
+    is_call, strike, years, volatility = (array.ravel() for array in grid)
+    return is_call, np.full(len(strike), 100.0), strike, years, volatility
+
+
+def exact_price(is_call, spot, strike, years, volatility, rate):
+    # Black-Scholes with the exact normal CDF, independent of the approximation the engine prices with
+    def price(call, s, k, t, vol):
+        d1 = (math.log(s / k) + (rate + 0.5 * vol * vol) * t) / (vol * math.sqrt(t))
+        d2 = d1 - vol * math.sqrt(t)
+        cdf = lambda x: 0.5 * math.erfc(-x / math.sqrt(2))
+        if call:
+            return s * cdf(d1) - k * math.exp(-rate * t) * cdf(d2)
+        return k * math.exp(-rate * t) * cdf(-d2) - s * cdf(-d1)
+    return np.vectorize(price, otypes=[np.float64])(is_call, spot, strike, years, volatility)
+
+
+@pytest.mark.parametrize("rate", RATES)
+def test_implied_volatility_round_trips_model_prices(rate):
+    is_call, spot, strike, years, volatility = contract_grid()
+    price = black_scholes_price(is_call, spot, strike, years, volatility, rate)
+    solved = implied_volatility(is_call, spot, strike, years, price, rate)
+
+    # Quotes with any time value are solved; quotes at their discounted intrinsic value have no volatility
+    discounted_strike = strike * np.exp(-rate * years)
+    intrinsic = np.where(is_call, np.maximum(spot - discounted_strike, 0), np.maximum(discounted_strike - spot, 0))
+    time_value = price - intrinsic
+    assert not np.isnan(solved[time_value > 1e-9]).any()
+    assert np.isnan(solved[time_value <= 0]).all()
+
+    found = ~np.isnan(solved)
+    repriced = black_scholes_price(is_call, spot, strike, years, solved, rate)
+    assert np.max(np.abs(repriced[found] - price[found])) < 1e-6
+    # Where the price responds to volatility at all, the volatility itself comes back
+    vega = black_scholes_greeks(is_call, spot, strike, years, volatility, rate)["vega"] * 100
+    assert np.max(np.abs(solved - volatility)[found & (vega > 1e-3)]) < 1e-6
+
+
+def test_quotes_priced_below_tolerance_are_solved():
+    # Far out of the money a day before expiry: worth ~1e-13 and ~4e-10 at 149% volatility. The
+    # price error is below tolerance at any volatility, so only a vega-scaled check finds the root.
+    strike = np.array([200.0, 180.0])
+    years = np.full(2, 1 / TRADING_DAYS_PER_YEAR)
+    price = black_scholes_price(True, 100.0, strike, years, 1.49)
+    assert (price < 1e-6).all()
+    np.testing.assert_allclose(implied_volatility(True, 100.0, strike, years, price), 1.49, atol=1e-5)
+
+
+def test_unsolvable_quotes_have_no_implied_volatility():
+    is_call = np.array([True, True, True, False, True, False])
+    years = np.array([0.0, 0.5, 0.5, 0.5, 0.5, 0.5])
+    strike = np.array([100.0, 80.0, 100.0, 100.0, 100.0, 120.0])
+    # Expired, below intrinsic, above the spot, above the strike, NaN, no time value
+    price = np.array([3.0, 19.0, 100.0, 100.0, np.nan, 20.0])
+    assert np.isnan(implied_volatility(is_call, 100.0, strike, years, price)).all()
+
+
+@pytest.mark.parametrize("rate", RATES)
+def test_greeks_match_finite_differences(rate):
+    is_call, spot, strike, years, volatility = contract_grid()
+    greeks = black_scholes_greeks(is_call, spot, strike, years, volatility, rate)
+    price = lambda s=spot, t=years, vol=volatility: exact_price(is_call, s, strike, t, vol, rate)
+
+    spot_step = 1e-3 * spot * volatility * np.sqrt(years)
+    delta = (price(s=spot + spot_step) - price(s=spot - spot_step)) / (2 * spot_step)
+    gamma = (price(s=spot + spot_step) - 2 * price() + price(s=spot - spot_step)) / spot_step ** 2
+    vega = (price(vol=volatility + 1e-5) - price(vol=volatility - 1e-5)) / 2e-5 / 100
+    theta = -(price(t=years + 1e-6) - price(t=years - 1e-6)) / 2e-6 / TRADING_DAYS_PER_YEAR
+
+    np.testing.assert_allclose(greeks["delta"], delta, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(greeks["gamma"], gamma, rtol=1e-3, atol=1e-6)
+    np.testing.assert_allclose(greeks["vega"], vega, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(greeks["theta"], theta, rtol=1e-4, atol=1e-6)
+
+
+def test_greeks_are_nan_for_expired_contracts_and_missing_volatility():
+    greeks = black_scholes_greeks(
+        np.array([True, False, True]), 100.0, 100.0, np.array([0.0, 0.5, 0.5]), np.array([0.2, np.nan, 0.2])
+    )
+    for values in greeks.values():
+        assert np.isnan(values[:2]).all() and not np.isnan(values[2])
@@ -0,0 +1,93 @@
+import json
+import random
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from controllers.job_controller import router
+from models.backtest import BacktestRequest
+from services.container import container
+from tests.datasets import random_request, write_random_dataset
+from tests.test_job_service import blocking_task
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(container, "data_dir", str(tmp_path))
+    monkeypatch.setattr(container, "_instances", {})
+    app = FastAPI()
+    app.include_router(router)
+    yield TestClient(app)
+    container.shutdown()
+
+
+def read_events(client, events_url):
+    # (event, data) pairs of the job's server-sent event stream, which ends once the job finishes
+    events = []
+    with client.stream("GET", events_url) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        event = None
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                event = line.removeprefix("event: ")
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line.removeprefix("data: "))))
+    return events
+
+
+def test_job_streams_progress_and_serves_its_result(client, tmp_path):
+    _, schedule = write_random_dataset(tmp_path, "jobs", 1)
+    rng = random.Random(1)
+    body = random_request(rng, "jobs", schedule)
+    while container.backtest_service().execute_backtest(BacktestRequest(**body)).status != "success":
+        body = random_request(rng, "jobs", schedule)
+
+    submitted = client.post("/api/backtest/jobs", json=body)
+    assert submitted.status_code == 202
+    links = submitted.json()
+
+    events = read_events(client, links["events_url"])
+    assert [event for event, _ in events[:-1]] == ["progress"] * (len(events) - 1)
+    assert events[-1][0] == "done"
+    assert (events[-1][1]["status"], events[-1][1]["progress"]) == ("succeeded", 1.0)
+    progress = [data["progress"] for _, data in events]
+    assert progress == sorted(progress)
+
+    result = client.get(links["result_url"])
+    assert result.status_code == 200
+    expected = container.backtest_service().execute_backtest(BacktestRequest(**body)).model_dump(mode="json")
+    assert {key: value for key, value in result.json().items() if key != "execution_time_ms"} == (
+        {key: value for key, value in expected.items() if key != "execution_time_ms"}
+    )
+    # Cancelling a finished job changes nothing
+    assert client.post(links["cancel_url"]).json()["status"] == "succeeded"
+
+
+def test_cancelled_job_ends_its_stream_and_has_no_result(client):
+    started, release = threading.Event(), threading.Event()
+    steps = []
+    job = container.job_manager().submit(blocking_task(started, release, steps))
+    assert started.wait(5)
+    base_url = f"/api/backtest/jobs/{job.job_id}"
+
+    assert client.get(base_url).json()["status"] == "running"
+    result = client.get(f"{base_url}/result")
+    assert (result.status_code, result.json()["detail"]["error_code"]) == (409, "JOB_NOT_COMPLETE")
+
+    assert client.post(f"{base_url}/cancel").json()["status"] == "running"
+    release.set()
+    events = read_events(client, f"{base_url}/events")
+    assert events[-1][0] == "done" and events[-1][1]["status"] == "cancelled"
+    assert steps == ["first"]
+
+    result = client.get(f"{base_url}/result")
+    assert (result.status_code, result.json()["detail"]["error_code"]) == (409, "JOB_HAS_NO_RESULT")
+
+
+def test_unknown_job_is_not_found(client):
+    for response in (
+        client.get("/api/backtest/jobs/missing"),
+        client.get("/api/backtest/jobs/missing/events"),
+        client.post("/api/backtest/jobs/missing/cancel")
+    ):
+        assert (response.status_code, response.json()["detail"]["error_code"]) == (404, "JOB_NOT_FOUND")
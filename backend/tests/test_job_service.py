@@ -0,0 +1,156 @@
+import random
+import threading
+import pytest
+from models.backtest import BacktestRequest
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from services.backtest_service import BacktestService
+from services.job_service import JobManager, JobQueueFullError
+from tests.datasets import random_request, write_random_dataset
+
+
+def wait_until_finished(job):
+    # Jobs cancelled while queued never run, so there is nothing to wait for
+    if not job.future.cancelled():
+        job.future.result(5)
+    assert job.is_finished
+
+
+def blocking_task(started: threading.Event, release: threading.Event, steps: list):
+    # Reports progress, waits for the test, then reports again; records every step it got past
+    def task(progress):
+        progress("first", 0.25)
+        steps.append("first")
+        started.set()
+        release.wait(5)
+        progress("second", 0.75)
+        steps.append("second")
+        return "result"
+    return task
+
+
+def test_submitted_job_succeeds_with_its_result():
+    manager = JobManager(max_workers=1)
+    steps = []
+    started, release = threading.Event(), threading.Event()
+    job = manager.submit(blocking_task(started, release, steps))
+
+    assert started.wait(5)
+    running = manager.get(job.job_id).to_status()
+    assert (running.status, running.stage, running.progress) == ("running", "first", 0.25)
+
+    release.set()
+    wait_until_finished(job)
+    status = manager.get(job.job_id).to_status()
+    assert (status.status, status.stage, status.progress) == ("succeeded", "done", 1.0)
+    assert job.result == "result" and steps == ["first", "second"]
+    manager.shutdown()
+
+
+def test_cancelled_running_job_stops_at_its_next_progress_report():
+    manager = JobManager(max_workers=1)
+    steps = []
+    started, release = threading.Event(), threading.Event()
+    job = manager.submit(blocking_task(started, release, steps))
+    assert started.wait(5)
+
+    assert manager.cancel(job.job_id).status == "running"
+    release.set()
+    wait_until_finished(job)
+    assert (job.status, job.message) == ("cancelled", "Job cancelled while running")
+    assert steps == ["first"] and job.result is None
+    manager.shutdown()
+
+
+def test_cancelled_queued_job_never_runs():
+    manager = JobManager(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    running = manager.submit(blocking_task(started, release, []))
+    assert started.wait(5)
+
+    ran = threading.Event()
+    queued = manager.submit(lambda progress: ran.set())
+    cancelled = manager.cancel(queued.job_id)
+    assert (cancelled.status, cancelled.message) == ("cancelled", "Job cancelled before it started")
+
+    release.set()
+    wait_until_finished(running)
+    manager.shutdown()
+    assert not ran.is_set()
+    # Cancelling a finished job leaves it as it was
+    assert manager.cancel(running.job_id).status == "succeeded"
+
+
+def test_cancelled_backtest_stops_between_stages(tmp_path):
+    _, schedule = write_random_dataset(tmp_path, "jobs", 0)
+    service = BacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    rng = random.Random(0)
+    request = BacktestRequest(**random_request(rng, "jobs", schedule))
+    while service.execute_backtest(request).status != "success":
+        request = BacktestRequest(**random_request(rng, "jobs", schedule))
+
+    manager = JobManager(max_workers=1)
+    submitted = threading.Event()
+    stages = []
+    job_ids = []
+
+    def task(progress):
+        submitted.wait(5)
+
+        def report(stage, fraction):
+            stages.append(stage)
+            if stage == "gathering_prices":
+                # Cancelled while the backtest runs, as a client would between two polls
+                manager.cancel(job_ids[0])
+            progress(stage, fraction)
+        return service.execute_backtest(request, report)
+
+    job = manager.submit(task)
+    job_ids.append(job.job_id)
+    submitted.set()
+    wait_until_finished(job)
+
+    assert job.status == "cancelled" and job.result is None
+    assert stages[-1] == "gathering_prices" and "building_response" not in stages
+    manager.shutdown()
+
+
+def test_failing_job_reports_its_error():
+    manager = JobManager(max_workers=1)
+
+    def task(progress):
+        raise ValueError("broken")
+    job = manager.submit(task)
+    wait_until_finished(job)
+    assert (job.status, job.error_code, job.message) == ("failed", "JOB_FAILED", "Job failed: broken")
+    manager.shutdown()
+
+
+def test_queue_depth_counts_queued_and_running_jobs():
+    manager = JobManager(max_workers=1, max_queue_depth=2)
+    started, release = threading.Event(), threading.Event()
+    first = manager.submit(blocking_task(started, release, []))
+    second = manager.submit(lambda progress: None)
+    with pytest.raises(JobQueueFullError):
+        manager.submit(lambda progress: None)
+
+    release.set()
+    wait_until_finished(first)
+    wait_until_finished(second)
+    # Finished jobs no longer count
+    wait_until_finished(manager.submit(lambda progress: None))
+    manager.shutdown()
+
+
+def test_finished_jobs_are_purged_after_their_ttl(monkeypatch):
+    manager = JobManager(max_workers=1, result_ttl_seconds=60)
+    job = manager.submit(lambda progress: "result")
+    wait_until_finished(job)
+    assert manager.get(job.job_id) is job
+
+    finished = job.finished_monotonic
+    monkeypatch.setattr("services.job_service.time.monotonic", lambda: finished + 59)
+    assert manager.get(job.job_id) is job
+    monkeypatch.setattr("services.job_service.time.monotonic", lambda: finished + 61)
+    assert manager.get(job.job_id) is None
+    manager.shutdown()
@@ -0,0 +1,126 @@
+import random
+import pytest
+from models.backtest import BacktestRequest
+from models.multileg import MultiLegBacktestRequest
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from services.multileg_service import MultiLegBacktestService
+from tests.datasets import load_records, random_multileg_request, write_json_dataset, write_random_dataset
+from tests.reference import ScalarBacktester
+
+SEEDS = range(10)
+REQUESTS_PER_DATASET = 60
+
+
+def without_timing(response):
+    return response.model_dump(exclude={"execution_time_ms", "timings"})
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_multileg_backtest_matches_scalar_reference(tmp_path, seed):
+    path, schedule = write_random_dataset(tmp_path, "legs", seed)
+    reference = ScalarBacktester(load_records(path))
+    service = MultiLegBacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    rng = random.Random(seed)
+
+    error_codes = set()
+    for _ in range(REQUESTS_PER_DATASET):
+        request = MultiLegBacktestRequest(**random_multileg_request(rng, "legs", schedule))
+        expected = reference.execute_multileg_backtest(request)
+        assert without_timing(service.execute_backtest(request)) == expected
+        error_codes.add(expected["error_code"])
+    assert None in error_codes
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_every_leg_matches_its_single_backtest(tmp_path, seed):
+    path, schedule = write_random_dataset(tmp_path, "legs", seed)
+    reference = ScalarBacktester(load_records(path))
+    service = MultiLegBacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    rng = random.Random(seed)
+
+    for _ in range(REQUESTS_PER_DATASET):
+        request = MultiLegBacktestRequest(**random_multileg_request(rng, "legs", schedule))
+        response = service.execute_backtest(request)
+        if response.status == "error":
+            continue
+
+        # Each leg is the single-leg backtest of its contract over the same window (capped at its expiry)
+        summary = response.strategy_summary
+        singles = [
+            reference.execute_backtest(BacktestRequest(
+                strategy={**leg.model_dump(), "dataset_name": "legs"},
+                date_range={"start_date": request.date_range.start_date, "end_date": response.backtest_period.end_date}
+            ))
+            for leg in request.strategy.legs
+        ]
+        for leg, single in zip(summary.legs, singles):
+            assert single["status"] == "success"
+            assert single["strategy_summary"]["entry_date"] == summary.entry_date
+            assert leg.entry_price == single["strategy_summary"]["entry_price"]
+            assert leg.final_pnl == single["results"]["final_pnl"]
+            assert leg.position_closed == single["results"]["position_closed"]
+
+        # Days past a leg's expiry repeat its final P/L; the combined series is within rounding of the sum
+        for day, combined in enumerate(response.results.daily_pnl):
+            legs_total = sum(
+                single["results"]["daily_pnl"][min(day, len(single["results"]["daily_pnl"]) - 1)]["cumulative_pnl"]
+                for single in singles
+            )
+            assert abs(combined.cumulative_pnl - legs_total) <= 0.005 * (len(singles) + 1)
+        assert response.results.position_closed == all(leg.position_closed for leg in summary.legs)
+
+
+def test_credit_spread_settles_each_leg_on_its_own_expiry(tmp_path):
+    # A calendar-style credit spread: the short near-dated call settles in the money on 2024-01-05,
+    # the long far-dated call keeps marking to market until the window ends
+    rows = [
+        {"date": date, "underlying": underlying, "expiry": expiry, "strike": 100.0, "type": "call", "mid_price": price}
+        for date, underlying, near, far in [
+            ("2024-01-02", 100.0, 6.0, 4.0), ("2024-01-03", 104.0, 7.5, 5.0),
+            ("2024-01-05", 103.0, 3.2, 4.5), ("2024-01-08", 99.0, None, 3.0)
+        ]
+        for expiry, price in [("2024-01-05", near), ("2024-02-16", far)]
+        if price is not None
+    ]
+    write_json_dataset(tmp_path / "spread.json", rows)
+    service = MultiLegBacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    legs = [
+        {"option_type": "call", "strike": 100.0, "expiry": "2024-01-05", "position_direction": "sell", "quantity": 2},
+        {"option_type": "call", "strike": 100.0, "expiry": "2024-02-16", "position_direction": "buy", "quantity": 1}
+    ]
+    response = service.execute_backtest(MultiLegBacktestRequest(
+        strategy={"dataset_name": "spread", "legs": legs},
+        date_range={"start_date": "2024-01-01", "end_date": "2024-01-31"}
+    ))
+
+    assert response.status == "success"
+    summary = response.strategy_summary
+    # Premium received for two short calls exceeds the long one's cost, so the entry is a net credit
+    assert summary.entry_cost == (-2 * 6.0 + 4.0) * 100
+    short, long = summary.legs
+    assert (short.position_closed, short.final_pnl) == (True, (3.0 - 6.0) * -2 * 100)
+    assert (long.position_closed, long.final_pnl) == (False, (3.0 - 4.0) * 100)
+    assert [day.cumulative_pnl for day in response.results.daily_pnl] == [0.0, -200.0, 650.0, 500.0]
+    assert (response.results.position_closed, response.results.exit_reason) == (False, "backtest_end")
+
+
+def test_leg_without_entry_quote_is_an_error(tmp_path):
+    rows = [
+        {"date": "2024-01-02", "underlying": 100.0, "expiry": "2024-01-19", "strike": 100.0, "type": "put",
+         "mid_price": 2.0},
+        {"date": "2024-01-03", "underlying": 100.0, "expiry": "2024-01-19", "strike": 110.0, "type": "put",
+         "mid_price": 9.0}
+    ]
+    write_json_dataset(tmp_path / "gaps.json", rows)
+    service = MultiLegBacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    legs = [
+        {"option_type": "put", "strike": 100.0, "expiry": "2024-01-19", "position_direction": "buy", "quantity": 1},
+        {"option_type": "put", "strike": 110.0, "expiry": "2024-01-19", "position_direction": "sell", "quantity": 1}
+    ]
+    response = service.execute_backtest(MultiLegBacktestRequest(
+        strategy={"dataset_name": "gaps", "legs": legs},
+        date_range={"start_date": "2024-01-02", "end_date": "2024-01-03"}
+    ))
+    assert (response.status, response.error_code) == ("error", "NO_PRICING_DATA")
+    assert response.message == "No pricing data for leg 2 (sell 1 put 110 2024-01-19) on entry date 2024-01-02"
@@ -0,0 +1,39 @@
+import random
+import orjson
+import pytest
+from models.backtest import BacktestRequest
+from repositories.dataset_repository import DatasetRepository
+from services.backtest_service import BacktestService
+from tests.datasets import random_request, random_rows, random_schedule, write_json_dataset
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("rows_per_chunk", [1, 2, 3, 500])
+def test_stream_matches_json_response(tmp_path, seed, rows_per_chunk):
+    rng = random.Random(seed)
+    schedule = random_schedule(rng)
+    write_json_dataset(tmp_path / "stream.json", random_rows(rng, schedule["dates"], schedule["expiries"]))
+    service = BacktestService(DatasetRepository(str(tmp_path)))
+
+    for _ in range(30):
+        request = BacktestRequest(**random_request(rng, "stream", schedule))
+        expected = service.execute_backtest(request).model_dump()
+        events = [
+            orjson.loads(line)
+            for chunk in service.iter_ndjson_events(request, rows_per_chunk)
+            for line in chunk.splitlines()
+        ]
+
+        if expected["status"] == "error":
+            assert events == [{
+                "type": "error", "status": "error", "message": expected["message"], "error_code": expected["error_code"]
+            }]
+            continue
+        summary, rows, results = events[0], events[1:-1], events[-1]
+        assert summary["strategy_summary"] == expected["strategy_summary"]
+        assert summary["backtest_period"] == expected["backtest_period"]
+        assert [{key: row[key] for key in ("date", "cumulative_pnl", "underlying_price")} for row in rows] == (
+            expected["results"]["daily_pnl"]
+        )
+        expected_results = {key: value for key, value in expected["results"].items() if key != "daily_pnl"}
+        assert {key: value for key, value in results.items() if key in expected_results} == expected_results
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import pytest
+from services.request_executor import ExecutorSaturatedError, ExecutorTimeoutError, RequestExecutor
+
+
+def run_blocked(executor: RequestExecutor, release: threading.Event, started: threading.Event):
+    # Occupy the executor's only worker until release is set
+    def block():
+        started.set()
+        release.wait(5)
+    return asyncio.ensure_future(executor.run(block))
+
+
+def test_cancelled_queued_call_releases_its_place():
+    executor = RequestExecutor(max_workers=1, max_queue=1, timeout_seconds=5)
+    release, started = threading.Event(), threading.Event()
+
+    async def scenario():
+        running = run_blocked(executor, release, started)
+        await asyncio.to_thread(started.wait, 5)
+        queued = asyncio.ensure_future(executor.run(lambda: "never"))
+        await asyncio.sleep(0.01)
+        assert executor.stats()["waiting"] == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert executor.stats()["waiting"] == 0
+
+        release.set()
+        await running
+        # The freed place accepts a new call
+        assert await executor.run(lambda: "ok") == "ok"
+
+    try:
+        asyncio.run(scenario())
+        stats = executor.stats()
+        assert (stats["waiting"], stats["running"]) == (0, 0)
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_timed_out_queued_call_releases_its_place():
+    executor = RequestExecutor(max_workers=1, max_queue=1, timeout_seconds=0.05)
+    release, started = threading.Event(), threading.Event()
+
+    async def scenario():
+        running = run_blocked(executor, release, started)
+        await asyncio.to_thread(started.wait, 5)
+        with pytest.raises(ExecutorTimeoutError):
+            await executor.run(lambda: "never")
+        assert executor.stats()["waiting"] == 0
+        release.set()
+        with pytest.raises(ExecutorTimeoutError):
+            await running
+
+    try:
+        asyncio.run(scenario())
+        assert executor.stats()["timed_out"] == 2
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_rejects_beyond_queue_limit():
+    executor = RequestExecutor(max_workers=1, max_queue=0, timeout_seconds=5)
+    release, started = threading.Event(), threading.Event()
+
+    async def scenario():
+        running = run_blocked(executor, release, started)
+        await asyncio.to_thread(started.wait, 5)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: "rejected")
+        release.set()
+        await running
+
+    try:
+        asyncio.run(scenario())
+        assert executor.stats()["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
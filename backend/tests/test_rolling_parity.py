@@ -0,0 +1,56 @@
+import random
+import pytest
+from models.backtest import BacktestRequest
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from services.backtest_service import BacktestService
+from tests.datasets import load_records, random_request, write_random_dataset
+from tests.reference import ScalarBacktester
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rolling_entries_match_individual_backtests(tmp_path, seed):
+    path, schedule = write_random_dataset(tmp_path, "rolling", seed)
+    reference = ScalarBacktester(load_records(path))
+    service = BacktestService(DatasetRepository(str(tmp_path), cache=DatasetCache()))
+    rng = random.Random(seed)
+
+    for _ in range(30):
+        body = random_request(rng, "rolling", schedule)
+        request = BacktestRequest(**body)
+        response = service.execute_rolling_backtest(request)
+        if response.status == "error":
+            continue
+
+        # Every trading day of the window is either tested as an entry or skipped for lack of a quote
+        window = [
+            date for date in reference.get_available_dates()
+            if request.date_range.start_date <= date <= min(request.date_range.end_date, request.strategy.expiry)
+        ]
+        results = response.results
+        assert results.summary.entries_tested + results.summary.entries_skipped == len(window)
+
+        for entry in results.entries:
+            # The same position opened on the entry date and held over the rest of the window
+            expected = reference.execute_backtest(BacktestRequest(
+                strategy=body["strategy"],
+                date_range={"start_date": entry.entry_date, "end_date": request.date_range.end_date}
+            ))
+            assert expected["status"] == "success"
+            assert (entry.entry_price, entry.total_days) == (
+                expected["strategy_summary"]["entry_price"], expected["backtest_period"]["total_days"]
+            )
+            assert (entry.final_pnl, entry.win_rate, entry.max_drawdown) == (
+                expected["results"]["final_pnl"], expected["results"]["win_rate"], expected["results"]["max_drawdown"]
+            )
+            assert (results.position_closed, results.exit_reason) == (
+                expected["results"]["position_closed"], expected["results"]["exit_reason"]
+            )
+
+        skipped = [
+            date for date in window
+            if reference.get_option_price(
+                date, request.strategy.strike, request.strategy.expiry, request.strategy.option_type
+            ) is None
+        ]
+        assert [entry.entry_date for entry in results.entries] == [date for date in window if date not in skipped]
@@ -0,0 +1,106 @@
+import json
+import random
+import numpy as np
+import pytest
+from models.backtest import BacktestRequest
+from models.strategy import StrategyConfig
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from repositories.ingestion import ingest_file
+from services.backtest_service import BacktestService
+from tests.datasets import load_records, random_request, write_csv_rows, write_json_dataset, write_random_dataset
+from tests.reference import ScalarBacktester
+from utils.convert_dataset import convert_json_to_binary
+
+NAME = "backend"
+
+
+def build_converted(repo, path, rows):
+    convert_json_to_binary(path)
+
+
+def build_ingested_csv(repo, path, rows):
+    ingest_file(write_csv_rows(path.with_suffix(".csv"), rows), output_path=path.with_suffix(".optbin"))
+
+
+def build_partitioned(repo, path, rows):
+    repo.partition_dataset(NAME, ["expiry"])
+
+
+def build_partitioned_by_month(repo, path, rows):
+    repo.partition_dataset(NAME, ["expiry", "trade_month"])
+
+
+def build_appended(repo, path, rows):
+    # The first dates form the dataset; the rest arrive as a JSON batch and then a CSV batch
+    dates = sorted({row["date"] for row in rows})
+    cuts = [dates[len(dates) // 3], dates[2 * len(dates) // 3]]
+    write_json_dataset(path, [row for row in rows if row["date"] < cuts[0]])
+    batches = [
+        write_json_dataset(path.parent / "batch1.json", [row for row in rows if cuts[0] <= row["date"] < cuts[1]]),
+        write_csv_rows(path.parent / "batch2.csv", [row for row in rows if row["date"] >= cuts[1]])
+    ]
+    for batch in batches:
+        repo.append_dataset(NAME, batch)
+
+
+def build_sqlite(repo, path, rows):
+    repo.export_sqlite(NAME)
+
+
+BACKENDS = {
+    "json": lambda repo, path, rows: None,
+    "binary": build_converted,
+    "ingested_csv": build_ingested_csv,
+    "partitioned": build_partitioned,
+    "partitioned_by_month": build_partitioned_by_month,
+    "appended": build_appended,
+    "sqlite": build_sqlite
+}
+EXPECTED_SUFFIX = {
+    "json": ".json", "binary": ".optbin", "ingested_csv": ".optbin", "partitioned": ".optset",
+    "partitioned_by_month": ".optset", "appended": ".optset", "sqlite": ".sqlite"
+}
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+@pytest.mark.parametrize("seed", range(6))
+def test_backend_matches_json_baseline(tmp_path, backend, seed):
+    baseline_dir, data_dir = tmp_path / "baseline", tmp_path / "data"
+    baseline_dir.mkdir()
+    data_dir.mkdir()
+    baseline_path, schedule = write_random_dataset(baseline_dir, NAME, seed)
+    rows = json.loads(baseline_path.read_text())["data"]
+    if len({row["date"] for row in rows}) < 3 and backend == "appended":
+        pytest.skip("too few trading dates to split into batches")
+
+    path = write_json_dataset(data_dir / f"{NAME}.json", rows)
+    repo = DatasetRepository(str(data_dir), cache=DatasetCache())
+    BACKENDS[backend](repo, path, rows)
+    assert repo.resolve_dataset_path(NAME).suffix == EXPECTED_SUFFIX[backend]
+
+    baseline_repo = DatasetRepository(str(baseline_dir), cache=DatasetCache())
+    expected_store = baseline_repo.load_dataset(NAME)._columnar_store
+    store = repo.load_dataset(NAME)._columnar_store
+    assert store.dates == expected_store.dates
+    assert store.expiries == expected_store.expiries
+    assert store.strikes_by_expiry_type() == expected_store.strikes_by_expiry_type()
+    assert np.array_equal(store.underlying_by_date, expected_store.underlying_by_date)
+    all_contracts = np.arange(len(expected_store.contract_strikes), dtype=np.int64)
+    all_dates = np.arange(len(expected_store.dates), dtype=np.int64)
+    assert np.array_equal(
+        store.gather_matrix(all_contracts, all_dates), expected_store.gather_matrix(all_contracts, all_dates),
+        equal_nan=True
+    )
+
+    reference = ScalarBacktester(load_records(baseline_path))
+    service = BacktestService(repo)
+    rng = random.Random(seed)
+    for _ in range(40):
+        body = random_request(rng, NAME, schedule)
+        request = BacktestRequest(**body)
+        assert service.execute_backtest(request).model_dump(exclude={"execution_time_ms", "timings"}) == (
+            reference.execute_backtest(request)
+        )
+        strategy = StrategyConfig(**body["strategy"])
+        assert service.validate_strategy(strategy) == reference.validate_strategy(strategy)
@@ -0,0 +1,96 @@
+import random
+import pytest
+from models.backtest import BacktestRequest
+from models.sweep import SweepRequest
+from repositories.dataset_cache import DatasetCache
+from repositories.dataset_repository import DatasetRepository
+from repositories.shared_datasets import SharedDatasetRegistry
+from services.sweep_service import SweepService
+from tests.datasets import OPTION_TYPES, STRIKES, load_records, write_random_dataset
+from tests.reference import ScalarBacktester
+
+
+def sweep_request(rng, schedule, include_daily_pnl=True):
+    dates = schedule["dates"]
+    return SweepRequest(
+        strategy={
+            "dataset_name": "sweep",
+            "option_type": "call",
+            "strike": STRIKES[0],
+            "expiry": schedule["expiries"][0],
+            "position_direction": "buy",
+            "quantity": 1
+        },
+        date_range={"start_date": rng.choice(dates), "end_date": rng.choice(dates + ["2024-03-01"])},
+        strikes=list(STRIKES) + [95.0],
+        expiries=schedule["expiries"] + ["2023-12-01"],
+        option_types=list(OPTION_TYPES),
+        position_directions=["buy", "sell"],
+        quantities=[1, 3],
+        rank_by=rng.choice(["final_pnl", "win_rate", "max_drawdown"]),
+        include_daily_pnl=include_daily_pnl
+    )
+
+
+def assert_cells_match_reference(response, request, reference):
+    assert response.status == "success"
+    assert response.total_combinations == len(response.results)
+    for cell in response.results:
+        strategy = {
+            "dataset_name": "sweep",
+            "option_type": cell.option_type,
+            "strike": cell.strike,
+            "expiry": cell.expiry,
+            "position_direction": cell.position_direction,
+            "quantity": cell.quantity
+        }
+        expected = reference.execute_backtest(BacktestRequest(strategy=strategy, date_range=request.date_range))
+        if expected["status"] == "error":
+            assert (cell.status, cell.message, cell.error_code) == (
+                "error", expected["message"], expected["error_code"]
+            )
+            continue
+        results = expected["results"]
+        assert cell.status == "success"
+        assert (cell.entry_date, cell.entry_price, cell.total_days) == (
+            expected["strategy_summary"]["entry_date"],
+            expected["strategy_summary"]["entry_price"],
+            expected["backtest_period"]["total_days"]
+        )
+        assert (cell.final_pnl, cell.win_rate, cell.max_drawdown, cell.position_closed, cell.exit_reason) == (
+            results["final_pnl"], results["win_rate"], results["max_drawdown"],
+            results["position_closed"], results["exit_reason"]
+        )
+        if request.include_daily_pnl:
+            assert [day.model_dump() for day in cell.daily_pnl] == results["daily_pnl"]
+
+    ranked = [getattr(cell, request.rank_by) for cell in response.results if cell.status == "success"]
+    assert ranked == sorted(ranked, reverse=True)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_sweep_cells_match_scalar_backtests(tmp_path, seed):
+    path, schedule = write_random_dataset(tmp_path, "sweep", seed)
+    reference = ScalarBacktester(load_records(path))
+    service = SweepService(DatasetRepository(str(tmp_path), cache=DatasetCache()), max_workers=1)
+    rng = random.Random(seed)
+
+    for _ in range(4):
+        request = sweep_request(rng, schedule)
+        assert_cells_match_reference(service.run_sweep(request), request, reference)
+
+
+def test_pooled_sweep_matches_scalar_backtests(tmp_path):
+    path, schedule = write_random_dataset(tmp_path, "sweep", 3)
+    reference = ScalarBacktester(load_records(path))
+    repo = DatasetRepository(
+        str(tmp_path), cache=DatasetCache(), shared=SharedDatasetRegistry(root=tmp_path / "shared", enabled=False)
+    )
+    service = SweepService(repo, max_workers=2, chunk_size=7)
+    try:
+        request = sweep_request(random.Random(3), schedule)
+        assert_cells_match_reference(service.run_sweep(request), request, reference)
+        # The grid really was split across worker processes
+        assert service._executor is not None
+    finally:
+        service.shutdown()
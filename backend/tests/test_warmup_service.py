@@ -0,0 +1,53 @@
+import random
+from repositories.dataset_cache import DatasetCache, estimate_dataset_bytes
+from repositories.dataset_repository import DatasetRepository
+from services.warmup_service import WarmupService
+from tests.datasets import random_rows, write_json_dataset
+
+
+def write_datasets(tmp_path, names):
+    rng = random.Random(0)
+    for name in names:
+        write_json_dataset(tmp_path / f"{name}.json", random_rows(rng, ["2024-01-02", "2024-01-03"], ["2024-02-16"]))
+
+
+def warm(repo, names=None):
+    service = WarmupService(repo, names)
+    service.start()
+    service._thread.join(10)
+    return service
+
+
+def test_datasets_that_stay_cached_are_ready(tmp_path):
+    write_datasets(tmp_path, ["A", "B"])
+    readiness = warm(DatasetRepository(str(tmp_path), cache=DatasetCache())).readiness()
+
+    assert (readiness.status, readiness.datasets_total, readiness.datasets_finished) == ("ready", 2, 2)
+    assert [(warmup.dataset_name, warmup.status) for warmup in readiness.datasets] == [("A", "ready"), ("B", "ready")]
+    assert all(warmup.record_count and warmup.duration_ms is not None for warmup in readiness.datasets)
+
+
+def test_datasets_evicted_by_later_warmups_are_not_cached(tmp_path):
+    write_datasets(tmp_path, ["A", "B", "C"])
+    probe = DatasetRepository(str(tmp_path), cache=DatasetCache())
+    # Room for any one of the datasets, never two
+    cache = DatasetCache(max_bytes=max(estimate_dataset_bytes(probe.load_dataset(name)) for name in "ABC"))
+    repo = DatasetRepository(str(tmp_path), cache=cache)
+
+    service = warm(repo, ["A", "B", "C"])
+    readiness = service.readiness()
+    # Every dataset was attempted, so readiness is reached, but only the last one is still cached
+    assert (readiness.status, readiness.datasets_finished) == ("ready", 3)
+    assert [warmup.status for warmup in readiness.datasets] == ["not_cached", "not_cached", "ready"]
+    assert "DATASET_CACHE_MAX_BYTES" in readiness.datasets[0].message
+
+    # Loading it again (e.g. a request) makes it cached, which evicts the one after it
+    repo.load_dataset("A")
+    assert [warmup.status for warmup in service.readiness().datasets] == ["ready", "not_cached", "not_cached"]
+
+
+def test_missing_dataset_fails(tmp_path):
+    write_datasets(tmp_path, ["A"])
+    readiness = warm(DatasetRepository(str(tmp_path), cache=DatasetCache()), ["A", "missing"]).readiness()
+    assert readiness.status == "ready"
+    assert [warmup.status for warmup in readiness.datasets] == ["ready", "failed"]
@@ -0,0 +1,43 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from repositories.dataset_repository import DatasetRepository
+from repositories.ingestion import IngestionError
+from utils.ingest_dataset import print_progress
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Append new trading dates from a JSON or CSV file to an existing dataset"
+    )
+    parser.add_argument("dataset", help="Name of the dataset to extend")
+    parser.add_argument("sources", nargs="+", help="Files to append, in order")
+    parser.add_argument("--data-dir", default="data", help="Dataset directory")
+    parser.add_argument("--format", choices=["json", "csv"], help="Input format (defaults to the file suffix)")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress")
+    args = parser.parse_args()
+
+    dataset_repo = DatasetRepository(args.data_dir)
+    for source in args.sources:
+        start_time = time.time()
+        try:
+            metadata = dataset_repo.append_dataset(
+                args.dataset,
+                Path(source),
+                source_format=args.format,
+                progress_callback=None if args.quiet else print_progress
+            )
+        except (IngestionError, ValueError, OSError) as e:
+            print(f"Error appending {source} to {args.dataset}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        print(
+            f"Appended {source} to {args.dataset}: {metadata.record_count} records, "
+            f"{metadata.date_range['start']} to {metadata.date_range['end']} ({elapsed_ms} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
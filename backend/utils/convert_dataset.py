@@ -0,0 +1,53 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from models.options import OptionsDataset
+from repositories.binary_format import BINARY_SUFFIX, write_binary_dataset
+from repositories.columnar_store import get_columnar_store
+from repositories.dataset_catalog import DatasetCatalog, build_catalog_entry
+
+
+def convert_json_to_binary(json_path: Path, output_path: Path = None) -> Path:
+    # Validate a JSON dataset once and write it out in the memory-mappable binary format,
+    # along with its metadata catalog sidecar
+    output_path = output_path or json_path.with_suffix(BINARY_SUFFIX)
+
+    with open(json_path, 'r') as f:
+        dataset = OptionsDataset(**json.load(f))
+
+    store = get_columnar_store(dataset)
+    write_binary_dataset(output_path, dataset.metadata, store)
+    DatasetCatalog(output_path.parent).write(
+        output_path.stem, build_catalog_entry(output_path, dataset.metadata, store)
+    )
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert JSON options datasets into the binary columnar format"
+    )
+    parser.add_argument("inputs", nargs="*", help="JSON dataset files to convert")
+    parser.add_argument("--all", action="store_true", help="Convert every JSON dataset in --data-dir")
+    parser.add_argument("--data-dir", default="data", help="Dataset directory used with --all")
+    parser.add_argument("--output", help="Output path (only valid with a single input)")
+    args = parser.parse_args()
+
+    inputs = [Path(path) for path in args.inputs]
+    if args.all:
+        inputs.extend(sorted(Path(args.data_dir).glob("*.json")))
+    if not inputs:
+        parser.error("no input files given")
+    if args.output and len(inputs) != 1:
+        parser.error("--output can only be used with a single input file")
+
+    for json_path in inputs:
+        start_time = time.time()
+        output_path = convert_json_to_binary(json_path, Path(args.output) if args.output else None)
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        print(f"Converted {json_path} -> {output_path} ({output_path.stat().st_size} bytes, {elapsed_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+import sys
+import time
+from repositories.dataset_repository import DatasetRepository
+from repositories.ingestion import IngestionError
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve datasets from SQLite so they are queried on disk instead of held in memory"
+    )
+    parser.add_argument("datasets", nargs="+", help="Names of the datasets to export")
+    parser.add_argument("--data-dir", default="data", help="Dataset directory")
+    args = parser.parse_args()
+
+    dataset_repo = DatasetRepository(args.data_dir)
+    for dataset_name in args.datasets:
+        start_time = time.time()
+        try:
+            metadata = dataset_repo.export_sqlite(dataset_name)
+        except (IngestionError, ValueError, OSError) as e:
+            print(f"Error exporting {dataset_name}: {e}", file=sys.stderr)
+            sys.exit(1)
+        if metadata is None:
+            print(f"Dataset '{dataset_name}' not found", file=sys.stderr)
+            sys.exit(1)
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        print(f"Exported {dataset_name} to SQLite: {metadata.record_count} records ({elapsed_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,319 @@
+import argparse
 import json
-from datetime import datetime, timedelta
-import random
-
-
-def generate_sample_dataset(output_filepath: str, start_date_str: str, days: int = 30):
-    current_underlying = 4800.0
-    strikes = [4700, 4750, 4800, 4850, 4900]
-    data_records = []
-
-    current_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-    expiry_date = current_date + timedelta(days=5)
-    all_dates = []
-
-    for day in range(days):
-        current_underlying += random.uniform(-50, 50)
-        current_underlying = max(4500, min(5100, current_underlying))
-
-        date_str = current_date.strftime('%Y-%m-%d')
-        expiry_str = expiry_date.strftime('%Y-%m-%d')
-        all_dates.append(date_str)
-
-        for strike in strikes:
-            moneyness_call = current_underlying - strike
-            call_price = max(5, moneyness_call + random.uniform(10, 50) if moneyness_call > 0 else random.uniform(5, 30))
-
-            data_records.append({
-                'date': date_str,
-                'underlying': round(current_underlying, 2),
-                'expiry': expiry_str,
-                'strike': strike,
-                'type': 'call',
-                'mid_price': round(call_price, 2)
-            })
-
-            moneyness_put = strike - current_underlying
-            put_price = max(5, moneyness_put + random.uniform(10, 50) if moneyness_put > 0 else random.uniform(5, 30))
-
-            data_records.append({
-                'date': date_str,
-                'underlying': round(current_underlying, 2),
-                'expiry': expiry_str,
-                'strike': strike,
-                'type': 'put',
-                'mid_price': round(put_price, 2)
-            })
-
-        current_date += timedelta(days=1)
-
-        if day % 5 == 4:
-            expiry_date = current_date + timedelta(days=5)
-
-    metadata = {
-        'dataset_name': output_filepath.split('/')[-1].replace('.json', ''),
-        'date_range': {
-            'start': all_dates[0],
-            'end': all_dates[-1]
-        },
-        'record_count': len(data_records)
-    }
-
-    output = {
-        'metadata': metadata,
-        'data': data_records
-    }
-
-    with open(output_filepath, 'w') as jsonfile:
-        json.dump(output, jsonfile, indent=2)
-
-    print(f"✅ Generated {len(data_records)} records")
-    print(f"📁 Saved to: {output_filepath}")
-    print(f"📅 Date range: {all_dates[0]} to {all_dates[-1]}")
-    print(f"💰 Strikes: {strikes}")
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from components.pricing import black_scholes_price
+from models.options import DatasetMetadata
+from repositories.binary_format import BINARY_SUFFIX, write_binary_dataset
+from repositories.columnar_store import OPTION_TYPES, ColumnarOptionsStore
+from repositories.dataset_catalog import DatasetCatalog, build_catalog_entry
+from repositories.ingestion import RECORD_FIELDS
 
+TRADING_DAYS_PER_YEAR = 252
+# Rows generated (and written) at a time; memory use depends on this, not on the dataset size
+DEFAULT_CHUNK_ROWS = 1_000_000
+# Quotes never go below one tick, so every row passes ingestion's positive-price check
+MIN_PRICE = 0.05
+OUTPUT_SUFFIXES = {"json": ".json", "csv": ".csv", "binary": BINARY_SUFFIX}
 
-if __name__ == "__main__":
-    generate_sample_dataset(
-        output_filepath='backend/data/SPX_Sample.json',
-        start_date_str='2024-01-02',
-        days=30
+# Column dtypes of a generated chunk, as stored by the binary format
+_CHUNK_COLUMNS = {
+    "date_codes": np.int32,
+    "expiry_codes": np.int32,
+    "strikes": np.float64,
+    "type_codes": np.int8,
+    "mid_prices": np.float64,
+    "underlyings": np.float64
+}
+ChainChunks = Iterator[Dict[str, np.ndarray]]
+
+
+@dataclass
+class ChainConfig:
+    # Every date lists the next listed_expiries expiries (one every expiry_interval trading days),
+    # each with the full strike grid in both calls and puts
+    dataset_name: str
+    start_date: str = "2024-01-02"
+    days: int = 30
+    underlying_price: float = 4800.0
+    # Annualised drift and volatility of the simulated underlying; the volatility is also used to price
+    # at-the-money contracts
+    drift: float = 0.05
+    volatility: float = 0.18
+    # Change in pricing volatility per unit of log-moneyness (negative: puts richer than calls)
+    skew: float = -0.2
+    rate: float = 0.04
+    strike_step: float = 50.0
+    strikes_per_side: int = 2
+    # Explicit strike grid; overrides strike_step/strikes_per_side
+    strikes: Optional[List[float]] = None
+    expiry_interval: int = 5
+    listed_expiries: int = 1
+    seed: int = 0
+
+
+@dataclass
+class GenerationResult:
+    dataset_name: str
+    output_path: Path
+    record_count: int
+    date_range: Dict[str, str]
+
+
+def strike_grid(config: ChainConfig) -> np.ndarray:
+    if config.strikes:
+        strikes = np.unique(np.asarray(config.strikes, dtype=np.float64))
+    else:
+        center = round(config.underlying_price / config.strike_step) * config.strike_step
+        strikes = center + config.strike_step * np.arange(-config.strikes_per_side, config.strikes_per_side + 1)
+    if len(strikes) == 0 or strikes[0] <= 0:
+        raise ValueError("Strikes must be greater than 0; use a smaller strike grid")
+    return strikes
+
+
+def build_schedule(config: ChainConfig) -> Tuple[List[str], List[str], np.ndarray]:
+    # Trading dates (weekdays) and the expiry calendar: expiry j falls on trading day
+    # expiry_interval * (j + 1) - 1, so every expiry is itself a trading date
+    if config.days < 1 or config.expiry_interval < 1 or config.listed_expiries < 1:
+        raise ValueError("days, expiry interval and listed expiries must be at least 1")
+    last_expiry = (config.days - 1) // config.expiry_interval + config.listed_expiries - 1
+    horizon = max(config.days, config.expiry_interval * (last_expiry + 1))
+    calendar = np.busday_offset(np.datetime64(config.start_date, "D"), np.arange(horizon), roll="forward")
+    dates = calendar[:config.days].astype(str).tolist()
+    expiry_days = config.expiry_interval * np.arange(1, last_expiry + 2) - 1
+    expiries = calendar[expiry_days].astype(str).tolist()
+    return dates, expiries, expiry_days
+
+
+def simulate_path(config: ChainConfig, rng: np.random.Generator) -> np.ndarray:
+    # Geometric Brownian motion sampled once per trading day
+    dt = 1.0 / TRADING_DAYS_PER_YEAR
+    shocks = rng.standard_normal(config.days - 1)
+    log_returns = (config.drift - 0.5 * config.volatility ** 2) * dt + config.volatility * np.sqrt(dt) * shocks
+    return config.underlying_price * np.exp(np.concatenate(([0.0], np.cumsum(log_returns))))
+
+
+def iter_chain_chunks(config: ChainConfig, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> ChainChunks:
+    # Yield the chain as columns (codes into build_schedule's dates and expiries), a block of
+    # whole dates at a time. Rows are ordered by date, expiry, strike, then call before put.
+    rng = np.random.default_rng(config.seed)
+    _, _, expiry_days = build_schedule(config)
+    strikes = strike_grid(config)
+    path = simulate_path(config, rng)
+    listed = np.arange(config.listed_expiries)
+    rows_per_date = config.listed_expiries * len(strikes) * len(OPTION_TYPES)
+    dates_per_chunk = max(1, chunk_rows // rows_per_date)
+    is_call = np.array(OPTION_TYPES) == "call"
+
+    for start in range(0, config.days, dates_per_chunk):
+        day = np.arange(start, min(start + dates_per_chunk, config.days))
+        # First expiry on or after each date, then the following listed ones: shape (dates, expiries)
+        expiry_codes = (day // config.expiry_interval)[:, None] + listed
+        years = (expiry_days[expiry_codes] - day[:, None]) / TRADING_DAYS_PER_YEAR
+
+        spot = path[day][:, None, None, None]
+        strike = strikes[None, None, :, None]
+        volatility = np.clip(config.volatility + config.skew * np.log(strike / spot), 0.01, 3.0)
+        prices = black_scholes_price(
+            is_call[None, None, None, :], spot, strike, years[:, :, None, None], volatility, config.rate
+        )
+
+        shape = (len(day), config.listed_expiries, len(strikes), len(OPTION_TYPES))
+        yield {
+            "date_codes": np.broadcast_to(day[:, None, None, None], shape).astype(np.int32).ravel(),
+            "expiry_codes": np.broadcast_to(expiry_codes[:, :, None, None], shape).astype(np.int32).ravel(),
+            "strikes": np.broadcast_to(strike, shape).ravel().copy(),
+            "type_codes": np.broadcast_to(np.arange(len(OPTION_TYPES), dtype=np.int8), shape).ravel().copy(),
+            "mid_prices": np.maximum(np.round(prices, 2), MIN_PRICE).ravel(),
+            "underlyings": np.broadcast_to(np.round(spot, 2), shape).ravel().copy()
+        }
+
+
+def _text_rows(chunk: Dict[str, np.ndarray], dates: np.ndarray, expiries: np.ndarray, template: str) -> List[str]:
+    types = np.array(OPTION_TYPES, dtype=object)
+    return [
+        template % row for row in zip(
+            dates[chunk["date_codes"]].tolist(),
+            chunk["underlyings"].tolist(),
+            expiries[chunk["expiry_codes"]].tolist(),
+            chunk["strikes"].tolist(),
+            types[chunk["type_codes"]].tolist(),
+            chunk["mid_prices"].tolist()
+        )
+    ]
+
+
+def write_json(
+    path: Path, metadata: DatasetMetadata, dates: List[str], expiries: List[str], chunks: ChainChunks
+) -> None:
+    # Stream a {metadata, data} document; floats use repr, as json.dumps does
+    date_names, expiry_names = np.array(dates, dtype=object), np.array(expiries, dtype=object)
+    template = '{"date": "%s", "underlying": %r, "expiry": "%s", "strike": %r, "type": "%s", "mid_price": %r}'
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write('{"metadata": ' + json.dumps(metadata.model_dump()) + ', "data": [\n')
+        separator = ""
+        for chunk in chunks:
+            f.write(separator + ",\n".join(_text_rows(chunk, date_names, expiry_names, template)))
+            separator = ",\n"
+        f.write("\n]}\n")
+    os.replace(tmp_path, path)
+
+
+def write_csv(path: Path, dates: List[str], expiries: List[str], chunks: ChainChunks) -> None:
+    date_names, expiry_names = np.array(dates, dtype=object), np.array(expiries, dtype=object)
+    template = "%s,%r,%s,%r,%s,%r"
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(",".join(RECORD_FIELDS) + "\n")
+        for chunk in chunks:
+            f.write("\n".join(_text_rows(chunk, date_names, expiry_names, template)) + "\n")
+    os.replace(tmp_path, path)
+
+
+def write_binary(
+    path: Path, metadata: DatasetMetadata, dates: List[str], expiries: List[str], chunks: ChainChunks
+) -> None:
+    # Spill the columns to disk chunk by chunk, then build the index over memory-mapped columns
+    # and write the binary file and its catalog entry, as ingestion does
+    spill_dir = Path(tempfile.mkdtemp(prefix=".generate-", dir=path.parent))
+    try:
+        files = {name: open(spill_dir / f"{name}.bin", "wb") for name in _CHUNK_COLUMNS}
+        try:
+            for chunk in chunks:
+                for name, f in files.items():
+                    f.write(chunk[name].tobytes())
+        finally:
+            for f in files.values():
+                f.close()
+
+        store = ColumnarOptionsStore(
+            dates=dates,
+            expiries=expiries,
+            **{
+                name: np.memmap(spill_dir / f"{name}.bin", dtype=dtype, mode="r")
+                for name, dtype in _CHUNK_COLUMNS.items()
+            }
+        )
+        write_binary_dataset(path, metadata, store)
+        DatasetCatalog(path.parent).write(path.stem, build_catalog_entry(path, metadata, store))
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def generate_dataset(
+    config: ChainConfig,
+    output_path: Path,
+    output_format: str = "json",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> GenerationResult:
+    # Generate a synthetic options chain and write it as JSON, CSV or the binary format. The same
+    # config and seed always produce the same rows.
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    dates, expiries, _ = build_schedule(config)
+    record_count = config.days * config.listed_expiries * len(strike_grid(config)) * len(OPTION_TYPES)
+    metadata = DatasetMetadata(
+        dataset_name=config.dataset_name,
+        date_range={"start": dates[0], "end": dates[-1]},
+        record_count=record_count
     )
+
+    chunks = iter_chain_chunks(config, chunk_rows)
+    if output_format == "binary":
+        write_binary(output_path, metadata, dates, expiries, chunks)
+    elif output_format == "csv":
+        write_csv(output_path, dates, expiries, chunks)
+    else:
+        write_json(output_path, metadata, dates, expiries, chunks)
+
+    return GenerationResult(
+        dataset_name=config.dataset_name,
+        output_path=output_path,
+        record_count=record_count,
+        date_range=metadata.date_range
+    )
+
+
+def parse_underlying(value: str) -> Tuple[str, float]:
+    # SYMBOL=PRICE
+    symbol, _, price = value.partition("=")
+    try:
+        return symbol.strip(), float(price)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected SYMBOL=PRICE, got '{value}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a seeded synthetic options chain (Black-Scholes prices on a simulated underlying)"
+    )
+    parser.add_argument("--underlying", type=parse_underlying, action="append",
+                        help="SYMBOL=PRICE; repeat for several underlyings, one dataset each (default SPX=4800)")
+    parser.add_argument("--name", default="Sample", help="Datasets are named <SYMBOL>_<name>")
+    parser.add_argument("--output", help="Output file (only with a single underlying)")
+    parser.add_argument("--output-dir", default="data", help="Directory for <SYMBOL>_<name> outputs")
+    parser.add_argument("--format", choices=sorted(OUTPUT_SUFFIXES), default="json", help="Output format")
+    parser.add_argument("--start-date", default="2024-01-02", help="First trading date (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=30, help="Trading days to generate")
+    parser.add_argument("--strike-step", type=float, default=50.0, help="Distance between strikes")
+    parser.add_argument("--strikes-per-side", type=int, default=2, help="Strikes above and below the starting price")
+    parser.add_argument("--strikes", type=float, nargs="+", help="Explicit strike grid (overrides step and count)")
+    parser.add_argument("--expiry-interval", type=int, default=5, help="Trading days between expiries")
+    parser.add_argument("--listed-expiries", type=int, default=1, help="Expiries quoted on each date")
+    parser.add_argument("--volatility", type=float, default=0.18, help="Annualised volatility")
+    parser.add_argument("--skew", type=float, default=-0.2, help="Volatility change per unit of log-moneyness")
+    parser.add_argument("--drift", type=float, default=0.05, help="Annualised drift of the underlying")
+    parser.add_argument("--rate", type=float, default=0.04, help="Risk-free rate used for pricing")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (each further underlying adds 1)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows generated per chunk")
+    args = parser.parse_args()
+
+    underlyings = args.underlying or [("SPX", 4800.0)]
+    if args.output and len(underlyings) > 1:
+        parser.error("--output needs a single --underlying; use --output-dir for several")
+
+    for position, (symbol, price) in enumerate(underlyings):
+        config = ChainConfig(
+            dataset_name=f"{symbol}_{args.name}",
+            start_date=args.start_date,
+            days=args.days,
+            underlying_price=price,
+            drift=args.drift,
+            volatility=args.volatility,
+            skew=args.skew,
+            rate=args.rate,
+            strike_step=args.strike_step,
+            strikes_per_side=args.strikes_per_side,
+            strikes=args.strikes,
+            expiry_interval=args.expiry_interval,
+            listed_expiries=args.listed_expiries,
+            seed=args.seed + position
+        )
+        output_path = Path(args.output) if args.output else (
+            Path(args.output_dir) / f"{config.dataset_name}{OUTPUT_SUFFIXES[args.format]}"
+        )
+
+        start_time = time.time()
+        try:
+            result = generate_dataset(config, output_path, args.format, args.chunk_rows)
+        except (ValueError, OSError) as e:
+            print(f"Error generating {config.dataset_name}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        print(
+            f"Generated {result.dataset_name} -> {result.output_path} ({result.record_count} records, "
+            f"{result.date_range['start']} to {result.date_range['end']}, {elapsed_ms} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from repositories.ingestion import DEFAULT_CHUNK_SIZE, IngestionError, IngestionProgress, ingest_file
+
+
+def print_progress(progress: IngestionProgress) -> None:
+    # Single-line progress report on stderr
+    percent = progress.bytes_read / progress.total_bytes * 100 if progress.total_bytes else 100.0
+    sys.stderr.write(
+        f"\r{progress.stage:<9} {percent:5.1f}%  {progress.rows_read:,} rows"
+        f"  {progress.rows_rejected:,} rejected"
+    )
+    if progress.stage == "done":
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream a JSON or CSV options chain into the binary columnar format"
+    )
+    parser.add_argument("source", help="JSON ({metadata, data} or a bare array) or CSV file")
+    parser.add_argument("--output", help="Output .optbin path (defaults to the source path with .optbin)")
+    parser.add_argument("--name", help="Dataset name stored in the metadata")
+    parser.add_argument("--format", choices=["json", "csv"], help="Input format (defaults to the file suffix)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows parsed and validated per chunk")
+    parser.add_argument("--skip-invalid", action="store_true", help="Drop rows that fail validation instead of aborting")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    try:
+        result = ingest_file(
+            Path(args.source),
+            output_path=Path(args.output) if args.output else None,
+            dataset_name=args.name,
+            source_format=args.format,
+            chunk_size=args.chunk_size,
+            skip_invalid=args.skip_invalid,
+            progress_callback=None if args.quiet else print_progress
+        )
+    except (IngestionError, OSError) as e:
+        print(f"Error ingesting {args.source}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    print(
+        f"Ingested {args.source} -> {result.output_path} ({result.record_count} records, "
+        f"{result.rows_rejected} rejected, {elapsed_ms} ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import sys
+import time
+from repositories.dataset_repository import DatasetRepository
+from repositories.ingestion import IngestionError
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rewrite a dataset as parts split by expiry so backtests only open the parts they need"
+    )
+    parser.add_argument("datasets", nargs="+", help="Names of the datasets to partition")
+    parser.add_argument("--data-dir", default="data", help="Dataset directory")
+    parser.add_argument("--by-month", action="store_true", help="Also split each expiry by trading month")
+    args = parser.parse_args()
+
+    partitioning = ["expiry", "trade_month"] if args.by_month else ["expiry"]
+    dataset_repo = DatasetRepository(args.data_dir)
+    for dataset_name in args.datasets:
+        start_time = time.time()
+        try:
+            metadata = dataset_repo.partition_dataset(dataset_name, partitioning)
+        except (IngestionError, ValueError, OSError) as e:
+            print(f"Error partitioning {dataset_name}: {e}", file=sys.stderr)
+            sys.exit(1)
+        if metadata is None:
+            print(f"Dataset '{dataset_name}' not found", file=sys.stderr)
+            sys.exit(1)
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        print(f"Partitioned {dataset_name} by {', '.join(partitioning)}: {metadata.record_count} records ({elapsed_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()